@@ -1,6 +1,6 @@
 import os
 
-from flask import Flask
+from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_migrate import Migrate
 
@@ -10,6 +10,11 @@ from .pipelines import models as pipeline_models
 from .workflows import models as workflow_models
 
 from . import constants
+from .blobs import create_blob_client, create_presigned_url_cache
+from .cache import create_cache
+from .tokens import create_token_verifier
+from .utils import any_application_required
+from .workflow_client import create_workflow_client, start_workflow_deadline
 
 from .pipelines.routes import organization_pipeline_bp
 from .workflows.routes import organization_workflow_bp
@@ -30,6 +35,30 @@ CONFIG_VARS = (
     constants.AUTH_HOSTNAME,
     constants.WORKFLOW_HOSTNAME,
     constants.WORKFLOW_API_TOKEN,
+    constants.MEMBERSHIP_CACHE_SIZE,
+    constants.MEMBERSHIP_CACHE_TTL,
+    constants.MEMBERSHIP_CACHE_NEGATIVE_TTL,
+    constants.PIPELINE_RUN_CACHE_SIZE,
+    constants.PIPELINE_RUN_CACHE_TTL,
+    constants.PIPELINE_RUN_CACHE_ACTIVE_TTL,
+    constants.WORKFLOW_GRAPH_CACHE_SIZE,
+    constants.WORKFLOW_GRAPH_CACHE_TTL,
+    constants.CACHE_REDIS_URL,
+    constants.JWT_SECRET_KEY,
+    constants.JWT_JWKS_URL,
+    constants.JWT_JWKS_REFRESH_INTERVAL,
+    constants.JWT_ORGANIZATIONS_CLAIM,
+    constants.WORKFLOW_POOL_SIZE,
+    constants.WORKFLOW_CONNECT_TIMEOUT,
+    constants.WORKFLOW_READ_TIMEOUT,
+    constants.WORKFLOW_FAN_OUT_WORKERS,
+    constants.WORKFLOW_FAN_OUT_CONCURRENCY,
+    constants.WORKFLOW_REQUEST_DEADLINE,
+    constants.CONSOLE_POLL_INTERVAL,
+    constants.CONSOLE_STREAM_MAX_DURATION,
+    constants.UPLOAD_PART_SIZE,
+    constants.PRESIGNED_URL_CACHE_SIZE,
+    constants.PRESIGNED_URL_REUSE_FRACTION,
 )
 
 
@@ -52,6 +81,34 @@ def create_app(config=None):
             app.config[constants.MAX_CONTENT_LENGTH]
         )
 
+    app.extensions[constants.MEMBERSHIP_CACHE] = create_cache(
+        app.config,
+        constants.MEMBERSHIP_CACHE_SIZE,
+        constants.MEMBERSHIP_CACHE_TTL,
+        "membership",
+    )
+    app.extensions[constants.PIPELINE_RUN_CACHE] = create_cache(
+        app.config,
+        constants.PIPELINE_RUN_CACHE_SIZE,
+        constants.PIPELINE_RUN_CACHE_TTL,
+        "pipeline_run",
+    )
+    app.extensions[constants.WORKFLOW_GRAPH_CACHE] = create_cache(
+        app.config,
+        constants.WORKFLOW_GRAPH_CACHE_SIZE,
+        constants.WORKFLOW_GRAPH_CACHE_TTL,
+        "workflow_graph",
+        # edits update the graph, which every worker must then see at once.
+        local=False,
+    )
+    app.extensions[constants.BLOB_CLIENT] = create_blob_client(app.config)
+    app.extensions[constants.PRESIGNED_URL_CACHE] = create_presigned_url_cache(
+        app.config
+    )
+    app.extensions[constants.TOKEN_VERIFIER] = create_token_verifier(app.config)
+    app.extensions[constants.WORKFLOW_CLIENT] = create_workflow_client(app.config)
+    app.before_request(start_workflow_deadline)
+
     CORS(app, resources={r"/*": {"origins": "*"}})
     db.init_app(app)
     migrate = Migrate(app, db)
@@ -63,4 +120,15 @@ def create_app(config=None):
     def healthcheck():
         return "OK"
 
+    @app.route("/metrics")
+    @any_application_required
+    def metrics():
+        return jsonify(
+            {
+                name: extension.stats()
+                for name, extension in app.extensions.items()
+                if hasattr(extension, "stats")
+            }
+        )
+
     return (app, db, migrate)
@@ -0,0 +1,248 @@
+import math
+import threading
+import time
+
+import boto3
+from botocore.client import Config
+from botocore.exceptions import ClientError
+from flask import current_app
+
+from .cache import create_cache
+from .constants import (
+    BLOB_CLIENT,
+    PRESIGNED_URL_CACHE,
+    PRESIGNED_URL_CACHE_SIZE,
+    PRESIGNED_URL_REUSE_FRACTION,
+    S3_ACCESS_KEY_ID,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_PRESIGNED_TIMEOUT,
+    S3_REGION_NAME,
+    S3_SECRET_ACCESS_KEY,
+    UPLOAD_PART_SIZE,
+)
+
+# S3 limits on multipart uploads.
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+
+
+class BlobClient:
+    """Presigned uploads directly to the blob store, so that the bytes of an
+    upload never pass through the app.
+
+    Files of up to part_size bytes are uploaded with a single presigned PUT,
+    larger files as a multipart upload with a presigned PUT for each part.
+    """
+
+    def __init__(self, bucket, presigned_timeout, part_size, **client_kwargs):
+        self.bucket = bucket
+        self.presigned_timeout = int(presigned_timeout)
+        self.part_size = max(int(part_size), MIN_PART_SIZE)
+        self.s3 = boto3.client(
+            "s3", config=Config(signature_version="s3v4"), **client_kwargs
+        )
+
+    def _presign(self, method, **params):
+        return self.s3.generate_presigned_url(
+            method,
+            Params=dict(params, Bucket=self.bucket),
+            ExpiresIn=self.presigned_timeout,
+        )
+
+    def part_size_for(self, size):
+        """ Return the size of each part of a multipart upload of size bytes. """
+        return max(self.part_size, math.ceil(size / MAX_PARTS))
+
+    def create_upload(self, key, size):
+        """Start an upload of size bytes to key.
+
+        Returns a dict with either the 'url' to PUT the whole file to, or the
+        'upload_id', 'part_size' and presigned 'parts' of a multipart upload.
+        """
+        if size <= self.part_size:
+            return {"method": "PUT", "url": self._presign("put_object", Key=key)}
+
+        upload_id = self.start_multipart_upload(key)
+        part_size = self.part_size_for(size)
+        return {
+            "method": "PUT",
+            "upload_id": upload_id,
+            "part_size": part_size,
+            "parts": [
+                {
+                    "part_number": part_number,
+                    "url": self._presign(
+                        "upload_part",
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=part_number,
+                    ),
+                }
+                for part_number in range(1, math.ceil(size / part_size) + 1)
+            ],
+        }
+
+    def start_multipart_upload(self, key):
+        """ Start a multipart upload to key, and return its upload id. """
+        return self.s3.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+
+    def upload_part(self, key, upload_id, part_number, body, size):
+        """ Upload size bytes of a file object as a part, and return its ETag. """
+        response = self.s3.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+            ContentLength=size,
+        )
+        return response["ETag"].strip('"')
+
+    def list_parts(self, key, upload_id):
+        """ Return the (part_number, size, etag) of every uploaded part. """
+        parts = []
+        marker = 0
+        while True:
+            response = self.s3.list_parts(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumberMarker=marker,
+            )
+            parts.extend(
+                (part["PartNumber"], part["Size"], part["ETag"].strip('"'))
+                for part in response.get("Parts", [])
+            )
+            if not response.get("IsTruncated"):
+                return parts
+            marker = response["NextPartNumberMarker"]
+
+    def complete_upload(self, key, upload_id=None, parts=None):
+        """Finish an upload to key, and return the (size, etag) of the blob.
+
+        parts is a list of (part_number, etag) of a multipart upload.
+        """
+        if upload_id:
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": part_number, "ETag": etag}
+                        for (part_number, etag) in sorted(parts)
+                    ]
+                },
+            )
+
+        head = self.s3.head_object(Bucket=self.bucket, Key=key)
+        return (head["ContentLength"], head["ETag"].strip('"'))
+
+    def abort_upload(self, key, upload_id=None):
+        """Discard an upload to key, and any blob it left behind.
+
+        An upload that was already completed or aborted is ignored.
+        """
+        if upload_id:
+            try:
+                self.s3.abort_multipart_upload(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id
+                )
+            except ClientError as client_error:
+                if client_error.response.get("Error", {}).get("Code") != "NoSuchUpload":
+                    raise
+        self.delete(key)
+
+    def delete(self, key):
+        """ Delete the blob at key. """
+        self.s3.delete_object(Bucket=self.bucket, Key=key)
+
+
+def create_blob_client(config):
+    """ Create the BlobClient configured by the S3_* settings of config. """
+    return BlobClient(
+        config[S3_BUCKET],
+        config[S3_PRESIGNED_TIMEOUT],
+        config[UPLOAD_PART_SIZE],
+        aws_access_key_id=config.get(S3_ACCESS_KEY_ID),
+        aws_secret_access_key=config.get(S3_SECRET_ACCESS_KEY),
+        endpoint_url=config.get(S3_ENDPOINT_URL),
+        region_name=config.get(S3_REGION_NAME),
+    )
+
+
+class PresignedUrlCache:
+    """Reuses presigned download URLs, until reuse_fraction of their lifetime
+    (presigned_timeout seconds) has passed, rather than signing one for every
+    request.
+    """
+
+    def __init__(self, cache, presigned_timeout, reuse_fraction):
+        self.cache = cache
+        self.max_age = float(presigned_timeout) * float(reuse_fraction)
+        self.signed = 0
+        self.signing_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def urls(self, items, sign):
+        """Return a presigned URL for each (key, filename) of items, signing
+        those not cached with sign(key, filename)."""
+        now = time.time()
+        urls = []
+        for item in items:
+            cached = self.cache.get(item)
+            # entries shared by other workers may be older than the local ttl.
+            if cached is not None and now - cached[1] < self.max_age:
+                urls.append(cached[0])
+                continue
+
+            started = time.perf_counter()
+            url = sign(*item)
+            with self._lock:
+                self.signed += 1
+                self.signing_seconds += time.perf_counter() - started
+            if self.max_age > 0:
+                self.cache.set(item, [url, now], self.max_age)
+            urls.append(url)
+
+        return urls
+
+    def url(self, key, filename, sign):
+        """ Return a presigned URL to key, signing one with sign() if needed. """
+        return self.urls([(key, filename)], sign)[0]
+
+    def stats(self):
+        """ Return the hit rate of the cache, and the cost of signing. """
+        stats = self.cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        with self._lock:
+            return dict(
+                stats,
+                hit_rate=stats["hits"] / lookups if lookups else None,
+                signed=self.signed,
+                signing_seconds=self.signing_seconds,
+            )
+
+
+def create_presigned_url_cache(config):
+    """Create the PresignedUrlCache configured by the PRESIGNED_URL_* and
+    S3_PRESIGNED_TIMEOUT settings of config."""
+    return PresignedUrlCache(
+        create_cache(
+            config, PRESIGNED_URL_CACHE_SIZE, S3_PRESIGNED_TIMEOUT, "presigned_url"
+        ),
+        config[S3_PRESIGNED_TIMEOUT],
+        config[PRESIGNED_URL_REUSE_FRACTION],
+    )
+
+
+def presigned_urls(items, sign):
+    """Presigned URLs to the (key, filename) items, from the PresignedUrlCache
+    of the current app."""
+    return current_app.extensions[PRESIGNED_URL_CACHE].urls(items, sign)
+
+
+def blob_client():
+    """ The BlobClient of the current app. """
+    return current_app.extensions[BLOB_CLIENT]
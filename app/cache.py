@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .constants import CACHE_REDIS_URL
+
+MISSING = object()
+
+
+class RedisCacheBackend:
+    """A shared cache backend, so that multiple workers can share warm entries.
+
+    Values are stored as JSON, so only JSON serializable values are supported.
+    """
+
+    def __init__(self, url, prefix="openfido-app-service"):
+        # redis is only required when a shared backend is configured.
+        import redis  # pylint: disable=import-outside-toplevel
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, key):
+        if isinstance(key, (tuple, list)):
+            key = ":".join(str(k) for k in key)
+        return f"{self.prefix}:{key}"
+
+    def get(self, key):
+        """Return (value, seconds left to live) of key, or MISSING.
+
+        The remaining lifetime comes from redis itself (PTTL), so that entries
+        copied into the local cache expire when the shared entry does.
+        """
+        pipeline = self.client.pipeline()
+        pipeline.get(self._key(key))
+        pipeline.pttl(self._key(key))
+        (value, pttl) = pipeline.execute()
+        if value is None or pttl == -2:
+            return MISSING
+        return (json.loads(value), None if pttl < 0 else pttl / 1000)
+
+    def set(self, key, value, ttl):
+        """ Store value for ttl seconds. """
+        self.client.set(self._key(key), json.dumps(value), ex=max(int(ttl), 1))
+
+    def delete(self, key):
+        """ Remove key. """
+        self.client.delete(self._key(key))
+
+
+class TTLCache:
+    """A bounded, thread safe, in-process LRU cache whose entries expire.
+
+    When a backend is supplied (see RedisCacheBackend) it is consulted on local
+    misses, and written to on every set(). Entries read from the backend are
+    kept locally for no longer than the backend has left to keep them. Without
+    local, entries are only kept by the backend, so that every worker sees a
+    set() or delete() at once.
+    """
+
+    def __init__(self, maxsize, ttl, backend=None, local=True):
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl)
+        self.backend = backend
+        self.local = local or backend is None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """ Return the cached value of key, or default. """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.backend is not None:
+            entry = self.backend.get(key)
+            if entry is not MISSING:
+                (value, ttl) = entry
+                ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+                with self._lock:
+                    self.hits += 1
+                    if ttl > 0 and self.local:
+                        self._store(key, value, ttl, now)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        """ Cache value for ttl seconds (defaults to the cache's ttl). """
+        ttl = self.ttl if ttl is None else float(ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        if self.local:
+            with self._lock:
+                self._store(key, value, ttl, time.monotonic())
+
+        if self.backend is not None:
+            self.backend.set(key, value, ttl)
+
+    def delete(self, key):
+        """ Remove key from the cache. """
+        with self._lock:
+            self._entries.pop(key, None)
+
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def clear(self):
+        """ Remove all locally cached entries. """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Return the hit/miss counters of this cache. """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, value, ttl, now):
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def create_cache(config, maxsize_key, ttl_key, prefix, local=True):
+    """Create a TTLCache configured by the maxsize_key and ttl_key settings.
+
+    Entries are shared through redis when CACHE_REDIS_URL is configured (and
+    then only kept there, without local).
+    """
+    backend = None
+    if config.get(CACHE_REDIS_URL):
+        backend = RedisCacheBackend(config[CACHE_REDIS_URL], prefix)
+
+    return TTLCache(config[maxsize_key], config[ttl_key], backend, local)
@@ -7,3 +7,53 @@ MAX_CONTENT_LENGTH = "MAX_CONTENT_LENGTH"
 AUTH_HOSTNAME = "AUTH_HOSTNAME"
 WORKFLOW_HOSTNAME = "WORKFLOW_HOSTNAME"
 WORKFLOW_API_TOKEN = "WORKFLOW_API_TOKEN"
+
+# Organization membership cache:
+MEMBERSHIP_CACHE = "membership_cache"
+MEMBERSHIP_CACHE_SIZE = "MEMBERSHIP_CACHE_SIZE"
+MEMBERSHIP_CACHE_TTL = "MEMBERSHIP_CACHE_TTL"
+MEMBERSHIP_CACHE_NEGATIVE_TTL = "MEMBERSHIP_CACHE_NEGATIVE_TTL"
+
+# Workflow service pipeline run cache:
+PIPELINE_RUN_CACHE = "pipeline_run_cache"
+PIPELINE_RUN_CACHE_SIZE = "PIPELINE_RUN_CACHE_SIZE"
+PIPELINE_RUN_CACHE_TTL = "PIPELINE_RUN_CACHE_TTL"
+PIPELINE_RUN_CACHE_ACTIVE_TTL = "PIPELINE_RUN_CACHE_ACTIVE_TTL"
+
+# Cached DAGs of organization workflows:
+WORKFLOW_GRAPH_CACHE = "workflow_graph_cache"
+WORKFLOW_GRAPH_CACHE_SIZE = "WORKFLOW_GRAPH_CACHE_SIZE"
+WORKFLOW_GRAPH_CACHE_TTL = "WORKFLOW_GRAPH_CACHE_TTL"
+
+# Optional shared cache backend (redis://...) for all caches:
+CACHE_REDIS_URL = "CACHE_REDIS_URL"
+
+# Optional local JWT verification (instead of asking AUTH_HOSTNAME):
+TOKEN_VERIFIER = "token_verifier"
+JWT_SECRET_KEY = "JWT_SECRET_KEY"
+JWT_JWKS_URL = "JWT_JWKS_URL"
+JWT_JWKS_REFRESH_INTERVAL = "JWT_JWKS_REFRESH_INTERVAL"
+JWT_ORGANIZATIONS_CLAIM = "JWT_ORGANIZATIONS_CLAIM"
+
+# Workflow service HTTP client:
+WORKFLOW_CLIENT = "workflow_client"
+WORKFLOW_POOL_SIZE = "WORKFLOW_POOL_SIZE"
+WORKFLOW_CONNECT_TIMEOUT = "WORKFLOW_CONNECT_TIMEOUT"
+WORKFLOW_READ_TIMEOUT = "WORKFLOW_READ_TIMEOUT"
+WORKFLOW_FAN_OUT_WORKERS = "WORKFLOW_FAN_OUT_WORKERS"
+WORKFLOW_FAN_OUT_CONCURRENCY = "WORKFLOW_FAN_OUT_CONCURRENCY"
+WORKFLOW_REQUEST_DEADLINE = "WORKFLOW_REQUEST_DEADLINE"
+
+# Seconds between polls of the console output of a run that is followed, and
+# the longest a client follows it before it has to reconnect:
+CONSOLE_POLL_INTERVAL = "CONSOLE_POLL_INTERVAL"
+CONSOLE_STREAM_MAX_DURATION = "CONSOLE_STREAM_MAX_DURATION"
+
+# Presigned uploads of input files directly to the blob store:
+BLOB_CLIENT = "blob_client"
+UPLOAD_PART_SIZE = "UPLOAD_PART_SIZE"
+
+# Presigned download URLs are reused until this fraction of their lifetime:
+PRESIGNED_URL_CACHE = "presigned_url_cache"
+PRESIGNED_URL_CACHE_SIZE = "PRESIGNED_URL_CACHE_SIZE"
+PRESIGNED_URL_REUSE_FRACTION = "PRESIGNED_URL_REUSE_FRACTION"
@@ -2,3 +2,27 @@ SQLALCHEMY_TRACK_MODIFICATIONS = False
 S3_BUCKET = "openfido-app-service"
 S3_REGION_NAME = "us-east-1"
 S3_PRESIGNED_TIMEOUT = 604800
+MEMBERSHIP_CACHE_SIZE = 10000
+MEMBERSHIP_CACHE_TTL = 60
+MEMBERSHIP_CACHE_NEGATIVE_TTL = 10
+PIPELINE_RUN_CACHE_SIZE = 10000
+PIPELINE_RUN_CACHE_TTL = 86400
+PIPELINE_RUN_CACHE_ACTIVE_TTL = 5
+WORKFLOW_GRAPH_CACHE_SIZE = 10000
+WORKFLOW_GRAPH_CACHE_TTL = 300
+CACHE_REDIS_URL = None
+JWT_SECRET_KEY = None
+JWT_JWKS_URL = None
+JWT_JWKS_REFRESH_INTERVAL = 3600
+JWT_ORGANIZATIONS_CLAIM = "organizations"
+WORKFLOW_POOL_SIZE = 20
+WORKFLOW_CONNECT_TIMEOUT = 5
+WORKFLOW_READ_TIMEOUT = 60
+WORKFLOW_FAN_OUT_WORKERS = 32
+WORKFLOW_FAN_OUT_CONCURRENCY = 8
+WORKFLOW_REQUEST_DEADLINE = None
+CONSOLE_POLL_INTERVAL = 2
+CONSOLE_STREAM_MAX_DURATION = 300
+UPLOAD_PART_SIZE = 104857600
+PRESIGNED_URL_CACHE_SIZE = 100000
+PRESIGNED_URL_REUSE_FRACTION = 0.5
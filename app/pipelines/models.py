@@ -2,6 +2,12 @@ from application_roles.model_utils import CommonColumnsMixin, get_db
 
 db = get_db()
 
+# States after which a pipeline run no longer changes.
+FINISHED_PIPELINE_RUN_STATES = ("COMPLETED", "FAILED", "CANCELLED")
+
+# The outputs of a pipeline run's console.
+CONSOLE_OUTPUTS = ("std_out", "std_err")
+
 
 class OrganizationPipeline(CommonColumnsMixin, db.Model):
     """ Represents a 'pipeline' job of a specific organization. """
@@ -12,14 +18,24 @@ class OrganizationPipeline(CommonColumnsMixin, db.Model):
     pipeline_uuid = db.Column(db.String(32), nullable=False, server_default="")
     is_deleted = db.Column(db.Boolean(), default=False, nullable=False)
 
+    __table_args__ = (
+        db.Index(
+            "ix_organization_pipeline_organization_uuid",
+            "organization_uuid",
+            "uuid",
+            postgresql_where=is_deleted == False,
+            sqlite_where=is_deleted == False,
+        ),
+    )
+
     organization_pipeline_runs = db.relationship(
-        "OrganizationPipelineRun", backref="organization_pipeline", lazy="immediate"
+        "OrganizationPipelineRun", backref="organization_pipeline", lazy="select"
     )
 
     organization_pipeline_input_files = db.relationship(
         "OrganizationPipelineInputFile",
         backref="organization_pipeline",
-        lazy="immediate",
+        lazy="select",
     )
 
     organization_workflow_pipelines = db.relationship(
@@ -44,6 +60,51 @@ class OrganizationPipelineInputFile(CommonColumnsMixin, db.Model):
         db.Integer, db.ForeignKey("organization_pipeline.id"), nullable=False
     )
 
+    # A file uploaded directly to the blob store stays pending, and can't be
+    # used by a run, until its upload is completed.
+    is_pending = db.Column(
+        db.Boolean(), default=False, nullable=False, server_default=db.false()
+    )
+    size = db.Column(db.BigInteger, nullable=True)
+    upload_id = db.Column(db.String(1024), nullable=True)
+    part_size = db.Column(db.BigInteger, nullable=True)
+
+    # Where the file is stored in the blob store.
+    blob_key = db.Column(db.String(2048), nullable=False, server_default="")
+
+    # Set when the file is stored once by its content (see InputFileContent).
+    content_sha256 = db.Column(
+        db.String(64), db.ForeignKey("input_file_content.sha256"), nullable=True
+    )
+
+    __table_args__ = (
+        db.Index(
+            "ix_organization_pipeline_input_file_pipeline_id",
+            "organization_pipeline_id",
+        ),
+        db.Index(
+            "ix_organization_pipeline_input_file_pipeline_run_id",
+            "organization_pipeline_run_id",
+        ),
+    )
+
+
+class InputFileContent(CommonColumnsMixin, db.Model):
+    """The content of input files, stored in the blob store once under its
+    sha256, however many OrganizationPipelineInputFiles reference it."""
+
+    __tablename__ = "input_file_content"
+
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    reference_count = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        db.Index(
+            "ix_input_file_content_reference_count", "reference_count", "updated_at"
+        ),
+    )
+
 
 class OrganizationPipelineRun(CommonColumnsMixin, db.Model):
     """ A pipeline run within an organization """
@@ -67,12 +128,34 @@ class OrganizationPipelineRun(CommonColumnsMixin, db.Model):
     share_password_hash = db.Column(db.String(127), nullable=True)
     share_password_salt = db.Column(db.String(127), nullable=True)
 
+    # The pipeline run as last reported by the workflow service (see
+    # update_pipeline_run_status()).
+    status_snapshot = db.Column(db.JSON(), nullable=True)
+    status_updated_at = db.Column(db.DateTime, nullable=True)
+
+    # Denormalized from the pipeline run, for list views.
+    state = db.Column(db.String(32), nullable=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    artifact_count = db.Column(db.Integer, nullable=True)
+
     is_deleted = db.Column(db.Boolean(), default=False, nullable=False)
 
+    __table_args__ = (
+        db.Index(
+            "ix_organization_pipeline_run_organization_pipeline_id",
+            "organization_pipeline_id",
+            "created_at",
+            "id",
+        ),
+        db.Index("ix_organization_pipeline_run_uuid", "uuid"),
+        db.Index("ix_organization_pipeline_run_pipeline_run_uuid", "pipeline_run_uuid"),
+    )
+
     organization_pipeline_run_post_processing_states = db.relationship(
         "OrganizationPipelineRunPostProcessingState",
         backref="organization_pipeline_run",
-        lazy="immediate",
+        lazy="select",
     )
 
     artifact_charts = db.relationship(
@@ -97,6 +180,13 @@ class ArtifactChart(CommonColumnsMixin, db.Model):
     chart_type_code = db.Column(db.String(20), nullable=False)
     chart_config = db.Column(db.JSON(), nullable=False)
 
+    __table_args__ = (
+        db.Index(
+            "ix_artifact_chart_organization_pipeline_run_id",
+            "organization_pipeline_run_id",
+        ),
+    )
+
 
 class PostProcessingState(CommonColumnsMixin, db.Model):
     """ Lookup table status codes of post processing jobs """
@@ -125,3 +215,10 @@ class OrganizationPipelineRunPostProcessingState(CommonColumnsMixin, db.Model):
     post_processing_state_id = db.Column(
         db.Integer, db.ForeignKey("post_processing_state.id"), nullable=False
     )
+
+    __table_args__ = (
+        db.Index(
+            "ix_organization_pipeline_run_post_processing_state_run_id",
+            "organization_pipeline_run_id",
+        ),
+    )
@@ -1,10 +1,12 @@
 from app.pipelines.models import (
+    FINISHED_PIPELINE_RUN_STATES,
+    InputFileContent,
     OrganizationPipeline,
     OrganizationPipelineInputFile,
     OrganizationPipelineRun,
     db,
 )
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 
 
 def find_organization_pipelines(organization_uuid):
@@ -36,6 +38,20 @@ def find_organization_pipeline_by_pipeline_run_uuid(pipeline_uuid):
     ).one_or_none()
 
 
+def find_organization_pipelines_and_runs_by_pipeline_run_uuids(pipeline_run_uuids):
+    """Find Organization Pipelines and their Runs by the uuids of the pipeline
+    runs on the workflow service."""
+    return (
+        db.session.query(OrganizationPipeline, OrganizationPipelineRun)
+        .join(
+            OrganizationPipelineRun,
+            OrganizationPipelineRun.organization_pipeline_id == OrganizationPipeline.id,
+        )
+        .filter(OrganizationPipelineRun.pipeline_run_uuid.in_(pipeline_run_uuids))
+        .all()
+    )
+
+
 def find_organization_pipeline_input_files(organization_pipeline_id):
     """ Search for Organization Pipeline Input Files """
     return OrganizationPipelineInputFile.query.filter(
@@ -44,12 +60,47 @@ def find_organization_pipeline_input_files(organization_pipeline_id):
     ).all()
 
 
+def find_organization_pipeline_run_input_files(organization_pipeline_run_ids):
+    """ Find the Organization Pipeline Input Files of several pipeline runs. """
+    return OrganizationPipelineInputFile.query.filter(
+        OrganizationPipelineInputFile.organization_pipeline_run_id.in_(
+            organization_pipeline_run_ids
+        )
+    ).all()
+
+
 def search_organization_pipeline_input_files(organization_pipeline_id, uuids):
     """ Find Organization Pipeline Input Files """
     return OrganizationPipelineInputFile.query.filter(
         OrganizationPipelineInputFile.organization_pipeline_id
         == organization_pipeline_id,
         OrganizationPipelineInputFile.uuid.in_(uuids),
+        OrganizationPipelineInputFile.is_pending == False,
+    ).all()
+
+
+def find_organization_pipeline_input_file(organization_pipeline_id, uuid):
+    """ Find an Organization Pipeline Input File. """
+    return OrganizationPipelineInputFile.query.filter(
+        OrganizationPipelineInputFile.organization_pipeline_id
+        == organization_pipeline_id,
+        OrganizationPipelineInputFile.uuid == uuid,
+    ).one_or_none()
+
+
+def find_expired_pipeline_input_file_uploads(before):
+    """ Find Organization Pipeline Input Files still pending since before. """
+    return OrganizationPipelineInputFile.query.filter(
+        OrganizationPipelineInputFile.is_pending == True,
+        OrganizationPipelineInputFile.created_at < before,
+    ).all()
+
+
+def find_unreferenced_input_file_contents(before):
+    """ Find Input File Contents no longer referenced since before. """
+    return InputFileContent.query.filter(
+        InputFileContent.reference_count <= 0,
+        InputFileContent.updated_at < before,
     ).all()
 
 
@@ -70,6 +121,31 @@ def find_organization_pipeline_run(organization_pipeline_id, uuid):
     ).one_or_none()
 
 
+def find_organization_pipeline_and_run(
+    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+):
+    """Find an Organization Pipeline and one of its Organization Pipeline Runs
+    in a single query.
+
+    Returns an (OrganizationPipeline, OrganizationPipelineRun) tuple, or None.
+    """
+    return (
+        db.session.query(OrganizationPipeline, OrganizationPipelineRun)
+        .join(
+            OrganizationPipelineRun,
+            OrganizationPipelineRun.organization_pipeline_id == OrganizationPipeline.id,
+        )
+        .filter(
+            OrganizationPipeline.organization_uuid == organization_uuid,
+            OrganizationPipeline.uuid == organization_pipeline_uuid,
+            OrganizationPipeline.is_deleted == False,
+            OrganizationPipelineRun.uuid == organization_pipeline_run_uuid,
+            OrganizationPipelineRun.is_deleted == False,
+        )
+        .one_or_none()
+    )
+
+
 def find_latest_organization_pipeline_run(organization_pipeline_id):
     """Find the latest Organization Pipeline Run for an Organization Pipeline. """
     return (
@@ -85,6 +161,123 @@ def find_latest_organization_pipeline_run(organization_pipeline_id):
     )
 
 
+def find_latest_organization_pipeline_runs(organization_pipeline_ids):
+    """Find the latest Organization Pipeline Run of each Organization Pipeline
+    in a single query."""
+    latest_runs = (
+        db.session.query(
+            OrganizationPipelineRun.id,
+            func.row_number()
+            .over(
+                partition_by=OrganizationPipelineRun.organization_pipeline_id,
+                order_by=(
+                    OrganizationPipelineRun.created_at.desc(),
+                    OrganizationPipelineRun.id.desc(),
+                ),
+            )
+            .label("row_number"),
+        )
+        .filter(
+            OrganizationPipelineRun.organization_pipeline_id.in_(
+                organization_pipeline_ids
+            ),
+            OrganizationPipelineRun.is_deleted == False,
+        )
+        .subquery()
+    )
+
+    return (
+        OrganizationPipelineRun.query.join(
+            latest_runs, OrganizationPipelineRun.id == latest_runs.c.id
+        )
+        .filter(latest_runs.c.row_number == 1)
+        .all()
+    )
+
+
+def find_organization_pipeline_runs_page(organization_pipeline_id, limit, before=None):
+    """Find a page of Organization Pipeline Runs, newest first.
+
+    Pages are keyed on (created_at, id): before is the (created_at, id) of the
+    last run of the previous page.
+    """
+    query = OrganizationPipelineRun.query.filter(
+        OrganizationPipelineRun.organization_pipeline_id == organization_pipeline_id,
+        OrganizationPipelineRun.is_deleted == False,
+    )
+
+    if before is not None:
+        created_at, run_id = before
+        query = query.filter(
+            or_(
+                OrganizationPipelineRun.created_at < created_at,
+                and_(
+                    OrganizationPipelineRun.created_at == created_at,
+                    OrganizationPipelineRun.id < run_id,
+                ),
+            )
+        )
+
+    return (
+        query.order_by(
+            OrganizationPipelineRun.created_at.desc(),
+            OrganizationPipelineRun.id.desc(),
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+def find_unfinished_organization_pipeline_runs(limit, after_id=0):
+    """Find Organization Pipelines and their Runs that have not finished, in
+    order of id.
+
+    Pages are keyed on id: after_id is the id of the last run of the
+    previous page.
+    """
+    return (
+        db.session.query(OrganizationPipeline, OrganizationPipelineRun)
+        .join(
+            OrganizationPipelineRun,
+            OrganizationPipelineRun.organization_pipeline_id == OrganizationPipeline.id,
+        )
+        .filter(
+            OrganizationPipelineRun.id > after_id,
+            OrganizationPipelineRun.is_deleted == False,
+            OrganizationPipelineRun.pipeline_run_uuid != None,
+            or_(
+                OrganizationPipelineRun.state == None,
+                OrganizationPipelineRun.state.notin_(FINISHED_PIPELINE_RUN_STATES),
+            ),
+        )
+        .order_by(OrganizationPipelineRun.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def estimate_organization_pipeline_run_count(organization_pipeline_id):
+    """Estimate the number of Organization Pipeline Runs of a pipeline.
+
+    On PostgreSQL the planner's row estimate is used instead of counting;
+    other databases fall back to an exact count.
+    """
+    query = db.session.query(OrganizationPipelineRun.id).filter(
+        OrganizationPipelineRun.organization_pipeline_id == organization_pipeline_id,
+        OrganizationPipelineRun.is_deleted == False,
+    )
+
+    if db.engine.dialect.name != "postgresql":
+        return query.count()
+
+    statement = query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db.session.execute(f"EXPLAIN (FORMAT JSON) {statement}").scalar()
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 def search_organization_pipeline_runs(organization_pipeline_id, uuids):
     """Searches all Organization Pipeline Runs.
     NOTE: or used for backward compatibility.
@@ -1,35 +1,73 @@
+import json
 import logging
+import re
 
-from flask import Blueprint, jsonify, request
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 
+from app.constants import CONSOLE_POLL_INTERVAL, CONSOLE_STREAM_MAX_DURATION
 from app.utils import any_application_required, validate_organization
 from marshmallow.exceptions import ValidationError
 from requests import HTTPError
 
-from .queries import find_organization_pipeline, find_organization_pipeline_run
+from .models import CONSOLE_OUTPUTS
+from .queries import (
+    find_organization_pipeline,
+    find_organization_pipeline_and_run,
+    find_organization_pipeline_run,
+)
 from .services import (
     create_artifact_chart,
     create_pipeline,
+    complete_pipeline_input_file_upload,
     create_pipeline_input_file,
+    create_pipeline_input_file_upload,
     create_pipeline_run,
     delete_artifact_chart,
     delete_pipeline,
     delete_pipeline_run,
     fetch_artifact_charts,
     fetch_pipeline_run,
+    fetch_pipeline_input_file_upload,
     fetch_pipeline_run_console,
+    fetch_pipeline_run_console_output,
     fetch_pipeline_runs,
+    fetch_pipeline_runs_page,
     fetch_pipeline,
     fetch_pipelines,
+    stream_pipeline_run_console_output,
     update_artifact_chart,
     update_pipeline,
+    update_pipeline_run_status,
+    upload_pipeline_input_file_chunk,
 )
 
 logger = logging.getLogger("organization-pipelines")
 
+# A "Range: bytes=<first>-[<last>]" header.
+BYTE_RANGE = re.compile(r"^bytes=(\d+)-(\d*)$")
+
+# A "Content-Range: bytes <first>-<last>/<size>" header.
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+# Page size of pipeline runs when only a cursor is given, and the largest allowed.
+DEFAULT_PIPELINE_RUNS_LIMIT = 100
+MAX_PIPELINE_RUNS_LIMIT = 500
+
 organization_pipeline_bp = Blueprint("organization-pipelines", __name__)
 
 
+def _is_true(value):
+    """Whether a boolean query parameter is set."""
+    return (value or "").lower() in ("1", "true")
+
+
 @organization_pipeline_bp.route("/<organization_uuid>/pipelines", methods=["POST"])
 @any_application_required
 @validate_organization()
@@ -204,6 +242,9 @@ def remove(organization_uuid, organization_pipeline_uuid):
 @validate_organization(False)
 def pipelines(organization_uuid):
     """List all Organization Pipelines.
+
+    With summary, the last_pipeline_run of each pipeline is a summary of its
+    status (as for the runs of a pipeline).
     ---
     tags:
       - pipelines
@@ -213,6 +254,11 @@ def pipelines(organization_uuid):
         description: Requires key type REACT_CLIENT
         schema:
           type: string
+      - in: query
+        name: summary
+        description: Summarize the last run of each pipeline
+        schema:
+          type: boolean
     responses:
       "200":
         description: "List of pipelines"
@@ -243,7 +289,9 @@ def pipelines(organization_uuid):
         description: "Bad request"
     """
     try:
-        return jsonify(fetch_pipelines(organization_uuid))
+        return jsonify(
+            fetch_pipelines(organization_uuid, _is_true(request.args.get("summary")))
+        )
     except ValueError as value_error:
         return jsonify(value_error.args[0]), 400
     except HTTPError as http_error:
@@ -358,6 +406,321 @@ def upload_input_file(organization_uuid, organization_pipeline_uuid):
         return {"message": http_error.args[0]}, 503
 
 
+@organization_pipeline_bp.route(
+    "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/input_files/uploads",
+    methods=["POST"],
+)
+@any_application_required
+@validate_organization()
+def create_input_file_upload(organization_uuid, organization_pipeline_uuid):
+    """Start an upload of a file directly to the blob store.
+
+    The file is uploaded to the returned presigned URL (or, for a large file,
+    each of its parts to the URL of that part), and then completed. Until it is
+    completed it can't be used as an input to a PipelineRun.
+
+    A chunked upload is instead uploaded through this service one chunk at a
+    time, and can be resumed: its status lists the chunks still missing.
+    ---
+    tags:
+      - pipelines
+    parameters:
+      - in: header
+        name: Workflow-API-Key
+        description: Requires key type REACT_CLIENT
+        schema:
+          type: string
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              name:
+                type: string
+              size:
+                type: integer
+              chunked:
+                type: boolean
+    responses:
+      "200":
+        description: "OK"
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                uuid:
+                  type: string
+                name:
+                  type: string
+                method:
+                  type: string
+                url:
+                  type: string
+                upload_id:
+                  type: string
+                part_size:
+                  type: integer
+                chunks:
+                  type: integer
+                parts:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      part_number:
+                        type: integer
+                      url:
+                        type: string
+      "400":
+        description: "Bad request"
+      "503":
+        description: "Http error"
+    """
+    organization_pipeline = find_organization_pipeline(
+        organization_uuid, organization_pipeline_uuid
+    )
+    if not organization_pipeline:
+        return {"message": "No such pipeline found"}, 400
+
+    try:
+        return jsonify(
+            create_pipeline_input_file_upload(organization_pipeline, request.json)
+        )
+    except ValueError as value_error:
+        return jsonify(value_error.args[0]), 400
+    except HTTPError as http_error:
+        return {"message": http_error.args[0]}, 503
+    except ValidationError as validation_err:
+        return {"message": "Validation error", "errors": validation_err.messages}, 400
+
+
+@organization_pipeline_bp.route(
+    "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/input_files/<input_file_uuid>/chunks/<int:part_number>",
+    methods=["PUT"],
+)
+@any_application_required
+@validate_organization(False)
+def upload_input_file_chunk(
+    organization_uuid, organization_pipeline_uuid, input_file_uuid, part_number
+):
+    """Upload one chunk of a chunked upload.
+
+    Chunks may be uploaded in parallel, in any order, and retried.
+    ---
+    tags:
+      - pipelines
+    parameters:
+      - in: header
+        name: Workflow-API-Key
+        description: Requires key type REACT_CLIENT
+        schema:
+          type: string
+      - in: header
+        name: Content-Range
+        description: "Optional: bytes <first>-<last>/<size> of the chunk"
+        schema:
+          type: string
+      - in: query
+        name: offset
+        description: "Optional: byte offset of the chunk in the file"
+        schema:
+          type: integer
+    responses:
+      "200":
+        description: "OK"
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                part_number:
+                  type: integer
+                etag:
+                  type: string
+      "400":
+        description: "Bad request"
+      "503":
+        description: "Http error"
+    """
+    content_range = CONTENT_RANGE.match(request.headers.get("Content-Range", ""))
+    offset = request.args.get("offset")
+    if content_range:
+        offset = content_range[1]
+    try:
+        offset = None if offset is None else int(offset)
+    except ValueError:
+        return {"message": "offset must be an integer"}, 400
+
+    organization_pipeline = find_organization_pipeline(
+        organization_uuid, organization_pipeline_uuid
+    )
+    if not organization_pipeline:
+        return {"message": "No such pipeline found"}, 400
+
+    try:
+        return jsonify(
+            upload_pipeline_input_file_chunk(
+                organization_pipeline,
+                input_file_uuid,
+                part_number,
+                request.stream,
+                offset,
+            )
+        )
+    except ValueError as value_error:
+        return jsonify(value_error.args[0]), 400
+    except HTTPError as http_error:
+        return {"message": http_error.args[0]}, 503
+
+
+@organization_pipeline_bp.route(
+    "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/input_files/<input_file_uuid>/upload",
+    methods=["GET"],
+)
+@any_application_required
+@validate_organization(False)
+def input_file_upload(organization_uuid, organization_pipeline_uuid, input_file_uuid):
+    """Get the status of an upload, to resume it.
+    ---
+    tags:
+      - pipelines
+    parameters:
+      - in: header
+        name: Workflow-API-Key
+        description: Requires key type REACT_CLIENT
+        schema:
+          type: string
+    responses:
+      "200":
+        description: "OK"
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                uuid:
+                  type: string
+                name:
+                  type: string
+                size:
+                  type: integer
+                is_pending:
+                  type: boolean
+                part_size:
+                  type: integer
+                chunks:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      part_number:
+                        type: integer
+                      size:
+                        type: integer
+                      etag:
+                        type: string
+                missing:
+                  type: array
+                  items:
+                    type: integer
+      "400":
+        description: "Bad request"
+      "503":
+        description: "Http error"
+    """
+    organization_pipeline = find_organization_pipeline(
+        organization_uuid, organization_pipeline_uuid
+    )
+    if not organization_pipeline:
+        return {"message": "No such pipeline found"}, 400
+
+    try:
+        return jsonify(
+            fetch_pipeline_input_file_upload(organization_pipeline, input_file_uuid)
+        )
+    except ValueError as value_error:
+        return jsonify(value_error.args[0]), 400
+    except HTTPError as http_error:
+        return {"message": http_error.args[0]}, 503
+
+
+@organization_pipeline_bp.route(
+    "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/input_files/<input_file_uuid>/complete",
+    methods=["POST"],
+)
+@any_application_required
+@validate_organization()
+def complete_input_file_upload(
+    organization_uuid, organization_pipeline_uuid, input_file_uuid
+):
+    """Complete an upload of a file directly to the blob store.
+    ---
+    tags:
+      - pipelines
+    parameters:
+      - in: header
+        name: Workflow-API-Key
+        description: Requires key type REACT_CLIENT
+        schema:
+          type: string
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              etag:
+                type: string
+              parts:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    part_number:
+                      type: integer
+                    etag:
+                      type: string
+    responses:
+      "200":
+        description: "OK"
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                uuid:
+                  type: string
+                name:
+                  type: string
+      "400":
+        description: "Bad request"
+      "503":
+        description: "Http error"
+    """
+    organization_pipeline = find_organization_pipeline(
+        organization_uuid, organization_pipeline_uuid
+    )
+    if not organization_pipeline:
+        return {"message": "No such pipeline found"}, 400
+
+    try:
+        return jsonify(
+            complete_pipeline_input_file_upload(
+                organization_pipeline, input_file_uuid, request.json
+            )
+        )
+    except ValueError as value_error:
+        return jsonify(value_error.args[0]), 400
+    except HTTPError as http_error:
+        return {"message": http_error.args[0]}, 503
+    except ValidationError as validation_err:
+        return {"message": "Validation error", "errors": validation_err.messages}, 400
+
+
 @organization_pipeline_bp.route(
     "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/runs",
     methods=["POST"],
@@ -428,6 +791,14 @@ def create_pipeline_runs(organization_uuid, organization_pipeline_uuid):
 @validate_organization(False)
 def pipeline_runs(organization_uuid, organization_pipeline_uuid):
     """List all Organization Pipeline Runs.
+
+    When limit or cursor are given only one page of runs is returned, newest
+    first. The X-Next-Cursor header holds the cursor of the next page (it is
+    absent on the last page).
+
+    With summary, a page of run summaries (state, times, duration in seconds
+    and number of artifacts) is returned; only the runs that have not
+    finished are fetched from the workflow service.
     ---
     tags:
       - pipeline runs
@@ -437,9 +808,36 @@ def pipeline_runs(organization_uuid, organization_pipeline_uuid):
         description: Requires key type REACT_CLIENT
         schema:
           type: string
+      - in: query
+        name: limit
+        description: Maximum number of runs to return (at most 500)
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        description: X-Next-Cursor of the previous page
+        schema:
+          type: string
+      - in: query
+        name: total
+        description: Return an estimate of the number of runs in X-Total-Count
+        schema:
+          type: boolean
+      - in: query
+        name: summary
+        description: Return run summaries
+        schema:
+          type: boolean
     responses:
       "200":
         description: "List of pipeline runs"
+        headers:
+          X-Next-Cursor:
+            schema:
+              type: string
+          X-Total-Count:
+            schema:
+              type: integer
         content:
           application/json:
             schema:
@@ -472,10 +870,43 @@ def pipeline_runs(organization_uuid, organization_pipeline_uuid):
         description: "Http error"
     """
 
+    summary = _is_true(request.args.get("summary"))
+    if "limit" not in request.args and "cursor" not in request.args and not summary:
+        try:
+            return jsonify(
+                fetch_pipeline_runs(organization_uuid, organization_pipeline_uuid)
+            )
+        except ValueError as value_error:
+            return jsonify(value_error.args[0]), 400
+        except HTTPError as http_error:
+            return {"message": http_error.args[0]}, 503
+
     try:
-        return jsonify(
-            fetch_pipeline_runs(organization_uuid, organization_pipeline_uuid)
+        limit = int(request.args.get("limit", DEFAULT_PIPELINE_RUNS_LIMIT))
+    except ValueError:
+        return {"message": "limit must be an integer"}, 400
+    if not 0 < limit <= MAX_PIPELINE_RUNS_LIMIT:
+        return {
+            "message": f"limit must be between 1 and {MAX_PIPELINE_RUNS_LIMIT}"
+        }, 400
+
+    try:
+        (runs, next_cursor, total) = fetch_pipeline_runs_page(
+            organization_uuid,
+            organization_pipeline_uuid,
+            limit,
+            request.args.get("cursor"),
+            _is_true(request.args.get("total")),
+            summary,
         )
+
+        response = jsonify(runs)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if total is not None:
+            response.headers["X-Total-Count"] = str(total)
+
+        return response
     except ValueError as value_error:
         return jsonify(value_error.args[0]), 400
     except HTTPError as http_error:
@@ -650,6 +1081,240 @@ def pipeline_run_console(
         return {"message": http_error.args[0]}, 503
 
 
+@organization_pipeline_bp.route(
+    "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/runs/<organization_pipeline_run_uuid>/console/<output>",
+    methods=["GET"],
+)
+@any_application_required
+@validate_organization(False)
+def pipeline_run_console_output(
+    organization_uuid,
+    organization_pipeline_uuid,
+    organization_pipeline_run_uuid,
+    output,
+):
+    """Fetch one Organization Pipeline Run Console Output, as text.
+
+    Only the output from the byte offset given by the offset parameter, or by
+    a Range header, is returned, so that clients can fetch only what is new.
+    The X-Next-Offset header holds the offset following the output, and
+    X-Run-Finished whether the output is complete.
+
+    When text/event-stream is accepted the output is followed as Server-Sent
+    Events until the run finishes: the data of each event is new output (as
+    a JSON string), and its id is the offset following it. The stream is
+    closed after CONSOLE_STREAM_MAX_DURATION seconds, without a finished
+    event; reconnecting clients resume from their Last-Event-ID.
+
+    Each stream occupies a worker until it ends, so the app must be served
+    by threaded or async (gevent, eventlet) workers.
+    ---
+    tags:
+      - pipeline runs
+    parameters:
+      - in: header
+        name: Workflow-API-Key
+        description: Requires key type REACT_CLIENT
+        schema:
+          type: string
+      - in: path
+        name: output
+        description: std_out or std_err
+        schema:
+          type: string
+      - in: query
+        name: offset
+        description: Byte offset to return the output from
+        schema:
+          type: integer
+    responses:
+      "200":
+        description: "Console output"
+        headers:
+          X-Next-Offset:
+            schema:
+              type: integer
+          X-Run-Finished:
+            schema:
+              type: boolean
+        content:
+          text/plain:
+            schema:
+              type: string
+          text/event-stream:
+            schema:
+              type: string
+      "206":
+        description: "The requested range of the console output"
+      "400":
+        description: "Bad request"
+      "416":
+        description: "The requested range is past the end of the output"
+      "503":
+        description: "Http error"
+    """
+    if output not in CONSOLE_OUTPUTS:
+        return {"message": f"output must be one of {list(CONSOLE_OUTPUTS)}"}, 400
+
+    byte_range = BYTE_RANGE.match(request.headers.get("Range", ""))
+    offset = request.headers.get("Last-Event-ID", request.args.get("offset", 0))
+    if byte_range:
+        offset = byte_range[1]
+    try:
+        offset = int(offset)
+    except ValueError:
+        return {"message": "offset must be an integer"}, 400
+    if offset < 0:
+        return {"message": "offset must not be negative"}, 400
+
+    if not find_organization_pipeline_and_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+    ):
+        return {"message": "No such pipeline run found"}, 400
+
+    if request.accept_mimetypes.best == "text/event-stream":
+        events = stream_pipeline_run_console_output(
+            organization_uuid,
+            organization_pipeline_uuid,
+            organization_pipeline_run_uuid,
+            output,
+            offset,
+            float(current_app.config[CONSOLE_POLL_INTERVAL]),
+            float(current_app.config[CONSOLE_STREAM_MAX_DURATION]),
+        )
+        return Response(
+            stream_with_context(_console_events(events)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    try:
+        (data, length, finished) = fetch_pipeline_run_console_output(
+            organization_uuid,
+            organization_pipeline_uuid,
+            organization_pipeline_run_uuid,
+            output,
+            offset,
+        )
+    except ValueError as value_error:
+        return jsonify(value_error.args[0]), 400
+    except HTTPError as http_error:
+        return {"message": http_error.args[0]}, 503
+
+    headers = {"X-Run-Finished": str(finished).lower()}
+    if not byte_range:
+        headers["X-Next-Offset"] = str(offset + len(data))
+        return Response(data, mimetype="text/plain", headers=headers)
+
+    last = int(byte_range[2]) if byte_range[2] else length - 1
+    if offset >= length or last < offset:
+        headers["Content-Range"] = f"bytes */{length}"
+        return Response(status=416, headers=headers)
+
+    data = data[: last - offset + 1]
+    headers["X-Next-Offset"] = str(offset + len(data))
+    headers["Content-Range"] = f"bytes {offset}-{offset + len(data) - 1}/{length}"
+    return Response(data, status=206, mimetype="text/plain", headers=headers)
+
+
+def _console_events(events):
+    """Format (offset, text, finished) console output as Server-Sent Events.
+
+    The finished event is only sent once the run has finished: a stream that
+    ends before (see CONSOLE_STREAM_MAX_DURATION) is resumed by the client.
+    """
+    try:
+        for (offset, text, finished) in events:
+            if text:
+                yield f"id: {offset}\ndata: {json.dumps(text)}\n\n"
+            elif not finished:
+                # keeps the connection alive while the run is quiet.
+                yield ": waiting\n\n"
+            if finished:
+                yield "event: finished\ndata: {}\n\n"
+    except (ValueError, HTTPError) as error:
+        logger.warning("console output stream failed: %s", error)
+        yield f"event: error\ndata: {json.dumps(error.args[0])}\n\n"
+
+
+@organization_pipeline_bp.route(
+    "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/runs/<organization_pipeline_run_uuid>/status",
+    methods=["POST"],
+)
+def update_run_status(
+    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+):
+    """Report the status of an Organization Pipeline Run.
+
+    Called by the workflow service when the state or artifacts of a pipeline
+    run change. Authenticated by the status_update_token of the run rather
+    than by a user.
+    ---
+    tags:
+      - pipeline runs
+    parameters:
+      - in: header
+        name: Authorization
+        description: "Bearer <status_update_token>"
+        schema:
+          type: string
+    requestBody:
+      description: "The pipeline run, as returned by the workflow service."
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              states:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    created_at:
+                      type: string
+                    state:
+                      type: string
+              artifacts:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    uuid:
+                      type: string
+                    name:
+                      type: string
+                    url:
+                      type: string
+    responses:
+      "200":
+        description: "Updated"
+      "400":
+        description: "Bad request"
+      "401":
+        description: "Invalid status update token"
+    """
+    (_, _, status_update_token) = request.headers.get("Authorization", "").partition(
+        "Bearer "
+    )
+
+    try:
+        update_pipeline_run_status(
+            organization_uuid,
+            organization_pipeline_uuid,
+            organization_pipeline_run_uuid,
+            status_update_token,
+            request.get_json(silent=True) or {},
+        )
+        return {}, 200
+    except ValueError as value_error:
+        return jsonify(value_error.args[0]), 400
+    except PermissionError as permission_error:
+        return {"message": permission_error.args[0]}, 401
+    except ValidationError as validation_err:
+        return {"message": "Validation error", "errors": validation_err.messages}, 400
+
+
 @organization_pipeline_bp.route(
     "/<organization_uuid>/pipelines/<organization_pipeline_uuid>/runs/<organization_pipeline_run_uuid>/charts",
     methods=["POST"],
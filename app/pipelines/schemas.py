@@ -1,7 +1,8 @@
 from blob_utils.schemas import UUID
-from marshmallow import Schema, fields, validate
+from marshmallow import INCLUDE, Schema, fields, validate
 
-from .models import ArtifactChart
+from ..blobs import MAX_PARTS
+from .models import ArtifactChart, OrganizationPipelineInputFile
 
 
 class CreateArtifactChart(Schema):
@@ -17,3 +18,59 @@ class CreateArtifactChart(Schema):
         validate=validate.Length(min=1, max=ArtifactChart.chart_type_code.type.length),
     )
     chart_config = fields.Field(missing={})
+
+
+class PipelineRunState(Schema):
+    """ A state of a pipeline run, as reported by the workflow service. """
+
+    class Meta:
+        unknown = INCLUDE
+
+    state = fields.Str(required=True, validate=validate.Length(min=1))
+    created_at = fields.Str(required=True)
+
+
+class UpdatePipelineRunStatus(Schema):
+    """Validation schema for update_pipeline_run_status()
+
+    Any other keys of the pipeline run are kept as they are.
+    """
+
+    class Meta:
+        unknown = INCLUDE
+
+    states = fields.List(
+        fields.Nested(PipelineRunState), required=True, validate=validate.Length(min=1)
+    )
+    artifacts = fields.List(fields.Dict())
+
+
+class CreatePipelineInputFileUpload(Schema):
+    """ Validation schema for create_pipeline_input_file_upload() """
+
+    name = fields.Str(
+        required=True,
+        validate=validate.Length(
+            min=2, max=OrganizationPipelineInputFile.name.type.length
+        ),
+    )
+    size = fields.Int(required=True, validate=validate.Range(min=0))
+    chunked = fields.Bool(missing=False)
+
+
+class UploadedPart(Schema):
+    """ A part of a multipart upload, as uploaded to its presigned URL. """
+
+    part_number = fields.Int(required=True, validate=validate.Range(1, MAX_PARTS))
+    etag = fields.Str(required=True, validate=validate.Length(min=1))
+
+
+class CompletePipelineInputFileUpload(Schema):
+    """Validation schema for complete_pipeline_input_file_upload()
+
+    etag is the ETag the blob store returned for a single PUT upload; parts are
+    required to complete a multipart upload.
+    """
+
+    etag = fields.Str()
+    parts = fields.List(fields.Nested(UploadedPart), missing=[])
@@ -1,34 +1,66 @@
+import base64
+import hashlib
+import hmac
+import json
+import math
+import tempfile
+import time
 import uuid
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 
-from flask import current_app
 from urllib.parse import quote
 
-import requests
-from app.constants import S3_BUCKET, WORKFLOW_API_TOKEN, WORKFLOW_HOSTNAME
-from application_roles.decorators import ROLES_KEY
 from blob_utils import create_url, upload_stream
+from botocore.exceptions import ClientError
+from flask import current_app, g
 from requests import HTTPError
+from sqlalchemy.exc import IntegrityError
 
+from ..blobs import blob_client, presigned_urls
+from ..constants import (
+    PIPELINE_RUN_CACHE,
+    PIPELINE_RUN_CACHE_ACTIVE_TTL,
+    S3_PRESIGNED_TIMEOUT,
+)
 from ..utils import make_hash
-from .schemas import CreateArtifactChart
+from ..workflow_client import start_workflow_deadline, workflow_client
+from .schemas import (
+    CompletePipelineInputFileUpload,
+    CreateArtifactChart,
+    CreatePipelineInputFileUpload,
+    UpdatePipelineRunStatus,
+)
 from .models import (
+    CONSOLE_OUTPUTS,
+    FINISHED_PIPELINE_RUN_STATES,
     ArtifactChart,
+    InputFileContent,
     OrganizationPipeline,
     OrganizationPipelineInputFile,
     OrganizationPipelineRun,
     db,
 )
 from .queries import (
+    estimate_organization_pipeline_run_count,
+    find_expired_pipeline_input_file_uploads,
     find_organization_pipeline,
+    find_organization_pipeline_and_run,
+    find_organization_pipeline_input_file,
     find_organization_pipeline_input_files,
-    find_organization_pipeline_run,
     find_organization_pipelines,
-    find_latest_organization_pipeline_run,
+    find_latest_organization_pipeline_runs,
+    find_organization_pipeline_run_input_files,
+    find_organization_pipeline_runs_page,
+    find_unfinished_organization_pipeline_runs,
+    find_unreferenced_input_file_contents,
     search_organization_pipeline_input_files,
     search_organization_pipeline_runs,
 )
 
+# Chunks larger than this are buffered on disk rather than in memory.
+CHUNK_BUFFER_SIZE = 8 * 1024 * 1024
+
 
 def create_organization_pipeline(organization_uuid, pipeline_uuid):
     """ Create OrganizationPipeline record. """
@@ -44,12 +76,8 @@ def create_organization_pipeline(organization_uuid, pipeline_uuid):
 
 def create_pipeline(organization_uuid, request_json):
     """ Create a new pipeline associated with an organization. """
-    response = requests.post(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().post(
+        "/v1/pipelines",
         json=request_json,
     )
 
@@ -75,12 +103,8 @@ def update_pipeline(organization_uuid, pipeline_uuid, request_json):
     if not organization_pipeline:
         raise ValueError({"message": "organizational_pipeline_uuid not found"})
 
-    response = requests.put(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().put(
+        f"/v1/pipelines/{organization_pipeline.pipeline_uuid}",
         json=request_json,
     )
 
@@ -113,17 +137,16 @@ def delete_pipeline(organization_uuid, organization_pipeline_uuid):
     if not organization_pipeline:
         raise ValueError({"message": "organizational_pipeline_uuid not found"})
 
-    response = requests.delete(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().delete(
+        f"/v1/pipelines/{organization_pipeline.pipeline_uuid}"
     )
 
     response.raise_for_status()
 
     organization_pipeline.is_deleted = True
+    _release_input_file_contents(
+        find_organization_pipeline_input_files(organization_pipeline.id)
+    )
     db.session.commit()
 
 
@@ -144,12 +167,8 @@ def fetch_pipeline(organization_uuid, organization_pipeline_uuid):
     if not organization_pipeline:
         raise ValueError({"message": "organizational_pipeline_uuid not found"})
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().get(
+        f"/v1/pipelines/{organization_pipeline.pipeline_uuid}"
     )
 
     data = response.json()
@@ -158,9 +177,17 @@ def fetch_pipeline(organization_uuid, organization_pipeline_uuid):
     return data
 
 
-def fetch_pipelines(organization_uuid):
+def fetch_pipelines(organization_uuid, summary=False):
     """Find all OrganizationPipelines for an organization.
 
+    The latest run of every pipeline, and their input files, are looked up in
+    a constant number of queries regardless of the number of pipelines, and
+    are fetched from the workflow service concurrently.
+
+    When summary is set the latest runs are summarized from their status
+    columns instead (see _summarize_pipeline_runs()), only fetching those
+    that have not finished.
+
     Note: assumes that the organization_uuid has already been verified (by
     validate_organization() mixin)
 
@@ -169,16 +196,13 @@ def fetch_pipelines(organization_uuid):
     args[0] contains the json message from the backing server)
     """
 
-    organization_pipelines = find_organization_pipelines(organization_uuid)
+    organization_pipelines = {
+        op.pipeline_uuid: op for op in find_organization_pipelines(organization_uuid)
+    }
 
-    # TODO timeouts - enforce a strict timeout.
-    response = requests.post(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/search",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
-        json={"uuids": [op.pipeline_uuid for op in organization_pipelines]},
+    response = workflow_client().post(
+        "/v1/pipelines/search",
+        json={"uuids": list(organization_pipelines)},
     )
 
     try:
@@ -186,42 +210,59 @@ def fetch_pipelines(organization_uuid):
 
         response.raise_for_status()
 
+        latest_pipeline_runs = {
+            opr.organization_pipeline_id: opr
+            for opr in find_latest_organization_pipeline_runs(
+                [op.id for op in organization_pipelines.values()]
+            )
+        }
+
         # Match up the pipelines returned in the json_value with the
         # organization_pipelines in organization_pipelines - they should match
         # exactly. If they don't, throw an error.
+        pipelines_with_runs = []
         for pipeline in json_value:
-            organization_pipeline = next(
-                (
-                    op
-                    for op in organization_pipelines
-                    if op.pipeline_uuid == pipeline["uuid"]
-                )
-            )
+            organization_pipeline = organization_pipelines[pipeline["uuid"]]
 
             pipeline["uuid"] = organization_pipeline.uuid
-            latest_pipeline_run = find_latest_organization_pipeline_run(
-                organization_pipeline.id
-            )
+            latest_pipeline_run = latest_pipeline_runs.get(organization_pipeline.id)
 
-            if not latest_pipeline_run:
-                continue
+            if latest_pipeline_run:
+                pipelines_with_runs.append(
+                    (pipeline, (organization_pipeline, latest_pipeline_run))
+                )
 
-            pipeline_run = fetch_pipeline_run(
-                organization_uuid, organization_pipeline.uuid, latest_pipeline_run.uuid
+        if summary:
+            pipeline_runs = _summarize_pipeline_runs(
+                [org_pipeline_run for _, org_pipeline_run in pipelines_with_runs]
+            )
+        else:
+            pipeline_runs = fetch_pipeline_run_batch(
+                [org_pipeline_run for _, org_pipeline_run in pipelines_with_runs]
             )
+        for (pipeline, _), pipeline_run in zip(pipelines_with_runs, pipeline_runs):
+            pipeline["last_pipeline_run"] = pipeline_run
 
-            if pipeline_run:
-                pipeline["last_pipeline_run"] = pipeline_run
+        _commit_run_status()
 
         return json_value
     except ValueError as value_error:
         raise HTTPError("Non JSON payload returned") from value_error
     except HTTPError as http_error:
         raise ValueError(json_value) from http_error
-    except StopIteration as stop_iteration:
+    except KeyError as key_error:
         raise ValueError(
             "Unable to match Pipeline to OrganizationPipeline"
-        ) from stop_iteration
+        ) from key_error
+
+
+def _group_input_files(input_files):
+    """ Group OrganizationPipelineInputFiles by organization_pipeline_run_id """
+    grouped = {}
+    for opf in input_files:
+        grouped.setdefault(opf.organization_pipeline_run_id, []).append(opf)
+
+    return grouped
 
 
 def create_pipeline_input_file(organization_pipeline, filename, stream):
@@ -231,21 +272,380 @@ def create_pipeline_input_file(organization_pipeline, filename, stream):
     if len(filename) > OrganizationPipelineInputFile.name.type.length:
         raise ValueError("filename too long")
 
-    sname = quote(filename)
-    input_file_uuid = uuid.uuid4().hex
-    upload_stream(
-        f"{organization_pipeline.uuid}/{input_file_uuid}-{sname}",
-        stream,
+    organization_pipeline_id = organization_pipeline.id
+
+    # hash the file while it is buffered: content that is already stored isn't
+    # uploaded again.
+    digest = hashlib.sha256()
+    with tempfile.SpooledTemporaryFile(max_size=CHUNK_BUFFER_SIZE) as content:
+        for data in iter(lambda: stream.read(CHUNK_BUFFER_SIZE), b""):
+            digest.update(data)
+            content.write(data)
+        size = content.tell()
+        sha256 = digest.hexdigest()
+
+        if not _reference_input_file_content(sha256):
+            # end the transaction first, rather than holding it open while
+            # the whole file is uploaded.
+            db.session.commit()
+            content.seek(0)
+            upload_stream(_content_key(sha256), content)
+            _create_input_file_content(sha256, size)
+
+    input_file = OrganizationPipelineInputFile(
+        name=filename,
+        organization_pipeline_id=organization_pipeline_id,
+        size=size,
+        content_sha256=sha256,
+        blob_key=_content_key(sha256),
+    )
+    db.session.add(input_file)
+
+    db.session.commit()
+
+    return input_file
+
+
+def _content_key(sha256):
+    """ The blob store key of an InputFileContent. """
+    return f"content/{sha256}"
+
+
+def _reference_input_file_content(sha256):
+    """Add a reference to the InputFileContent of sha256, and return whether
+    there is one."""
+    return (
+        InputFileContent.query.filter(InputFileContent.sha256 == sha256).update(
+            {InputFileContent.reference_count: InputFileContent.reference_count + 1},
+            synchronize_session=False,
+        )
+        == 1
+    )
+
+
+def _create_input_file_content(sha256, size):
+    """Create a referenced InputFileContent, once its blob is uploaded,
+    unless another upload just did.
+
+    The insert is made in a savepoint, so that losing the race does not roll
+    back the rest of the caller's transaction.
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.add(
+                InputFileContent(sha256=sha256, size=size, reference_count=1)
+            )
+    except IntegrityError:
+        _reference_input_file_content(sha256)
+
+
+def _release_input_file_contents(input_files):
+    """ Remove the references of input_files to their InputFileContents. """
+    references = Counter(
+        input_file.content_sha256
+        for input_file in input_files
+        if input_file.content_sha256
     )
+    for (sha256, count) in references.items():
+        InputFileContent.query.filter(InputFileContent.sha256 == sha256).update(
+            {
+                InputFileContent.reference_count: InputFileContent.reference_count
+                - count
+            },
+            synchronize_session=False,
+        )
 
-    input_file = OrganizationPipelineInputFile(uuid=input_file_uuid, name=filename)
-    organization_pipeline.organization_pipeline_input_files.append(input_file)
 
+def delete_unreferenced_input_file_contents(min_age=timedelta(days=1)):
+    """Delete the InputFileContents (and their blobs) that no input file has
+    referenced for min_age, and return how many were deleted.
+
+    An upload of the same content in the meantime references it again.
+    """
+    deleted = 0
+    contents = [
+        (content.id, content.sha256)
+        for content in find_unreferenced_input_file_contents(datetime.now() - min_age)
+    ]
+    for (content_id, sha256) in contents:
+        if InputFileContent.query.filter(
+            InputFileContent.id == content_id, InputFileContent.reference_count <= 0
+        ).delete(synchronize_session=False):
+            # the deleted row stays locked until the commit, so an upload of
+            # the same content waits for it, finds no InputFileContent, and
+            # uploads the blob again only after it has been deleted. If the
+            # blob can't be deleted the row is rolled back, for the next run.
+            blob_client().delete(_content_key(sha256))
+            db.session.commit()
+            deleted += 1
+
+    db.session.commit()
+    return deleted
+
+
+def _input_file_key(organization_pipeline_uuid, input_file_uuid, filename):
+    """ The blob store key of an OrganizationPipelineInputFile. """
+    return f"{organization_pipeline_uuid}/{input_file_uuid}-{quote(filename)}"
+
+
+def _raise_blob_error(client_error):
+    """Raise a ValueError for a blob store error caused by the request (a 4xx),
+    and an HTTPError for any other."""
+    status = client_error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    message = client_error.response.get("Error", {}).get("Message", str(client_error))
+    if status and status < 500:
+        raise ValueError({"message": message}) from client_error
+    raise HTTPError(message) from client_error
+
+
+def create_pipeline_input_file_upload(organization_pipeline, request_json):
+    """Create a pending OrganizationPipelineInputFile, to be uploaded directly
+    to the blob store, or in chunks (see upload_pipeline_input_file_chunk()).
+
+    Raises a ValidationError if request_json is not valid.
+
+    Returns JSON with the presigned URL, or multipart upload parts, to upload
+    the file to (see BlobClient.create_upload()). A chunked upload returns
+    its part_size, and the number of chunks to upload instead.
+    """
+    data = CreatePipelineInputFileUpload().load(request_json)
+    if data["chunked"] and not data["size"]:
+        raise ValueError({"message": "a chunked upload can't be empty"})
+
+    input_file = OrganizationPipelineInputFile(
+        uuid=uuid.uuid4().hex,
+        name=data["name"],
+        organization_pipeline_id=organization_pipeline.id,
+        is_pending=True,
+        size=data["size"],
+    )
+    key = input_file.blob_key = _input_file_key(
+        organization_pipeline.uuid, input_file.uuid, data["name"]
+    )
+    try:
+        if data["chunked"]:
+            upload = {
+                "upload_id": blob_client().start_multipart_upload(key),
+                "part_size": blob_client().part_size_for(data["size"]),
+            }
+            upload["chunks"] = math.ceil(data["size"] / upload["part_size"])
+        else:
+            upload = blob_client().create_upload(key, data["size"])
+    except ClientError as client_error:
+        _raise_blob_error(client_error)
+
+    input_file.upload_id = upload.get("upload_id")
+    input_file.part_size = upload.get("part_size")
+    db.session.add(input_file)
     db.session.commit()
 
+    return dict(upload, uuid=input_file.uuid, name=input_file.name)
+
+
+def _find_input_file(organization_pipeline, input_file_uuid):
+    input_file = find_organization_pipeline_input_file(
+        organization_pipeline.id, input_file_uuid
+    )
+    if not input_file:
+        raise ValueError({"message": "input_file_uuid not found"})
+
     return input_file
 
 
+def _chunk_count(input_file):
+    """ The number of chunks of a multipart OrganizationPipelineInputFile. """
+    return math.ceil(input_file.size / input_file.part_size)
+
+
+def _chunk_range(input_file, part_number):
+    """ The (offset, size) of a chunk of a multipart OrganizationPipelineInputFile. """
+    offset = (part_number - 1) * input_file.part_size
+    return (offset, min(input_file.part_size, input_file.size - offset))
+
+
+def _missing_chunks(input_file, parts):
+    """ The part numbers of the chunks not among the (part_number, size, etag) parts. """
+    uploaded = {
+        part_number
+        for (part_number, size, _) in parts
+        if size == _chunk_range(input_file, part_number)[1]
+    }
+    return [
+        part_number
+        for part_number in range(1, _chunk_count(input_file) + 1)
+        if part_number not in uploaded
+    ]
+
+
+def upload_pipeline_input_file_chunk(
+    organization_pipeline, input_file_uuid, part_number, stream, offset=None
+):
+    """Upload one chunk of a chunked OrganizationPipelineInputFile.
+
+    Chunk part_number (counting from 1) holds the part_size bytes of the file
+    from offset (part_number - 1) * part_size; only the last chunk is shorter.
+    Chunks may be uploaded in any order, in parallel, and uploaded again.
+
+    Raises a ValueError if the file has no such chunk, or the chunk is not the
+    expected offset and size.
+
+    Returns JSON with the part_number and etag of the chunk.
+    """
+    input_file = _find_input_file(organization_pipeline, input_file_uuid)
+    if not (input_file.is_pending and input_file.part_size):
+        raise ValueError({"message": "input file is not being uploaded in chunks"})
+    if not 1 <= part_number <= _chunk_count(input_file):
+        raise ValueError({"message": f"input file has no chunk {part_number}"})
+
+    (chunk_offset, size) = _chunk_range(input_file, part_number)
+    if offset is not None and offset != chunk_offset:
+        raise ValueError(
+            {"message": f"chunk {part_number} starts at offset {chunk_offset}"}
+        )
+
+    # buffer the chunk, so that its size is known before it is uploaded.
+    with tempfile.SpooledTemporaryFile(max_size=CHUNK_BUFFER_SIZE) as chunk:
+        while True:
+            data = stream.read(min(CHUNK_BUFFER_SIZE, size + 1 - chunk.tell()))
+            if not data:
+                break
+            chunk.write(data)
+        if chunk.tell() != size:
+            raise ValueError({"message": f"chunk {part_number} must be {size} bytes"})
+
+        chunk.seek(0)
+        try:
+            etag = blob_client().upload_part(
+                input_file.blob_key,
+                input_file.upload_id,
+                part_number,
+                chunk,
+                size,
+            )
+        except ClientError as client_error:
+            _raise_blob_error(client_error)
+
+    return {"part_number": part_number, "etag": etag}
+
+
+def fetch_pipeline_input_file_upload(organization_pipeline, input_file_uuid):
+    """Fetch the status of the upload of an OrganizationPipelineInputFile: the
+    chunks the blob store has, and those still missing.
+
+    Raises a ValueError if the file is not found.
+    """
+    input_file = _find_input_file(organization_pipeline, input_file_uuid)
+
+    status = {
+        "uuid": input_file.uuid,
+        "name": input_file.name,
+        "size": input_file.size,
+        "is_pending": input_file.is_pending,
+        "part_size": input_file.part_size,
+        "chunks": [],
+        "missing": [],
+    }
+    if input_file.is_pending and input_file.part_size:
+        try:
+            parts = blob_client().list_parts(
+                input_file.blob_key,
+                input_file.upload_id,
+            )
+        except ClientError as client_error:
+            _raise_blob_error(client_error)
+
+        status["chunks"] = [
+            {"part_number": part_number, "size": size, "etag": etag}
+            for (part_number, size, etag) in parts
+        ]
+        status["missing"] = _missing_chunks(input_file, parts)
+
+    return status
+
+
+def complete_pipeline_input_file_upload(
+    organization_pipeline, input_file_uuid, request_json
+):
+    """Complete the upload of a pending OrganizationPipelineInputFile, once the
+    size (and ETag, when given) of the uploaded blob are verified.
+
+    The parts of a multipart upload are assembled in the blob store: either
+    the parts given, or every chunk it has received.
+
+    A file whose blob doesn't match is removed, and must be uploaded again.
+
+    Raises a ValidationError if request_json is not valid.
+    Raises a ValueError if the file is not found, chunks of it are missing, or
+    its blob doesn't match.
+    """
+    data = CompletePipelineInputFileUpload().load(request_json)
+
+    input_file = _find_input_file(organization_pipeline, input_file_uuid)
+    if not input_file.is_pending:
+        return {"uuid": input_file.uuid, "name": input_file.name}
+
+    key = input_file.blob_key
+    parts = [(part["part_number"], part["etag"]) for part in data["parts"]]
+    try:
+        if input_file.upload_id and not parts:
+            uploaded = blob_client().list_parts(key, input_file.upload_id)
+            missing = _missing_chunks(input_file, uploaded)
+            if missing:
+                raise ValueError(
+                    {"message": "chunks of the file are missing", "missing": missing}
+                )
+            parts = [(part_number, etag) for (part_number, _, etag) in uploaded]
+
+        (size, etag) = blob_client().complete_upload(key, input_file.upload_id, parts)
+    except ClientError as client_error:
+        _raise_blob_error(client_error)
+
+    if size != input_file.size or data.get("etag", etag).strip('"') != etag:
+        blob_client().abort_upload(key)
+        db.session.delete(input_file)
+        db.session.commit()
+        raise ValueError({"message": "uploaded file does not match"})
+
+    input_file.is_pending = False
+    input_file.upload_id = None
+    db.session.commit()
+
+    return {"uuid": input_file.uuid, "name": input_file.name}
+
+
+def abort_expired_pipeline_input_file_uploads(max_age=None):
+    """Abort the uploads of the OrganizationPipelineInputFiles still pending
+    after max_age (by default, once their presigned URLs have expired), and
+    return how many were aborted.
+
+    The parts of an abandoned multipart upload are otherwise kept (and paid
+    for) by the blob store indefinitely.
+    """
+    if max_age is None:
+        max_age = timedelta(seconds=current_app.config[S3_PRESIGNED_TIMEOUT])
+
+    aborted = 0
+    uploads = [
+        (input_file.id, input_file.blob_key, input_file.upload_id)
+        for input_file in find_expired_pipeline_input_file_uploads(
+            datetime.now() - max_age
+        )
+    ]
+    for (input_file_id, key, upload_id) in uploads:
+        if OrganizationPipelineInputFile.query.filter(
+            OrganizationPipelineInputFile.id == input_file_id,
+            OrganizationPipelineInputFile.is_pending == True,
+        ).delete(synchronize_session=False):
+            # an upload completed in the meantime is kept. If the upload can't
+            # be aborted the row is rolled back, for the next run.
+            blob_client().abort_upload(key, upload_id)
+            db.session.commit()
+            aborted += 1
+
+    db.session.commit()
+    return aborted
+
+
 def create_pipeline_run(organization_uuid, pipeline_uuid, request_json):
     """Creates OrganizationPipelineRuns for a pipline."""
     org_pipeline = find_organization_pipeline(organization_uuid, pipeline_uuid)
@@ -270,19 +670,17 @@ def create_pipeline_run(organization_uuid, pipeline_uuid, request_json):
     db.session.add(new_pipeline_run)
     db.session.flush()
 
-    new_pipeline = {"inputs": []}
-
-    for opf in org_pipeline_input_files:
-        sname = quote(opf.name)
-        url = create_url(f"{pipeline_uuid}/{opf.uuid}-{sname}", sname)
-        new_pipeline["inputs"].append({"url": url, "name": opf.name})
+    # the workflow service may download the inputs long after the run is
+    # created, so their urls are signed now rather than reused.
+    new_pipeline = {
+        "inputs": [
+            {"url": _sign_input_file_url(opf.blob_key, opf.name), "name": opf.name}
+            for opf in org_pipeline_input_files
+        ]
+    }
 
-    response = requests.post(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{org_pipeline.pipeline_uuid}/runs",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().post(
+        f"/v1/pipelines/{org_pipeline.pipeline_uuid}/runs",
         json=new_pipeline,
     )
 
@@ -293,6 +691,7 @@ def create_pipeline_run(organization_uuid, pipeline_uuid, request_json):
         new_pipeline_run.uuid = (
             new_pipeline_run.pipeline_run_uuid
         ) = created_pipeline.get("uuid")
+        _sync_run_status(new_pipeline_run, created_pipeline)
 
         db.session.add(new_pipeline_run)
 
@@ -315,6 +714,23 @@ def create_pipeline_run(organization_uuid, pipeline_uuid, request_json):
         raise ValueError(created_pipeline) from http_error
 
 
+def _find_pipeline_run(
+    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+):
+    """Find an OrganizationPipeline and one of its OrganizationPipelineRuns.
+
+    Raises a ValueError when either is not found.
+    """
+    result = find_organization_pipeline_and_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+    )
+
+    if result is None:
+        raise ValueError({"message": "organization_pipeline_run_uuid not found"})
+
+    return result
+
+
 def delete_pipeline_run(
     organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
 ):
@@ -327,32 +743,21 @@ def delete_pipeline_run(
     Raises a ValueError when there is some downstream error (its
     args[0] contains the json message from the backing server)
     """
-    org_pipeline = find_organization_pipeline(
-        organization_uuid, organization_pipeline_uuid
+    (org_pipeline, org_pipeline_run) = _find_pipeline_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
     )
 
-    if not org_pipeline:
-        raise ValueError({"message": "organizational_pipeline_uuid not found"})
-
-    org_pipeline_run = next(
-        filter(
-            lambda r: r.uuid == organization_pipeline_run_uuid,
-            org_pipeline.organization_pipeline_runs,
-        )
-    )
-
-    response = requests.delete(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{org_pipeline.pipeline_uuid}/runs/{org_pipeline_run.pipeline_run_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().delete(
+        f"/v1/pipelines/{org_pipeline.pipeline_uuid}/runs/{org_pipeline_run.pipeline_run_uuid}"
     )
 
     try:
         response.raise_for_status()
         org_pipeline_run.is_deleted = True
         db.session.commit()
+        current_app.extensions[PIPELINE_RUN_CACHE].delete(
+            org_pipeline_run.pipeline_run_uuid
+        )
 
     except ValueError as value_error:
         raise HTTPError("Non JSON payload returned") from value_error
@@ -360,61 +765,78 @@ def delete_pipeline_run(
         raise ValueError(response.json()) from http_error
 
 
-def delete_pipeline_run(
-    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+def update_pipeline_run_status(
+    organization_uuid,
+    organization_pipeline_uuid,
+    organization_pipeline_run_uuid,
+    status_update_token,
+    request_json,
 ):
-    """Delete a OrganizationPipelineRun.
-
-    Note: assumes that the organization_uuid has already been verified (by
-    validate_organization() mixin)
-
-    Raises a an HTTPError when there is some unrecoverable downstream error.
-    Raises a ValueError when there is some downstream error (its
-    args[0] contains the json message from the backing server)
+    """Update the status snapshot of an OrganizationPipelineRun.
+
+    Called back by the workflow service when the state or artifacts of a
+    pipeline run change. Keys of request_json replace those of the
+    snapshot. Once the snapshot has the artifacts, the pipeline run is
+    answered from it (see _get_pipeline_runs()); until then it is merged over
+    the pipeline run fetched from the workflow service.
+
+    Raises a ValueError when the pipeline run is not found.
+    Raises a PermissionError when status_update_token is not the (unexpired)
+    status_update_token of the pipeline run.
+    Raises a ValidationError if request_json is not valid.
     """
-    org_pipeline = find_organization_pipeline(
-        organization_uuid, organization_pipeline_uuid
+    (_, org_pipeline_run) = _find_pipeline_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
     )
 
-    if not org_pipeline:
-        raise ValueError({"message": "organizational_pipeline_uuid not found"})
-
-    org_pipeline_run = next(
-        filter(
-            lambda r: r.uuid == organization_pipeline_run_uuid,
-            org_pipeline.organization_pipeline_runs,
+    if (
+        not hmac.compare_digest(
+            org_pipeline_run.status_update_token.encode(),
+            (status_update_token or "").encode(),
         )
+        or org_pipeline_run.status_update_token_expires_at < datetime.now()
+    ):
+        raise PermissionError("Invalid status update token")
+
+    data = UpdatePipelineRunStatus().load(request_json)
+
+    org_pipeline_run.status_snapshot = dict(
+        org_pipeline_run.status_snapshot or {}, **data
     )
+    org_pipeline_run.status_updated_at = datetime.now()
+    _sync_run_status(org_pipeline_run, org_pipeline_run.status_snapshot)
+    db.session.commit()
 
-    response = requests.delete(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{org_pipeline.pipeline_uuid}/runs/{org_pipeline_run.pipeline_run_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    current_app.extensions[PIPELINE_RUN_CACHE].delete(
+        org_pipeline_run.pipeline_run_uuid
     )
 
-    try:
-        response.raise_for_status()
-        org_pipeline_run.is_deleted = True
-        db.session.commit()
 
-    except ValueError as value_error:
-        raise HTTPError("Non JSON payload returned") from value_error
-    except HTTPError as http_error:
-        raise ValueError(response.json()) from http_error
+def _fetch_artifacts(organization_pipeline_run):
+    """Fetch the artifacts of an OrganizationPipelineRun, by uuid.
+
+    The pipeline run is fetched from the workflow service at most once per
+    request, however many of its artifacts are resolved.
+    """
+    artifacts = g.setdefault("pipeline_run_artifacts", {})
+    if organization_pipeline_run.id not in artifacts:
+        (pipeline_run,) = _get_pipeline_runs(
+            [
+                (
+                    organization_pipeline_run.organization_pipeline,
+                    organization_pipeline_run,
+                )
+            ]
+        )
+        artifacts[organization_pipeline_run.id] = {
+            artifact["uuid"]: artifact for artifact in pipeline_run.get("artifacts", [])
+        }
+
+    return artifacts[organization_pipeline_run.id]
 
 
 def _fetch_artifact(organization_pipeline_run, artifact_uuid):
-    pipeline_run = fetch_pipeline_run(
-        organization_pipeline_run.organization_pipeline.organization_uuid,
-        organization_pipeline_run.organization_pipeline.uuid,
-        organization_pipeline_run.uuid,
-    )
-    artifact = next(
-        (a for a in pipeline_run["artifacts"] if a["uuid"] == artifact_uuid),
-        None,
-    )
+    artifact = _fetch_artifacts(organization_pipeline_run).get(artifact_uuid)
     if artifact is None:
         raise ValueError("Could not find artifact in Pipeline")
 
@@ -513,100 +935,166 @@ def fetch_artifact_charts(organization_pipeline_run):
 
         artifact = _fetch_artifact(organization_pipeline_run, chart.artifact_uuid)
         results.append(_serialize_artifact_chart(chart, artifact))
+
+    _commit_run_status()
+
     return results
 
 
+def _update_pipeline_runs(org_pipeline, pipeline_runs):
+    """Update pipeline runs from the workflow service with the uuids and
+    input_files of their OrganizationPipelineRuns.
+
+    Uses one query for all the runs, and one for all of their input files.
+    Raises a KeyError when a run has no OrganizationPipelineRun.
+    """
+    org_pipeline_runs = {}
+    for opr in search_organization_pipeline_runs(
+        org_pipeline.id, [pr.get("uuid") for pr in pipeline_runs]
+    ):
+        org_pipeline_runs[opr.uuid] = opr
+        org_pipeline_runs[opr.pipeline_run_uuid] = opr
+
+    input_files = _group_input_files(
+        find_organization_pipeline_run_input_files(
+            list({opr.id for opr in org_pipeline_runs.values()})
+        )
+    )
+
+    for pr in pipeline_runs:
+        opr = org_pipeline_runs[pr.get("uuid")]
+        _sync_run_status(opr, pr)
+        pr["uuid"] = opr.uuid
+        pr["inputs"] = _serialize_input_files(input_files.get(opr.id, []))
+
+    return pipeline_runs
+
+
 def fetch_pipeline_runs(organization_uuid, pipeline_uuid):
     """Find all OrganizationPipelineRuns for a pipline."""
     org_pipeline = find_organization_pipeline(organization_uuid, pipeline_uuid)
+    if not org_pipeline:
+        raise ValueError({"message": "organization_pipeline_uuid not found"})
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{org_pipeline.pipeline_uuid}/runs",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
-    )
+    response = workflow_client().get(f"/v1/pipelines/{org_pipeline.pipeline_uuid}/runs")
 
     try:
         pipeline_runs = response.json()
         response.raise_for_status()
 
-        # update with org uuids
-        for pr in pipeline_runs:
-            opr = search_organization_pipeline_runs(org_pipeline.id, [pr.get("uuid")])[
-                0
-            ]
-            pr["uuid"] = opr.uuid
-            org_pipeline_input_files = find_organization_pipeline_input_files(
-                org_pipeline.id
-            )
-
-            inputs = []
-
-            # generate download urls and add uuid
-            for opf in org_pipeline_input_files:
-                if opf.organization_pipeline_run_id == opr.id:
-                    sname = quote(opf.name)
-                    url = create_url(f"{pipeline_uuid}/{opf.uuid}-{sname}", sname)
-                    inputs.append({"url": url, "name": opf.name, "uuid": opf.uuid})
+        _update_pipeline_runs(org_pipeline, pipeline_runs)
 
-            pr["inputs"] = inputs
+        _commit_run_status()
 
         return pipeline_runs
     except ValueError as value_error:
         raise HTTPError("Non JSON payload returned") from value_error
     except HTTPError as http_error:
         raise ValueError(pipeline_runs) from http_error
+    except KeyError as key_error:
+        raise ValueError(
+            "Unable to match PipelineRun to OrganizationPipelineRun"
+        ) from key_error
 
 
-def fetch_pipeline_run(
-    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
-):
-    """Find an OrganizationPipelineRun for a pipline."""
-    org_pipeline = find_organization_pipeline(
-        organization_uuid, organization_pipeline_uuid
-    )
+def _encode_run_cursor(org_pipeline_run):
+    """ Encode the pagination cursor following an OrganizationPipelineRun. """
+    position = [org_pipeline_run.created_at.isoformat(), org_pipeline_run.id]
 
-    org_pipeline_run = next(
-        filter(
-            lambda r: r.uuid == organization_pipeline_run_uuid,
-            org_pipeline.organization_pipeline_runs,
-        )
-    )
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{org_pipeline.pipeline_uuid}/runs/{org_pipeline_run.pipeline_run_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
-    )
 
+def _decode_run_cursor(cursor):
+    """ Decode a pagination cursor into a (created_at, id) tuple. """
     try:
-        pipeline_run = response.json()
-        response.raise_for_status()
+        created_at, run_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+        return (datetime.fromisoformat(created_at), int(run_id))
+    except (TypeError, ValueError) as error:
+        raise ValueError({"message": "Invalid cursor"}) from error
+
+
+def fetch_pipeline_runs_page(
+    organization_uuid,
+    pipeline_uuid,
+    limit,
+    cursor=None,
+    include_total=False,
+    summary=False,
+):
+    """Find a page of OrganizationPipelineRuns for a pipline, newest first.
 
-        # update with org uuid
-        opr = find_organization_pipeline_run(
-            org_pipeline.id, str(pipeline_run.get("uuid"))
+    Only the runs of the page are fetched from the workflow service. When
+    summary is set they are summarized from their status columns instead
+    (see _summarize_pipeline_runs()), only fetching those that have not
+    finished.
+
+    Returns a (pipeline_runs, next_cursor, total) tuple: next_cursor is None
+    on the last page, and total (an estimate) is None unless include_total.
+
+    Raises a ValueError when the pipeline is not found, or the cursor is
+    invalid.
+    """
+    org_pipeline = find_organization_pipeline(organization_uuid, pipeline_uuid)
+    if not org_pipeline:
+        raise ValueError({"message": "organization_pipeline_uuid not found"})
+    before = _decode_run_cursor(cursor) if cursor else None
+
+    org_pipeline_runs = find_organization_pipeline_runs_page(
+        org_pipeline.id, limit + 1, before
+    )
+    next_cursor = None
+    if len(org_pipeline_runs) > limit:
+        org_pipeline_runs = org_pipeline_runs[:limit]
+        next_cursor = _encode_run_cursor(org_pipeline_runs[-1])
+
+    if summary:
+        pipeline_runs = _summarize_pipeline_runs(
+            [(org_pipeline, opr) for opr in org_pipeline_runs]
         )
-        pipeline_run["uuid"] = opr.uuid
-        org_pipeline_input_files = find_organization_pipeline_input_files(
-            org_pipeline.id
+    else:
+        pipeline_runs = fetch_pipeline_run_batch(
+            [(org_pipeline, opr) for opr in org_pipeline_runs]
         )
-        inputs = []
 
-        # generate download urls and add uuid
-        for opf in org_pipeline_input_files:
-            if opf.organization_pipeline_run_id == opr.id:
-                sname = quote(opf.name)
-                url = create_url(
-                    f"{organization_pipeline_uuid}/{opf.uuid}-{sname}", sname
-                )
-                inputs.append({"url": url, "name": opf.name, "uuid": opf.uuid})
+    total = None
+    if include_total:
+        total = estimate_organization_pipeline_run_count(org_pipeline.id)
+
+    _commit_run_status()
+
+    return (pipeline_runs, next_cursor, total)
 
-        pipeline_run["inputs"] = inputs
+
+def _sign_input_file_url(key, name):
+    return create_url(key, quote(name))
+
+
+def _input_file_urls(input_files):
+    """The download urls of OrganizationPipelineInputFiles, in order, for
+    listings: they may be reused from the PresignedUrlCache."""
+    return presigned_urls(
+        [(opf.blob_key, opf.name) for opf in input_files], _sign_input_file_url
+    )
+
+
+def _serialize_input_files(input_files):
+    """ Serialize OrganizationPipelineInputFiles with their download urls. """
+    return [
+        {"url": url, "name": opf.name, "uuid": opf.uuid}
+        for (opf, url) in zip(input_files, _input_file_urls(input_files))
+    ]
+
+
+def _pipeline_run_path(org_pipeline, org_pipeline_run):
+    return f"/v1/pipelines/{org_pipeline.pipeline_uuid}/runs/{org_pipeline_run.pipeline_run_uuid}"
+
+
+def _pipeline_run_json(response):
+    """Return the pipeline run in a response from the workflow service."""
+    try:
+        pipeline_run = response.json()
+        response.raise_for_status()
 
         return pipeline_run
     except ValueError as value_error:
@@ -615,29 +1103,285 @@ def fetch_pipeline_run(
         raise ValueError(pipeline_run) from http_error
 
 
-def fetch_pipeline_run_console(
-    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
-):
-    """Fetches console output for an OrganizationPipelineRun."""
-    org_pipeline = find_organization_pipeline(
-        organization_uuid, organization_pipeline_uuid
+def _is_finished(pipeline_run):
+    states = pipeline_run.get("states") or []
+
+    return bool(states) and states[-1]["state"] in FINISHED_PIPELINE_RUN_STATES
+
+
+def _parse_state_time(created_at):
+    """Parse the created_at of a pipeline run state, as a naive UTC time."""
+    parsed = datetime.fromisoformat(created_at)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return parsed
+
+
+def _sync_run_status(org_pipeline_run, pipeline_run):
+    """Copy the state, start and completion times and artifact count of a
+    pipeline run from the workflow service to its OrganizationPipelineRun.
+
+    The artifact count is kept when pipeline_run has no artifacts key (a
+    status callback with only the states). The changes are left for the
+    caller to commit.
+    """
+    states = pipeline_run.get("states") or []
+    status = {
+        "state": None,
+        "started_at": None,
+        "completed_at": None,
+    }
+    if "artifacts" in pipeline_run:
+        status["artifact_count"] = len(pipeline_run["artifacts"] or [])
+
+    for state in states:
+        if state["state"] == "RUNNING" and status["started_at"] is None:
+            status["started_at"] = _parse_state_time(state["created_at"])
+    if states:
+        status["state"] = states[-1]["state"]
+        if status["state"] in FINISHED_PIPELINE_RUN_STATES:
+            status["completed_at"] = _parse_state_time(states[-1]["created_at"])
+
+    for column, value in status.items():
+        if getattr(org_pipeline_run, column) != value:
+            setattr(org_pipeline_run, column, value)
+
+
+def _serialize_run_status(org_pipeline_run):
+    """Summarize an OrganizationPipelineRun from its status columns."""
+    duration = None
+    if org_pipeline_run.started_at and org_pipeline_run.completed_at:
+        duration = (
+            org_pipeline_run.completed_at - org_pipeline_run.started_at
+        ).total_seconds()
+
+    return {
+        "uuid": org_pipeline_run.uuid,
+        "state": org_pipeline_run.state,
+        "created_at": org_pipeline_run.created_at.isoformat(),
+        "started_at": org_pipeline_run.started_at
+        and org_pipeline_run.started_at.isoformat(),
+        "completed_at": org_pipeline_run.completed_at
+        and org_pipeline_run.completed_at.isoformat(),
+        "duration": duration,
+        "artifact_count": org_pipeline_run.artifact_count,
+    }
+
+
+def _summarize_pipeline_runs(org_pipeline_runs):
+    """Summarize (OrganizationPipeline, OrganizationPipelineRun) tuples from
+    their status columns (see _serialize_run_status()).
+
+    Runs that have not finished are refreshed first, with a single
+    concurrent batch from PIPELINE_RUN_CACHE or the workflow service;
+    finished runs never change, and are not fetched.
+    """
+    unfinished = [
+        (org_pipeline, opr)
+        for (org_pipeline, opr) in org_pipeline_runs
+        if opr.state not in FINISHED_PIPELINE_RUN_STATES
+    ]
+    if unfinished:
+        _get_pipeline_runs(unfinished)
+
+    return [_serialize_run_status(opr) for _, opr in org_pipeline_runs]
+
+
+def _commit_run_status():
+    """ Save any run status that changed, without a commit when none did. """
+    if db.session.dirty:
+        db.session.commit()
+
+
+def backfill_pipeline_run_status(batch_size=100):
+    """Fetch every pipeline run that has not finished from the workflow
+    service, and update the status columns of its OrganizationPipelineRun.
+
+    Runs that cannot be fetched are skipped. Returns the number of runs
+    fetched.
+    """
+    fetched = 0
+    after_id = 0
+    while True:
+        org_pipeline_runs = find_unfinished_organization_pipeline_runs(
+            batch_size, after_id
+        )
+        if not org_pipeline_runs:
+            return fetched
+
+        after_id = org_pipeline_runs[-1][1].id
+        try:
+            _get_pipeline_runs(org_pipeline_runs)
+            fetched += len(org_pipeline_runs)
+        except (HTTPError, ValueError):
+            # fall back to one run at a time, to skip the runs that fail.
+            for org_pipeline_run in org_pipeline_runs:
+                try:
+                    _get_pipeline_runs([org_pipeline_run])
+                    fetched += 1
+                except (HTTPError, ValueError):
+                    pass
+
+        db.session.commit()
+
+
+def _snapshot_pipeline_run(org_pipeline_run):
+    """Return the pipeline run of an OrganizationPipelineRun from its status
+    snapshot and columns, or None when the snapshot is not complete.
+
+    A snapshot is complete once it has the artifacts of the run (the states
+    are always reported, see update_pipeline_run_status()).
+    """
+    snapshot = org_pipeline_run.status_snapshot
+    if not snapshot or "artifacts" not in snapshot:
+        return None
+
+    return dict(
+        {
+            "uuid": org_pipeline_run.pipeline_run_uuid,
+            "created_at": org_pipeline_run.created_at.isoformat(),
+            "inputs": [],
+        },
+        **snapshot,
     )
 
-    org_pipeline_run = next(
-        filter(
-            lambda r: r.uuid == organization_pipeline_run_uuid,
-            org_pipeline.organization_pipeline_runs,
+
+def _get_pipeline_runs(org_pipeline_runs):
+    """Get pipeline runs from the workflow service, concurrently.
+
+    org_pipeline_runs is a list of (OrganizationPipeline,
+    OrganizationPipelineRun) tuples. Returns the pipeline runs in the same
+    order.
+
+    Runs with a complete status snapshot (see _snapshot_pipeline_run()) are
+    answered from it, without calling the workflow service. Otherwise
+    pipeline runs are cached by pipeline_run_uuid (PIPELINE_RUN_CACHE). A
+    finished run never changes, so it is cached for PIPELINE_RUN_CACHE_TTL
+    seconds; a run that is in progress for PIPELINE_RUN_CACHE_ACTIVE_TTL.
+
+    A partial snapshot is merged over the fetched run; once the merged run
+    has finished it is saved as the snapshot, so it is not fetched again.
+    """
+    cache = current_app.extensions[PIPELINE_RUN_CACHE]
+    pipeline_runs = [_snapshot_pipeline_run(opr) for _, opr in org_pipeline_runs]
+    for index, (_, opr) in enumerate(org_pipeline_runs):
+        if pipeline_runs[index] is None:
+            pipeline_runs[index] = cache.get(opr.pipeline_run_uuid)
+    missing = [index for index, run in enumerate(pipeline_runs) if run is None]
+
+    responses = workflow_client().get_many(
+        [_pipeline_run_path(*org_pipeline_runs[index]) for index in missing]
+    )
+    for index, response in zip(missing, responses):
+        pipeline_run = _pipeline_run_json(response)
+        cache.set(
+            org_pipeline_runs[index][1].pipeline_run_uuid,
+            pipeline_run,
+            None
+            if _is_finished(pipeline_run)
+            else current_app.config[PIPELINE_RUN_CACHE_ACTIVE_TTL],
         )
+        pipeline_runs[index] = pipeline_run
+
+    for index, (_, opr) in enumerate(org_pipeline_runs):
+        if opr.status_snapshot and "artifacts" not in opr.status_snapshot:
+            pipeline_runs[index] = dict(pipeline_runs[index], **opr.status_snapshot)
+            if _is_finished(pipeline_runs[index]):
+                opr.status_snapshot = pipeline_runs[index]
+        _sync_run_status(opr, pipeline_runs[index])
+
+    return pipeline_runs
+
+
+def _update_pipeline_run(pipeline_run, org_pipeline, org_pipeline_run, input_files):
+    """Update a pipeline run from the workflow service with the uuid and
+    input_files of its OrganizationPipelineRun.
+
+    Returns an updated copy, so that cached pipeline runs are not modified.
+    """
+    return dict(
+        pipeline_run,
+        uuid=org_pipeline_run.uuid,
+        inputs=_serialize_input_files(input_files),
     )
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{org_pipeline.pipeline_uuid}/runs/{org_pipeline_run.pipeline_run_uuid}/console",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+
+def _fetch_pipeline_run(org_pipeline, org_pipeline_run, input_files):
+    """Fetch a pipeline run from the workflow service, and update it with the
+    uuid and input_files of its OrganizationPipelineRun."""
+    (pipeline_run,) = _get_pipeline_runs([(org_pipeline, org_pipeline_run)])
+
+    return _update_pipeline_run(
+        pipeline_run, org_pipeline, org_pipeline_run, input_files
+    )
+
+
+def fetch_pipeline_run_batch(org_pipeline_runs):
+    """Fetch several pipeline runs from the workflow service concurrently.
+
+    org_pipeline_runs is a list of (OrganizationPipeline,
+    OrganizationPipelineRun) tuples. Returns the pipeline runs in the same
+    order.
+    """
+    input_files = _group_input_files(
+        find_organization_pipeline_run_input_files(
+            [opr.id for _, opr in org_pipeline_runs]
+        )
+    )
+
+    return [
+        _update_pipeline_run(pipeline_run, op, opr, input_files.get(opr.id, []))
+        for pipeline_run, (op, opr) in zip(
+            _get_pipeline_runs(org_pipeline_runs), org_pipeline_runs
+        )
+    ]
+
+
+def fetch_pipeline_run_summaries(org_pipeline_runs):
+    """Fetch several pipeline runs like fetch_pipeline_run_batch(), without
+    their artifacts or input files.
+
+    The input files are neither queried nor given download urls.
+    """
+    return [
+        dict(
+            {
+                key: value
+                for (key, value) in pipeline_run.items()
+                if key not in ("artifacts", "inputs")
+            },
+            uuid=org_pipeline_run.uuid,
+        )
+        for pipeline_run, (_, org_pipeline_run) in zip(
+            _get_pipeline_runs(org_pipeline_runs), org_pipeline_runs
+        )
+    ]
+
+
+def fetch_pipeline_run(
+    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+):
+    """Find an OrganizationPipelineRun for a pipline."""
+    (org_pipeline, org_pipeline_run) = _find_pipeline_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
     )
 
+    pipeline_run = _fetch_pipeline_run(
+        org_pipeline,
+        org_pipeline_run,
+        find_organization_pipeline_run_input_files([org_pipeline_run.id]),
+    )
+
+    _commit_run_status()
+
+    return pipeline_run
+
+
+def _fetch_console(pipeline_run_path):
+    """ Fetch the console output of a pipeline run from the workflow service. """
+    response = workflow_client().get(f"{pipeline_run_path}/console")
+
     try:
         console_output = response.json()
         response.raise_for_status()
@@ -647,3 +1391,144 @@ def fetch_pipeline_run_console(
         raise HTTPError("Non JSON payload returned") from value_error
     except HTTPError as http_error:
         raise ValueError(console_output) from http_error
+
+
+def fetch_pipeline_run_console(
+    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+):
+    """Fetches console output for an OrganizationPipelineRun."""
+    (org_pipeline, org_pipeline_run) = _find_pipeline_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+    )
+
+    return _fetch_console(_pipeline_run_path(org_pipeline, org_pipeline_run))
+
+
+def fetch_pipeline_run_console_output(
+    organization_uuid,
+    organization_pipeline_uuid,
+    organization_pipeline_run_uuid,
+    output,
+    offset=0,
+):
+    """Fetch one console output (std_out or std_err) of an
+    OrganizationPipelineRun, from offset (in bytes of its UTF-8 encoding).
+
+    Returns a (data, length, finished) tuple: the bytes of the output from
+    offset, the length of the whole output, and whether the run has finished
+    (so that its output will not grow).
+
+    Raises a ValueError when output is not a console output, or when the run
+    is not found.
+    """
+    if output not in CONSOLE_OUTPUTS:
+        raise ValueError({"message": f"output must be one of {CONSOLE_OUTPUTS}"})
+
+    (org_pipeline, org_pipeline_run) = _find_pipeline_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+    )
+
+    # the state is read first: once finished, the console output is complete.
+    (pipeline_run,) = _get_pipeline_runs([(org_pipeline, org_pipeline_run)])
+    finished = _is_finished(pipeline_run)
+    data = (
+        _fetch_console(_pipeline_run_path(org_pipeline, org_pipeline_run)).get(output)
+        or ""
+    ).encode()
+
+    _commit_run_status()
+
+    return (data[offset:], len(data), finished)
+
+
+def _fetch_run_finished(
+    organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+):
+    """Whether an OrganizationPipelineRun has finished, saving any run status
+    that changed.
+
+    The session is closed afterwards, so that a console output stream does
+    not hold a database connection while it waits for the next poll.
+    """
+    (org_pipeline, org_pipeline_run) = _find_pipeline_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+    )
+    (pipeline_run,) = _get_pipeline_runs([(org_pipeline, org_pipeline_run)])
+    _commit_run_status()
+    db.session.close()
+
+    return _is_finished(pipeline_run)
+
+
+def stream_pipeline_run_console_output(
+    organization_uuid,
+    organization_pipeline_uuid,
+    organization_pipeline_run_uuid,
+    output,
+    offset=0,
+    poll_interval=2,
+    max_duration=None,
+):
+    """Follow one console output of an OrganizationPipelineRun until the run
+    finishes, polling the workflow service every poll_interval seconds.
+
+    Yields (offset, text, finished) tuples: text is the output that is new
+    since the previous one (it may be empty), offset is the byte offset
+    following it, and finished whether the run has finished. The stream
+    also ends after max_duration seconds, when clients should resume from
+    the last offset.
+
+    Only the console output is polled while it grows (the run has not
+    finished); the state of the run is read once it stops growing.
+
+    Note: the stream holds a worker for its whole duration, sleeping
+    between polls, so it must be served by threaded or async (gevent,
+    eventlet) workers rather than sync ones.
+
+    Raises a ValueError when output is not a console output, or when the run
+    is not found.
+    """
+    if output not in CONSOLE_OUTPUTS:
+        raise ValueError({"message": f"output must be one of {CONSOLE_OUTPUTS}"})
+
+    (org_pipeline, org_pipeline_run) = _find_pipeline_run(
+        organization_uuid, organization_pipeline_uuid, organization_pipeline_run_uuid
+    )
+    path = _pipeline_run_path(org_pipeline, org_pipeline_run)
+    stop_at = None if max_duration is None else time.monotonic() + max_duration
+
+    # the number of characters of the output that have been yielded, once the
+    # byte offset has been reached.
+    seen = None
+    check_state = True
+    while True:
+        # every poll gets the time of a whole request.
+        start_workflow_deadline()
+
+        # the state is read first: once finished, the console output is
+        # complete.
+        finished = check_state and _fetch_run_finished(
+            organization_uuid,
+            organization_pipeline_uuid,
+            organization_pipeline_run_uuid,
+        )
+        console_output = _fetch_console(path).get(output) or ""
+
+        if seen is None:
+            data = console_output.encode()
+            text = data[offset:].decode(errors="replace")
+            if offset <= len(data):
+                (offset, seen) = (len(data), len(console_output))
+        else:
+            # only the new output is encoded.
+            text = console_output[seen:]
+            offset += len(text.encode())
+            seen = len(console_output)
+
+        yield (offset, text, finished)
+
+        if finished or (stop_at is not None and time.monotonic() >= stop_at):
+            return
+
+        check_state = not text
+        time.sleep(poll_interval)
@@ -1,11 +1,29 @@
+import hashlib
+
 import requests
 from flask import current_app
 
-from .constants import AUTH_HOSTNAME
+from .constants import AUTH_HOSTNAME, MEMBERSHIP_CACHE, MEMBERSHIP_CACHE_NEGATIVE_TTL
+
+
+def _token_fingerprint(jwt_token):
+    """ A digest of jwt_token, so raw tokens are never used as cache keys. """
+    return hashlib.sha256(jwt_token.encode("utf-8")).hexdigest()
 
 
 def fetch_is_user_in_org(organization_uuid, jwt_token, user_uuid):
-    """ Verify user_uuid is a member of organization_uuid by calling AUTH_HOSTNAME API. """
+    """Verify user_uuid is a member of organization_uuid by calling AUTH_HOSTNAME API.
+
+    Results (including negative ones) are cached per user, organization and
+    token for MEMBERSHIP_CACHE_TTL (MEMBERSHIP_CACHE_NEGATIVE_TTL) seconds.
+    """
+    cache = current_app.extensions[MEMBERSHIP_CACHE]
+    cache_key = (user_uuid, organization_uuid, _token_fingerprint(jwt_token))
+
+    is_member = cache.get(cache_key)
+    if is_member is not None:
+        return is_member
+
     response = requests.get(
         f"{current_app.config[AUTH_HOSTNAME]}/users/{user_uuid}/organizations",
         headers={
@@ -16,4 +34,11 @@ def fetch_is_user_in_org(organization_uuid, jwt_token, user_uuid):
     )
     response.raise_for_status()
 
-    return organization_uuid in [org["uuid"] for org in response.json()]
+    is_member = organization_uuid in [org["uuid"] for org in response.json()]
+    cache.set(
+        cache_key,
+        is_member,
+        None if is_member else current_app.config[MEMBERSHIP_CACHE_NEGATIVE_TTL],
+    )
+
+    return is_member
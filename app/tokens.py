@@ -0,0 +1,160 @@
+import json
+import logging
+import threading
+import time
+
+import jwt
+import requests
+from jwt.algorithms import HMACAlgorithm
+
+from .constants import (
+    JWT_JWKS_REFRESH_INTERVAL,
+    JWT_JWKS_URL,
+    JWT_ORGANIZATIONS_CLAIM,
+    JWT_SECRET_KEY,
+)
+
+logger = logging.getLogger("tokens")
+
+# Never refetch the key set more often than this when an unknown key id is seen.
+MIN_JWKS_REFRESH_INTERVAL = 60
+
+
+def _key_from_jwk(jwk):
+    """ Convert a JWK dict into a (key, algorithm) tuple usable by jwt.decode() """
+    if jwk.get("kty") == "oct":
+        return (HMACAlgorithm.from_jwk(json.dumps(jwk)), jwk.get("alg", "HS256"))
+
+    # asymmetric keys require the optional 'cryptography' package.
+    # pylint: disable=import-outside-toplevel
+    from jwt.algorithms import ECAlgorithm, RSAAlgorithm
+
+    if jwk.get("kty") == "RSA":
+        return (RSAAlgorithm.from_jwk(json.dumps(jwk)), jwk.get("alg", "RS256"))
+    if jwk.get("kty") == "EC":
+        return (ECAlgorithm.from_jwk(json.dumps(jwk)), jwk.get("alg", "ES256"))
+
+    raise ValueError(f"Unsupported JWK key type: {jwk.get('kty')}")
+
+
+class TokenVerifier:
+    """Verifies JWT signatures locally, with either a shared secret
+    (JWT_SECRET_KEY), or a JWKS key set (JWT_JWKS_URL) that is loaded once and
+    then refreshed in the background every JWT_JWKS_REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(
+        self,
+        secret=None,
+        jwks_url=None,
+        refresh_interval=3600,
+        organizations_claim="organizations",
+    ):
+        self.secret = secret
+        self.jwks_url = jwks_url
+        self.refresh_interval = float(refresh_interval)
+        self.organizations_claim = organizations_claim
+        self.keys = {}
+        self.last_refresh = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh_keys(self):
+        """ Reload the JWKS key set. Returns False if it could not be loaded. """
+        if not self.jwks_url:
+            return False
+
+        try:
+            response = requests.get(self.jwks_url, timeout=10)
+            response.raise_for_status()
+            keys = {}
+            for jwk in response.json().get("keys", []):
+                try:
+                    keys[jwk.get("kid")] = _key_from_jwk(jwk)
+                except (ValueError, ImportError, jwt.PyJWTError) as error:
+                    logger.warning("Skipping JWK %s: %s", jwk.get("kid"), error)
+        except (requests.RequestException, ValueError):
+            logger.warning("Unable to load JWKS key set")
+            return False
+        finally:
+            self.last_refresh = time.monotonic()
+
+        with self._lock:
+            self.keys = keys
+        return True
+
+    def start(self):
+        """ Load the key set, and keep it fresh with a daemon thread. """
+        if not self.jwks_url or self._thread is not None:
+            return
+
+        self.refresh_keys()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="jwks-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """ Stop the background refresh thread. """
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_keys()
+
+    def _find_key(self, jwt_token):
+        if self.secret:
+            return (self.secret, "HS256")
+
+        kid = jwt.get_unverified_header(jwt_token).get("kid")
+        with self._lock:
+            key = self.keys.get(kid)
+
+        if key is None and (
+            self.last_refresh is None
+            or time.monotonic() - self.last_refresh > MIN_JWKS_REFRESH_INTERVAL
+        ):
+            # likely a key rotation: refresh the key set once.
+            self.refresh_keys()
+            with self._lock:
+                key = self.keys.get(kid)
+
+        return key
+
+    def verify(self, jwt_token):
+        """Verify the signature of jwt_token and return its claims.
+
+        Returns None when the signing key is unknown (the caller should fall
+        back to the auth service).
+        Raises a jwt.InvalidTokenError when the token fails verification.
+        """
+        key = self._find_key(jwt_token)
+        if key is None:
+            return None
+
+        return jwt.decode(jwt_token, key[0], algorithms=[key[1]])
+
+    def organizations(self, claims):
+        """ Organization uuids from the signed claims, or None if not present. """
+        organizations = claims.get(self.organizations_claim)
+        if organizations is None:
+            return None
+
+        return [org["uuid"] if isinstance(org, dict) else org for org in organizations]
+
+
+def create_token_verifier(config):
+    """ Create a TokenVerifier when local JWT verification is configured. """
+    if not config.get(JWT_SECRET_KEY) and not config.get(JWT_JWKS_URL):
+        return None
+
+    verifier = TokenVerifier(
+        secret=config.get(JWT_SECRET_KEY),
+        jwks_url=config.get(JWT_JWKS_URL),
+        refresh_interval=config[JWT_JWKS_REFRESH_INTERVAL],
+        organizations_claim=config[JWT_ORGANIZATIONS_CLAIM],
+    )
+    verifier.start()
+
+    return verifier
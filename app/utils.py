@@ -8,11 +8,12 @@ from functools import wraps
 import jwt
 import secrets
 from application_roles.decorators import make_permission_decorator
-from flask import g, request
-from jwt.exceptions import DecodeError
+from flask import current_app, g, request
+from jwt.exceptions import InvalidTokenError
 from requests import HTTPError
 from simplejson.errors import JSONDecodeError
 
+from .constants import TOKEN_VERIFIER
 from .services import fetch_is_user_in_org
 
 logger = logging.getLogger("utils")
@@ -39,6 +40,10 @@ def validate_organization(requires_json=True):
     Assigns g.organization_uuid to the organization uuid
     Assigns g.jwt_token on success to JWT token.
     Assigns g.user_uuid on success to user's uuid decoded from JWT token.
+
+    When local JWT verification is configured (JWT_SECRET_KEY or JWT_JWKS_URL)
+    the token signature is verified, and organization membership is read from
+    its JWT_ORGANIZATIONS_CLAIM claim instead of asking the auth service.
     """
 
     def decorator(view):
@@ -62,14 +67,25 @@ def validate_organization(requires_json=True):
 
             g.jwt_token = matches.group(1)
             try:
-                decoded_token = jwt.decode(g.jwt_token, verify=False)
+                verifier = current_app.extensions.get(TOKEN_VERIFIER)
+                decoded_token = verifier.verify(g.jwt_token) if verifier else None
+                organizations = (
+                    verifier.organizations(decoded_token) if decoded_token else None
+                )
+                if decoded_token is None:
+                    decoded_token = jwt.decode(g.jwt_token, verify=False)
 
                 g.user_uuid = decoded_token["uuid"]
                 g.organization_uuid = kwargs["organization_uuid"]
 
-                if not fetch_is_user_in_org(
-                    kwargs["organization_uuid"], g.jwt_token, g.user_uuid
-                ):
+                if organizations is not None:
+                    is_member = kwargs["organization_uuid"] in organizations
+                else:
+                    is_member = fetch_is_user_in_org(
+                        kwargs["organization_uuid"], g.jwt_token, g.user_uuid
+                    )
+
+                if not is_member:
                     logger.warning("Could not find organization")
                     return {
                         "message": "Unable to find organization by uuid provided"
@@ -79,7 +95,7 @@ def validate_organization(requires_json=True):
             except HTTPError:
                 logger.warning("Failing to access auth server")
                 return {}, 503
-            except DecodeError:
+            except InvalidTokenError:
                 logger.warning("unable to decode JWT")
                 return {}, 401
             except JSONDecodeError:
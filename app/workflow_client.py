@@ -0,0 +1,214 @@
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from application_roles.decorators import ROLES_KEY
+from flask import current_app, g, has_app_context
+from requests import HTTPError
+from requests.adapters import HTTPAdapter
+
+from .constants import (
+    WORKFLOW_API_TOKEN,
+    WORKFLOW_CLIENT,
+    WORKFLOW_CONNECT_TIMEOUT,
+    WORKFLOW_FAN_OUT_CONCURRENCY,
+    WORKFLOW_FAN_OUT_WORKERS,
+    WORKFLOW_HOSTNAME,
+    WORKFLOW_POOL_SIZE,
+    WORKFLOW_READ_TIMEOUT,
+    WORKFLOW_REQUEST_DEADLINE,
+)
+
+UUID_SEGMENT = re.compile(r"/[0-9a-fA-F]{32}(?=/|$)")
+
+
+class WorkflowClient:
+    """An HTTP client for the workflow service.
+
+    All requests share one pooled, keep-alive requests.Session, and are timed
+    per endpoint (see stats()).
+
+    Independent requests can be made concurrently with fan_out(). When a
+    deadline is set for the current request (g.workflow_deadline) timeouts
+    are capped so that no call outlives it.
+    """
+
+    def __init__(
+        self,
+        hostname,
+        api_token,
+        pool_size=10,
+        connect_timeout=5,
+        read_timeout=30,
+        fan_out_workers=32,
+        fan_out_concurrency=8,
+    ):
+        self.hostname = hostname
+        self.timeout = (float(connect_timeout), float(read_timeout))
+        self.fan_out_concurrency = int(fan_out_concurrency)
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(fan_out_workers), thread_name_prefix="workflow-client"
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=int(pool_size), pool_maxsize=int(pool_size)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "Content-Type": "application/json",
+                ROLES_KEY: api_token,
+            }
+        )
+
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, path, **kwargs):
+        """ Make a request to the workflow service. Returns the response. """
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self._timeout()
+        start = time.monotonic()
+        error = False
+        try:
+            response = self.session.request(method, f"{self.hostname}{path}", **kwargs)
+            error = response.status_code >= 500
+            return response
+        except requests.RequestException:
+            error = True
+            raise
+        finally:
+            self._record(f"{method} {UUID_SEGMENT.sub('/<uuid>', path)}", start, error)
+
+    def get(self, path, **kwargs):
+        """ GET path on the workflow service. """
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        """ POST to path on the workflow service. """
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        """ PUT to path on the workflow service. """
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        """ DELETE path on the workflow service. """
+        return self.request("DELETE", path, **kwargs)
+
+    def fan_out(self, calls, concurrency=None):
+        """Make several independent requests concurrently.
+
+        calls is a list of (method, path, kwargs) tuples. At most concurrency
+        (default WORKFLOW_FAN_OUT_CONCURRENCY) of them are in flight at once.
+
+        Returns the responses in the same order as calls. The first exception
+        raised by a call is re-raised, and its remaining calls are cancelled.
+        """
+        calls = list(calls)
+        concurrency = concurrency or self.fan_out_concurrency
+        results = [None] * len(calls)
+        pending = {}
+        next_call = 0
+
+        try:
+            while next_call < len(calls) or pending:
+                while next_call < len(calls) and len(pending) < concurrency:
+                    method, path, kwargs = calls[next_call]
+                    kwargs = dict(kwargs)
+                    kwargs.setdefault("timeout", self._timeout())
+                    future = self.executor.submit(self.request, method, path, **kwargs)
+                    pending[future] = next_call
+                    next_call += 1
+
+                done, _ = wait(
+                    pending, timeout=self._remaining(), return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    raise HTTPError("Workflow service deadline exceeded")
+
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+        return results
+
+    def get_many(self, paths, concurrency=None):
+        """ GET several paths concurrently. Returns responses in order. """
+        return self.fan_out([("GET", path, {}) for path in paths], concurrency)
+
+    def _remaining(self):
+        """ Seconds left before the current request's deadline, or None. """
+        if not has_app_context():
+            return None
+
+        deadline = g.get("workflow_deadline")
+        if deadline is None:
+            return None
+
+        return deadline - time.monotonic()
+
+    def _timeout(self):
+        remaining = self._remaining()
+        if remaining is None:
+            return self.timeout
+        if remaining <= 0:
+            raise HTTPError("Workflow service deadline exceeded")
+
+        return (min(self.timeout[0], remaining), min(self.timeout[1], remaining))
+
+    def stats(self):
+        """ Return request counts, errors and timings per endpoint. """
+        with self._lock:
+            return {
+                endpoint: dict(
+                    metrics, average_seconds=metrics["seconds"] / metrics["count"]
+                )
+                for endpoint, metrics in self._metrics.items()
+            }
+
+    def _record(self, endpoint, start, error):
+        elapsed = time.monotonic() - start
+        with self._lock:
+            metrics = self._metrics.setdefault(
+                endpoint, {"count": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            metrics["count"] += 1
+            metrics["errors"] += int(error)
+            metrics["seconds"] += elapsed
+            metrics["max_seconds"] = max(metrics["max_seconds"], elapsed)
+
+
+def create_workflow_client(config):
+    """ Create the WorkflowClient for an app's config. """
+    return WorkflowClient(
+        config.get(WORKFLOW_HOSTNAME),
+        config.get(WORKFLOW_API_TOKEN),
+        pool_size=config[WORKFLOW_POOL_SIZE],
+        connect_timeout=config[WORKFLOW_CONNECT_TIMEOUT],
+        read_timeout=config[WORKFLOW_READ_TIMEOUT],
+        fan_out_workers=config[WORKFLOW_FAN_OUT_WORKERS],
+        fan_out_concurrency=config[WORKFLOW_FAN_OUT_CONCURRENCY],
+    )
+
+
+def start_workflow_deadline():
+    """Start the WORKFLOW_REQUEST_DEADLINE for the current request.
+
+    Registered as a before_request handler.
+    """
+    if current_app.config[WORKFLOW_REQUEST_DEADLINE]:
+        g.workflow_deadline = time.monotonic() + float(
+            current_app.config[WORKFLOW_REQUEST_DEADLINE]
+        )
+
+
+def workflow_client():
+    """ The WorkflowClient of the current app. """
+    return current_app.extensions[WORKFLOW_CLIENT]
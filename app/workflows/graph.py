@@ -0,0 +1,197 @@
+from collections import deque
+
+from flask import current_app
+
+from ..constants import WORKFLOW_GRAPH_CACHE
+
+
+class WorkflowGraph:
+    """The DAG of an OrganizationWorkflow's pipelines, as integer-indexed
+    adjacency lists.
+
+    Node i is the OrganizationWorkflowPipeline uuids[i], whose pipeline on the
+    workflow service is workflow_pipeline_uuids[i]; destinations[i] lists the
+    nodes that run after it. Every query is O(V+E), and needs no network
+    calls.
+
+    The graph is stored on its OrganizationWorkflow, updated by each edit of
+    the workflow pipelines, and cached in the WORKFLOW_GRAPH_CACHE.
+    """
+
+    def __init__(self, uuids, workflow_pipeline_uuids, destinations):
+        self.uuids = uuids
+        self.workflow_pipeline_uuids = workflow_pipeline_uuids
+        self.destinations = destinations
+        self.index = {uuid: i for (i, uuid) in enumerate(uuids)}
+
+    @classmethod
+    def from_workflow_pipelines(cls, workflow_pipelines, wp_to_owp):
+        """Build the graph of workflow pipelines from the workflow service.
+
+        wp_to_owp maps the workflow pipeline uuids to their
+        OrganizationWorkflowPipelines; edges to other pipelines are ignored.
+        """
+        wp_index = {}
+        uuids = []
+        workflow_pipeline_uuids = []
+        for workflow_pipeline in workflow_pipelines:
+            owp = wp_to_owp.get(workflow_pipeline["uuid"])
+            if owp is not None and workflow_pipeline["uuid"] not in wp_index:
+                wp_index[workflow_pipeline["uuid"]] = len(uuids)
+                uuids.append(owp.uuid)
+                workflow_pipeline_uuids.append(workflow_pipeline["uuid"])
+
+        edges = [set() for _ in uuids]
+        for workflow_pipeline in workflow_pipelines:
+            node = wp_index.get(workflow_pipeline["uuid"])
+            if node is None:
+                continue
+            for source in workflow_pipeline.get("source_workflow_pipelines", []):
+                if source in wp_index:
+                    edges[wp_index[source]].add(node)
+            for destination in workflow_pipeline.get(
+                "destination_workflow_pipelines", []
+            ):
+                if destination in wp_index:
+                    edges[node].add(wp_index[destination])
+
+        return cls(uuids, workflow_pipeline_uuids, [sorted(e) for e in edges])
+
+    @classmethod
+    def from_json(cls, value):
+        return cls(
+            value["uuids"], value["workflow_pipeline_uuids"], value["destinations"]
+        )
+
+    def to_json(self):
+        """ A JSON serializable copy of the graph, to store and cache. """
+        return {
+            "uuids": self.uuids,
+            "workflow_pipeline_uuids": self.workflow_pipeline_uuids,
+            "destinations": self.destinations,
+        }
+
+    def __contains__(self, uuid):
+        return uuid in self.index
+
+    def workflow_pipeline_uuid(self, uuid):
+        """ The workflow service uuid of an OrganizationWorkflowPipeline. """
+        return self.workflow_pipeline_uuids[self.index[uuid]]
+
+    def sources(self):
+        """ The reverse of destinations: the nodes that run before each node. """
+        sources = [[] for _ in self.uuids]
+        for (node, destinations) in enumerate(self.destinations):
+            for destination in destinations:
+                sources[destination].append(node)
+        return sources
+
+    def _order(self):
+        """ Kahn's algorithm: the nodes in topological order, without cycles. """
+        in_degrees = [0] * len(self.uuids)
+        for destinations in self.destinations:
+            for destination in destinations:
+                in_degrees[destination] += 1
+
+        ready = deque(node for (node, degree) in enumerate(in_degrees) if not degree)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for destination in self.destinations[node]:
+                in_degrees[destination] -= 1
+                if not in_degrees[destination]:
+                    ready.append(destination)
+        return order
+
+    def has_cycle(self):
+        return len(self._order()) < len(self.uuids)
+
+    def topological_order(self):
+        """Return the uuids in an order where every pipeline comes after its
+        sources. Raises ValueError if the graph has a cycle."""
+        order = self._order()
+        if len(order) < len(self.uuids):
+            raise ValueError({"message": "Workflow pipelines have a cycle."})
+        return [self.uuids[node] for node in order]
+
+    def _reachable(self, uuid, adjacency):
+        start = self.index[uuid]
+        seen = {start}
+        pending = [start]
+        while pending:
+            for node in adjacency[pending.pop()]:
+                if node not in seen:
+                    seen.add(node)
+                    pending.append(node)
+        seen.discard(start)
+        return [self.uuids[node] for node in sorted(seen)]
+
+    def upstream(self, uuid):
+        """ The uuids of every pipeline that runs before uuid. """
+        return self._reachable(uuid, self.sources())
+
+    def downstream(self, uuid):
+        """ The uuids of every pipeline that runs after uuid. """
+        return self._reachable(uuid, self.destinations)
+
+    def with_pipeline(self, uuid, workflow_pipeline_uuid, sources, destinations):
+        """Return a copy of the graph where the pipeline uuid (added if it is
+        new) has exactly the edges from sources, and to destinations."""
+        uuids = list(self.uuids)
+        workflow_pipeline_uuids = list(self.workflow_pipeline_uuids)
+        node = self.index.get(uuid)
+        if node is None:
+            node = len(uuids)
+            uuids.append(uuid)
+            workflow_pipeline_uuids.append(workflow_pipeline_uuid)
+
+        index = dict(self.index)
+        index[uuid] = node
+        edges = [[d for d in outgoing if d != node] for outgoing in self.destinations]
+        edges.extend([] for _ in range(len(uuids) - len(edges)))
+        edges[node] = [index[destination] for destination in destinations]
+        for source in sources:
+            edges[index[source]].append(node)
+
+        return WorkflowGraph(
+            uuids, workflow_pipeline_uuids, [sorted(set(e)) for e in edges]
+        )
+
+    def without_pipeline(self, uuid):
+        """ Return a copy of the graph without the pipeline uuid. """
+        removed = self.index[uuid]
+
+        def renumber(node):
+            return node - 1 if node > removed else node
+
+        return WorkflowGraph(
+            [u for (node, u) in enumerate(self.uuids) if node != removed],
+            [
+                wp_uuid
+                for (node, wp_uuid) in enumerate(self.workflow_pipeline_uuids)
+                if node != removed
+            ],
+            [
+                [renumber(d) for d in destinations if d != removed]
+                for (node, destinations) in enumerate(self.destinations)
+                if node != removed
+            ],
+        )
+
+
+def cached_workflow_graph(organization_uuid, organization_workflow_uuid):
+    """ The cached WorkflowGraph of an OrganizationWorkflow, or None. """
+    value = current_app.extensions[WORKFLOW_GRAPH_CACHE].get(
+        (organization_uuid, organization_workflow_uuid)
+    )
+    return None if value is None else WorkflowGraph.from_json(value)
+
+
+def cache_workflow_graph(organization_uuid, organization_workflow_uuid, graph):
+    """ Cache the WorkflowGraph of an OrganizationWorkflow, or forget it. """
+    cache = current_app.extensions[WORKFLOW_GRAPH_CACHE]
+    if graph is None:
+        cache.delete((organization_uuid, organization_workflow_uuid))
+    else:
+        cache.set((organization_uuid, organization_workflow_uuid), graph.to_json())
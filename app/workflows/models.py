@@ -11,6 +11,18 @@ class OrganizationWorkflow(CommonColumnsMixin, db.Model):
     organization_uuid = db.Column(db.String(32), nullable=False, server_default="")
     workflow_uuid = db.Column(db.String(32), nullable=False, server_default="")
     is_deleted = db.Column(db.Boolean(), default=False, nullable=False)
+    # the WorkflowGraph of the workflow's pipelines (see WorkflowGraph.to_json)
+    graph = db.Column(db.JSON(), nullable=True)
+
+    __table_args__ = (
+        db.Index(
+            "ix_organization_workflow_organization_uuid",
+            "organization_uuid",
+            "uuid",
+            postgresql_where=is_deleted == False,
+            sqlite_where=is_deleted == False,
+        ),
+    )
 
 
 class OrganizationWorkflowPipeline(CommonColumnsMixin, db.Model):
@@ -27,17 +39,31 @@ class OrganizationWorkflowPipeline(CommonColumnsMixin, db.Model):
     workflow_pipeline_uuid = db.Column(db.String(32), nullable=False, server_default="")
     is_deleted = db.Column(db.Boolean(), default=False, nullable=False)
 
+    __table_args__ = (
+        db.Index(
+            "ix_organization_workflow_pipeline_organization_workflow_uuid",
+            "organization_workflow_uuid",
+            "workflow_pipeline_uuid",
+            postgresql_where=is_deleted == False,
+            sqlite_where=is_deleted == False,
+        ),
+        db.Index(
+            "ix_organization_workflow_pipeline_organization_pipeline_id",
+            "organization_pipeline_id",
+        ),
+    )
+
     organization_workflow = db.relationship(
         OrganizationWorkflow,
         backref=db.backref("organization_workflow_pipelines"),
-        lazy="immediate",
+        lazy="select",
         primaryjoin="remote(OrganizationWorkflow.uuid) == foreign(OrganizationWorkflowPipeline.organization_workflow_uuid)",
     )
 
     organization_workflow_pipeline_runs = db.relationship(
         "OrganizationWorkflowPipelineRun",
         backref="organization_workflow_pipeline_run",
-        lazy="immediate",
+        lazy="select",
         primaryjoin="remote(OrganizationWorkflowPipelineRun.id) == foreign(OrganizationWorkflowPipeline.id)",
     )
 
@@ -60,6 +86,21 @@ class OrganizationWorkflowPipelineRun(CommonColumnsMixin, db.Model):
     workflow_run_uuid = db.Column(db.String(32), nullable=True, server_default="")
     is_deleted = db.Column(db.Boolean(), default=False, nullable=False)
 
+    __table_args__ = (
+        db.Index(
+            "ix_organization_workflow_pipeline_run_workflow_run_uuid",
+            "workflow_run_uuid",
+        ),
+        db.Index(
+            "ix_organization_workflow_pipeline_run_workflow_run_id",
+            "organization_workflow_run_id",
+        ),
+        db.Index(
+            "ix_organization_workflow_pipeline_run_pipeline_run_id",
+            "organization_pipeline_run_id",
+        ),
+    )
+
 
 class OrganizationWorkflowRun(CommonColumnsMixin, db.Model):
     """ Organization workflow run """
@@ -71,3 +112,13 @@ class OrganizationWorkflowRun(CommonColumnsMixin, db.Model):
     )
     workflow_run_uuid = db.Column(db.String(32), nullable=False, server_default="")
     is_deleted = db.Column(db.Boolean(), default=False, nullable=False)
+
+    __table_args__ = (
+        db.Index(
+            "ix_organization_workflow_run_organization_workflow_uuid",
+            "organization_workflow_uuid",
+            "uuid",
+            postgresql_where=is_deleted == False,
+            sqlite_where=is_deleted == False,
+        ),
+    )
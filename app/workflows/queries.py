@@ -1,9 +1,12 @@
+from sqlalchemy.orm import joinedload
+
 from app.pipelines.models import OrganizationPipeline
 from app.workflows.models import (
     OrganizationWorkflow,
     OrganizationWorkflowPipeline,
     OrganizationWorkflowRun,
     OrganizationWorkflowPipelineRun,
+    db,
 )
 
 
@@ -15,37 +18,40 @@ def find_organization_workflows(organization_uuid):
     ).all()
 
 
-def find_organization_workflow(organization_uuid, organization_workflow_uuid):
-    """ Fetches an OrganizationWorkflows associated with an organization """
-    return OrganizationWorkflow.query.filter(
+def find_organization_workflow(
+    organization_uuid, organization_workflow_uuid, for_update=False
+):
+    """Fetches an OrganizationWorkflows associated with an organization.
+
+    With for_update, the row is locked until the end of the transaction.
+    """
+    query = OrganizationWorkflow.query.filter(
         OrganizationWorkflow.organization_uuid == organization_uuid,
         OrganizationWorkflow.is_deleted == False,
         OrganizationWorkflow.uuid == organization_workflow_uuid,
-    ).one_or_none()
-
-
-def find_organization_workflow_pipelines(
-    organization_workflow_uuid, organization_pipeline_id
-):
-    """Fetches all OrganizationWorkflowPipelines associated with an organization pipeline. """
-    return OrganizationWorkflowPipeline.query.filter(
-        OrganizationWorkflowPipeline.organization_workflow_uuid
-        == organization_workflow_uuid,
-        OrganizationPipeline.id == organization_pipeline_id,
-        OrganizationWorkflowPipeline.is_deleted == False,
     )
+    if for_update:
+        query = query.with_for_update()
+
+    return query.one_or_none()
 
 
 def find_organization_workflow_pipeline(
     organization_workflow_uuid, organization_workflow_pipeline_uuid
 ):
     """Fetches an OrganizationWorkflowPipeline associated with an organization pipeline. """
-    return OrganizationWorkflowPipeline.query.filter(
-        OrganizationWorkflowPipeline.organization_workflow_uuid
-        == organization_workflow_uuid,
-        OrganizationWorkflowPipeline.uuid == organization_workflow_pipeline_uuid,
-        OrganizationWorkflowPipeline.is_deleted == False,
-    ).one_or_none()
+    return (
+        OrganizationWorkflowPipeline.query.options(
+            joinedload(OrganizationWorkflowPipeline.organization_workflow)
+        )
+        .filter(
+            OrganizationWorkflowPipeline.organization_workflow_uuid
+            == organization_workflow_uuid,
+            OrganizationWorkflowPipeline.uuid == organization_workflow_pipeline_uuid,
+            OrganizationWorkflowPipeline.is_deleted == False,
+        )
+        .one_or_none()
+    )
 
 
 def find_organization_workflow_pipeline_by_workflow_pipeline_uuid(
@@ -60,6 +66,25 @@ def find_organization_workflow_pipeline_by_workflow_pipeline_uuid(
     ).one_or_none()
 
 
+def find_organization_workflow_pipeline_graph(organization_workflow_uuid):
+    """Fetches every OrganizationWorkflowPipeline of an OrganizationWorkflow,
+    with the uuid of its OrganizationPipeline."""
+    return (
+        db.session.query(OrganizationWorkflowPipeline, OrganizationPipeline.uuid)
+        .join(
+            OrganizationPipeline,
+            OrganizationPipeline.id
+            == OrganizationWorkflowPipeline.organization_pipeline_id,
+        )
+        .filter(
+            OrganizationWorkflowPipeline.organization_workflow_uuid
+            == organization_workflow_uuid,
+            OrganizationWorkflowPipeline.is_deleted == False,
+        )
+        .all()
+    )
+
+
 def find_organization_workflow_run(
     organization_workflow_uuid, organization_workflow_run_uuid
 ):
@@ -77,3 +102,12 @@ def find_organization_workflow_pipeline_run_by_workflow_run_uuid(workflow_run_uu
     return OrganizationWorkflowPipelineRun.query.filter(
         OrganizationWorkflowPipelineRun.workflow_run_uuid == workflow_run_uuid
     ).one_or_none()
+
+
+def find_organization_workflow_pipeline_runs_by_workflow_run_uuids(
+    workflow_run_uuids,
+):
+    """ Fetches the OrganizationWorkflowPipelineRuns of several workflow run uuids. """
+    return OrganizationWorkflowPipelineRun.query.filter(
+        OrganizationWorkflowPipelineRun.workflow_run_uuid.in_(workflow_run_uuids)
+    ).all()
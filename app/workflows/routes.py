@@ -14,6 +14,7 @@ from app.workflows.services import (
     create_workflow_pipeline,
     fetch_workflow_pipelines,
     fetch_workflow_pipeline,
+    fetch_workflow_graph,
     update_workflow_pipeline,
     delete_workflow_pipeline,
     create_workflow_run,
@@ -325,7 +326,7 @@ def workflow_pipeline_create(organization_uuid, organization_workflow_uuid):
                 updated_at:
                   type: string
       "400":
-        description: "Bad request"
+        description: "Bad request, or the pipelines would have a cycle"
       "503":
         description: "Http error"
     """
@@ -401,6 +402,75 @@ def workflow_pipelines(organization_uuid, organization_workflow_uuid):
         return jsonify(value_error.args[0]), 400
 
 
+@organization_workflow_bp.route(
+    "/<organization_uuid>/workflows/<organization_workflow_uuid>/graph",
+    methods=["GET"],
+)
+@any_application_required
+@validate_organization(False)
+def workflow_graph(organization_uuid, organization_workflow_uuid):
+    """Get the dependencies between Organization Workflow Pipelines.
+
+    The order lists the workflow pipelines so that each comes after its
+    sources (it is null when they have a cycle). With workflow_pipeline_uuid,
+    every workflow pipeline that runs before (upstream) and after
+    (downstream) it is included.
+    ---
+    tags:
+      - workflows
+    parameters:
+      - in: header
+        name: Workflow-API-Key
+        description: Requires key type REACT_CLIENT
+        schema:
+          type: string
+      - in: query
+        name: workflow_pipeline_uuid
+        description: Organization Workflow Pipeline to get the upstream and downstream of
+        schema:
+          type: string
+    responses:
+      "200":
+        description: "Get the Organization Workflow Pipeline graph."
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                has_cycle:
+                  type: boolean
+                order:
+                  type: array
+                  nullable: true
+                  items:
+                    type: string
+                upstream:
+                  type: array
+                  items:
+                    type: string
+                downstream:
+                  type: array
+                  items:
+                    type: string
+      "400":
+        description: "Bad request"
+      "503":
+        description: "Http error"
+    """
+    try:
+        return jsonify(
+            fetch_workflow_graph(
+                organization_uuid,
+                organization_workflow_uuid,
+                request.args.get("workflow_pipeline_uuid"),
+            )
+        )
+    except HTTPError as http_error:
+        return {"message": http_error.args[0]}, 503
+    except ValueError as value_error:
+        return jsonify(value_error.args[0]), 400
+
+
 @organization_workflow_bp.route(
     "/<organization_uuid>/workflows/<organization_workflow_uuid>/pipelines/<organization_workflow_pipeline_uuid>",
     methods=["GET"],
@@ -507,7 +577,7 @@ def workflow_pipeline_update(
                 updated_at:
                   type: string
       "400":
-        description: "Bad request"
+        description: "Bad request, or the pipelines would have a cycle"
       "503":
         description: "Http error"
     """
@@ -1,12 +1,10 @@
 import logging
-import requests
+import uuid
 
-from flask import current_app
 from requests import HTTPError
 
 from blob_utils import create_url
-from application_roles.decorators import ROLES_KEY
-from app.constants import WORKFLOW_API_TOKEN, WORKFLOW_HOSTNAME
+from app.workflow_client import workflow_client
 
 from app.workflows.models import (
     OrganizationWorkflow,
@@ -17,21 +15,19 @@ from app.workflows.models import (
 )
 from app.pipelines.queries import (
     find_organization_pipeline,
-    find_organization_pipeline_by_id,
-    find_organization_pipelines,
-    find_organization_pipeline_by_pipeline_run_uuid,
+    find_organization_pipelines_and_runs_by_pipeline_run_uuids,
 )
-from app.pipelines.services import fetch_pipeline_run
+from app.pipelines.services import fetch_pipeline_run_summaries
 from app.workflows.queries import (
     find_organization_workflow,
     find_organization_workflows,
     find_organization_workflow_pipeline,
-    find_organization_workflow_pipelines,
-    find_organization_workflow_pipeline_by_workflow_pipeline_uuid,
+    find_organization_workflow_pipeline_graph,
     find_organization_workflow_run,
-    find_organization_workflow_pipeline_run_by_workflow_run_uuid,
+    find_organization_workflow_pipeline_runs_by_workflow_run_uuids,
 )
 
+from .graph import WorkflowGraph, cache_workflow_graph, cached_workflow_graph
 from .schemas import CreateWorkflowPipelineSchema
 
 logging.basicConfig(level=logging.DEBUG)
@@ -40,12 +36,8 @@ logger = logging.getLogger("workflows.services")
 
 def create_workflow(organization_uuid, request_json):
     """ Create a new workflow associated with an organization. """
-    response = requests.post(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().post(
+        "/v1/workflows",
         json=request_json,
     )
 
@@ -56,6 +48,7 @@ def create_workflow(organization_uuid, request_json):
         workflow = OrganizationWorkflow(
             organization_uuid=organization_uuid,
             workflow_uuid=json_value.get("uuid"),
+            graph=WorkflowGraph([], [], []).to_json(),
         )
         db.session.add(workflow)
         db.session.commit()
@@ -73,12 +66,8 @@ def fetch_workflows(organization_uuid):
 
     organization_workflows = find_organization_workflows(organization_uuid)
 
-    response = requests.post(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/search",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().post(
+        "/v1/workflows/search",
         json={"uuids": [op.workflow_uuid for op in organization_workflows]},
     )
 
@@ -118,12 +107,8 @@ def fetch_workflow(organization_uuid, organization_workflow_uuid):
     if not organization_workflow:
         raise ValueError("Organization Workflow not found.")
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().get(
+        f"/v1/workflows/{organization_workflow.workflow_uuid}"
     )
 
     try:
@@ -152,12 +137,8 @@ def update_workflow(organization_uuid, organization_workflow_uuid, request_json)
     if "name" not in request_json or "description" not in request_json:
         raise ValueError("Name and Description are required.")
 
-    response = requests.put(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().put(
+        f"/v1/workflows/{organization_workflow.workflow_uuid}",
         json=request_json,
     )
 
@@ -185,12 +166,8 @@ def delete_workflow(organization_uuid, organization_workflow_uuid):
     if not organization_workflow:
         raise ValueError("Organization Workflow not found.")
 
-    response = requests.delete(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().delete(
+        f"/v1/workflows/{organization_workflow.workflow_uuid}"
     )
 
     response.raise_for_status()
@@ -198,6 +175,8 @@ def delete_workflow(organization_uuid, organization_workflow_uuid):
     organization_workflow.is_deleted = True
     db.session.commit()
 
+    cache_workflow_graph(organization_uuid, organization_workflow_uuid, None)
+
 
 def create_workflow_pipeline(
     organization_uuid, organization_workflow_uuid, request_json
@@ -206,8 +185,9 @@ def create_workflow_pipeline(
 
     data = CreateWorkflowPipelineSchema().load(request_json)
 
+    # locked, so that concurrent edits of the graph are applied in turn.
     organization_workflow = find_organization_workflow(
-        organization_uuid, organization_workflow_uuid
+        organization_uuid, organization_workflow_uuid, for_update=True
     )
 
     if not organization_workflow:
@@ -220,37 +200,27 @@ def create_workflow_pipeline(
     if not org_pipeline:
         raise ValueError("Organization Pipeline not found.")
 
-    associated_org_workflow_pipelines = find_organization_workflow_pipelines(
-        organization_workflow_uuid, org_pipeline.id
-    )
-
-    org_workflow_pipelines = {
-        ow_p.uuid: ow_p.workflow_pipeline_uuid
-        for ow_p in associated_org_workflow_pipelines
-    }
-
     # org workflow pipelines
     src_org_workflow_pipelines = data.get("source_workflow_pipelines", [])
     dest_org_workflow_pipelines = data.get("destination_workflow_pipelines", [])
 
-    # workflow pipelines
-    if len(set(src_org_workflow_pipelines) - set(org_workflow_pipelines)) > 0:
-        raise ValueError("Invalid UUIDs provided to source_workflow_pipelines")
-    src_workflow_pipelines = [
-        org_workflow_pipelines[sp_uuid] for sp_uuid in src_org_workflow_pipelines
-    ]
-    if len(set(dest_org_workflow_pipelines) - set(org_workflow_pipelines)) > 0:
-        raise ValueError("Invalid UUIDs provided to destination_workflow_pipelines")
-    dest_workflow_pipelines = [
-        org_workflow_pipelines[dp_uuid] for dp_uuid in dest_org_workflow_pipelines
-    ]
+    graph = _stored_workflow_graph(organization_workflow)
+    (src_workflow_pipelines, dest_workflow_pipelines) = _workflow_pipeline_edges(
+        graph, src_org_workflow_pipelines, dest_org_workflow_pipelines
+    )
 
-    response = requests.post(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}/pipelines",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    new_org_workflow_pipeline_uuid = uuid.uuid4().hex
+    _check_workflow_graph(
+        graph.with_pipeline(
+            new_org_workflow_pipeline_uuid,
+            None,
+            src_org_workflow_pipelines,
+            dest_org_workflow_pipelines,
+        )
+    )
+
+    response = workflow_client().post(
+        f"/v1/workflows/{organization_workflow.workflow_uuid}/pipelines",
         json={
             "pipeline_uuid": org_pipeline.pipeline_uuid,
             "source_workflow_pipelines": src_workflow_pipelines,
@@ -263,15 +233,24 @@ def create_workflow_pipeline(
         response.raise_for_status()
 
         new_org_workflow_pipeline = OrganizationWorkflowPipeline(
+            uuid=new_org_workflow_pipeline_uuid,
             organization_workflow_uuid=organization_workflow_uuid,
             organization_pipeline_id=org_pipeline.id,
             workflow_pipeline_uuid=json_value.get("uuid"),
         )
 
         db.session.add(new_org_workflow_pipeline)
-        db.session.commit()
+        _save_workflow_graph(
+            organization_workflow,
+            graph.with_pipeline(
+                new_org_workflow_pipeline_uuid,
+                json_value.get("uuid"),
+                src_org_workflow_pipelines,
+                dest_org_workflow_pipelines,
+            ),
+        )
 
-        json_value["uuid"] = new_org_workflow_pipeline.uuid
+        json_value["uuid"] = new_org_workflow_pipeline_uuid
         json_value["pipeline_uuid"] = org_pipeline.uuid
         json_value["source_workflow_pipelines"] = src_org_workflow_pipelines
         json_value["destination_workflow_pipelines"] = dest_org_workflow_pipelines
@@ -293,36 +272,20 @@ def fetch_workflow_pipelines(organization_uuid, organization_workflow_uuid):
     if not organization_workflow:
         raise ValueError("Organization Workflow not found.")
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}/pipelines",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().get(
+        f"/v1/workflows/{organization_workflow.workflow_uuid}/pipelines"
     )
 
     try:
         json_value = response.json()
         response.raise_for_status()
 
-        # map workflow pipelines to org pipeline ids and uuids
-        org_pipelines = {
-            o_p.pipeline_uuid: (
-                o_p.id,
-                o_p.uuid,
-            )
-            for o_p in find_organization_pipelines(organization_uuid)
-        }
-
-        wp_to_owp = {
-            owp.workflow_pipeline_uuid: owp
-            for owp in organization_workflow.organization_workflow_pipelines
-        }
+        (wp_to_owp, pipeline_uuids) = _workflow_pipeline_graph(
+            organization_workflow_uuid
+        )
 
         for workflow_pipeline in json_value:
-            workflow_pipeline = _workflow_pipeline_to_org_wp(
-                workflow_pipeline, wp_to_owp[workflow_pipeline["uuid"]]
-            )
+            _workflow_pipeline_to_org_wp(workflow_pipeline, wp_to_owp, pipeline_uuids)
 
         return json_value
     except ValueError as value_error:
@@ -331,37 +294,170 @@ def fetch_workflow_pipelines(organization_uuid, organization_workflow_uuid):
         raise ValueError(json_value) from http_error
 
 
-def _workflow_pipeline_to_org_wp(workflow_pipeline, organization_workflow_pipeline):
+def _workflow_pipeline_graph(organization_workflow_uuid):
+    """Map the workflow pipeline uuids of an Organization Workflow to its
+    OrganizationWorkflowPipelines, and their organization pipeline ids to
+    organization pipeline uuids, with a single query."""
+    wp_to_owp = {}
+    pipeline_uuids = {}
+    for owp, pipeline_uuid in find_organization_workflow_pipeline_graph(
+        organization_workflow_uuid
+    ):
+        wp_to_owp[owp.workflow_pipeline_uuid] = owp
+        pipeline_uuids[owp.organization_pipeline_id] = pipeline_uuid
+
+    return wp_to_owp, pipeline_uuids
+
+
+def _workflow_pipeline_to_org_wp(workflow_pipeline, wp_to_owp, pipeline_uuids):
     """Convert a workflow pipeline from the the workflow server, to its
-    equivalent OrganizationWorkflowPipeline."""
-    organization_workflow_pipeline_uuid = organization_workflow_pipeline.uuid
-    organization_workflow_uuid = (
-        organization_workflow_pipeline.organization_workflow.uuid
-    )
-    org_pipeline = find_organization_pipeline_by_id(
+    equivalent OrganizationWorkflowPipeline, using the maps of
+    _workflow_pipeline_graph."""
+    organization_workflow_pipeline = wp_to_owp[workflow_pipeline["uuid"]]
+
+    workflow_pipeline["uuid"] = organization_workflow_pipeline.uuid
+    workflow_pipeline["pipeline_uuid"] = pipeline_uuids[
         organization_workflow_pipeline.organization_pipeline_id
+    ]
+
+    for key in ["source_workflow_pipelines", "destination_workflow_pipelines"]:
+        workflow_pipeline[key] = [
+            wp_to_owp[wp_uuid].uuid for wp_uuid in workflow_pipeline[key]
+        ]
+
+    return workflow_pipeline
+
+
+def fetch_workflow_graph(
+    organization_uuid,
+    organization_workflow_uuid,
+    organization_workflow_pipeline_uuid=None,
+):
+    """Fetch the dependencies between the pipelines of an Organization
+    Workflow.
+
+    Returns whether the pipelines have a cycle, and the uuids of the pipelines
+    in an order that they can run in (None when they have a cycle). With
+    organization_workflow_pipeline_uuid, also the uuids of every pipeline
+    that runs before it (upstream) and after it (downstream).
+    """
+    graph = _workflow_graph(organization_uuid, organization_workflow_uuid)
+
+    has_cycle = graph.has_cycle()
+    workflow_graph = {
+        "has_cycle": has_cycle,
+        "order": None if has_cycle else graph.topological_order(),
+    }
+
+    if organization_workflow_pipeline_uuid is not None:
+        if organization_workflow_pipeline_uuid not in graph:
+            raise ValueError("Organization Workflow Pipeline not found.")
+
+        workflow_graph["upstream"] = graph.upstream(organization_workflow_pipeline_uuid)
+        workflow_graph["downstream"] = graph.downstream(
+            organization_workflow_pipeline_uuid
+        )
+
+    return workflow_graph
+
+
+def _workflow_graph(organization_uuid, organization_workflow_uuid):
+    """The WorkflowGraph of an Organization Workflow, from the
+    WORKFLOW_GRAPH_CACHE if possible."""
+    graph = cached_workflow_graph(organization_uuid, organization_workflow_uuid)
+    if graph is not None:
+        return graph
+
+    organization_workflow = find_organization_workflow(
+        organization_uuid, organization_workflow_uuid
     )
 
-    workflow_pipeline["uuid"] = organization_workflow_pipeline_uuid
-    workflow_pipeline["pipeline_uuid"] = org_pipeline.uuid
+    if not organization_workflow:
+        raise ValueError("Organization Workflow not found.")
+
+    graph = _stored_workflow_graph(organization_workflow)
+    if db.session.dirty:
+        db.session.commit()
+    cache_workflow_graph(organization_uuid, organization_workflow_uuid, graph)
+
+    return graph
+
 
-    owp_to_op = {organization_workflow_pipeline.uuid: org_pipeline.uuid}
-    all_wps = (
-        workflow_pipeline["source_workflow_pipelines"]
-        + workflow_pipeline["destination_workflow_pipelines"]
+def _stored_workflow_graph(organization_workflow):
+    """The WorkflowGraph stored on an Organization Workflow.
+
+    Workflows created before their graphs were stored have theirs built from
+    the workflow service on first use, under a row lock; the caller commits
+    it.
+    """
+    if organization_workflow.graph is None:
+        db.session.refresh(organization_workflow, with_for_update=True)
+
+    if organization_workflow.graph is None:
+        organization_workflow.graph = _fetch_workflow_graph(
+            organization_workflow
+        ).to_json()
+
+    return WorkflowGraph.from_json(organization_workflow.graph)
+
+
+def _fetch_workflow_graph(organization_workflow):
+    """Build the WorkflowGraph of an Organization Workflow from its pipelines
+    on the workflow service."""
+    response = workflow_client().get(
+        f"/v1/workflows/{organization_workflow.workflow_uuid}/pipelines"
     )
-    for uuid in all_wps:
-        if uuid in owp_to_op:
-            continue
-        owp = find_organization_workflow_pipeline_by_workflow_pipeline_uuid(
-            organization_workflow_uuid, uuid
-        )
-        owp_to_op[uuid] = owp.uuid
 
-    for key in ["source_workflow_pipelines", "destination_workflow_pipelines"]:
-        workflow_pipeline[key] = [owp_to_op[uuid] for uuid in workflow_pipeline[key]]
+    try:
+        json_value = response.json()
+        response.raise_for_status()
 
-    return workflow_pipeline
+        (wp_to_owp, _) = _workflow_pipeline_graph(organization_workflow.uuid)
+
+        return WorkflowGraph.from_workflow_pipelines(json_value, wp_to_owp)
+    except ValueError as value_error:
+        raise HTTPError("Non JSON payload returned") from value_error
+    except HTTPError as http_error:
+        raise ValueError(json_value) from http_error
+
+
+def _save_workflow_graph(organization_workflow, graph):
+    """Store the WorkflowGraph of an Organization Workflow with the rest of an
+    edit, and update the WORKFLOW_GRAPH_CACHE once it is committed."""
+    organization_workflow.graph = graph.to_json()
+    db.session.commit()
+
+    cache_workflow_graph(
+        organization_workflow.organization_uuid, organization_workflow.uuid, graph
+    )
+
+
+def _workflow_pipeline_edges(
+    graph, src_org_workflow_pipelines, dest_org_workflow_pipelines
+):
+    """Validate the source and destination OrganizationWorkflowPipeline uuids of
+    an edit against the WorkflowGraph, and return their workflow pipeline uuids."""
+    if len(set(src_org_workflow_pipelines) - set(graph.uuids)) > 0:
+        raise ValueError("Invalid UUIDs provided to source_workflow_pipelines")
+    if len(set(dest_org_workflow_pipelines) - set(graph.uuids)) > 0:
+        raise ValueError("Invalid UUIDs provided to destination_workflow_pipelines")
+
+    return (
+        [
+            graph.workflow_pipeline_uuid(sp_uuid)
+            for sp_uuid in src_org_workflow_pipelines
+        ],
+        [
+            graph.workflow_pipeline_uuid(dp_uuid)
+            for dp_uuid in dest_org_workflow_pipelines
+        ],
+    )
+
+
+def _check_workflow_graph(graph):
+    """ Raise a ValueError if an edit would give the workflow pipelines a cycle. """
+    if graph.has_cycle():
+        raise ValueError("Workflow pipelines can't have a cycle.")
 
 
 def fetch_workflow_pipeline(
@@ -383,20 +479,14 @@ def fetch_workflow_pipeline(
     w_uuid = organization_workflow.workflow_uuid
     wp_uuid = organization_workflow_pipeline.workflow_pipeline_uuid
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{w_uuid}/pipelines/{wp_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
-    )
+    response = workflow_client().get(f"/v1/workflows/{w_uuid}/pipelines/{wp_uuid}")
 
     try:
         workflow_pipeline = response.json()
         response.raise_for_status()
 
         return _workflow_pipeline_to_org_wp(
-            workflow_pipeline, organization_workflow_pipeline
+            workflow_pipeline, *_workflow_pipeline_graph(organization_workflow_uuid)
         )
     except ValueError as value_error:
         raise HTTPError("Non JSON payload returned") from value_error
@@ -414,8 +504,9 @@ def update_workflow_pipeline(
 
     data = CreateWorkflowPipelineSchema().load(request_json)
 
+    # locked, so that concurrent edits of the graph are applied in turn.
     organization_workflow = find_organization_workflow(
-        organization_uuid, organization_workflow_uuid
+        organization_uuid, organization_workflow_uuid, for_update=True
     )
 
     if not organization_workflow:
@@ -428,44 +519,32 @@ def update_workflow_pipeline(
     if not org_pipeline:
         raise ValueError("Organization Pipeline not found.")
 
-    # fetch all org workflow pipelines for target pipeline and assoc piplines.
-    associated_org_workflow_pipelines = find_organization_workflow_pipelines(
-        organization_workflow_uuid, org_pipeline.id
-    )
-
-    org_workflow_pipelines = {
-        ow_p.uuid: ow_p.workflow_pipeline_uuid
-        for ow_p in associated_org_workflow_pipelines
-    }
-
-    if organization_workflow_pipeline_uuid not in org_workflow_pipelines:
-        raise ValueError("Organization Workflow Pipeline not found.")
-
     # org workflow pipelines
     src_org_workflow_pipelines = data.get("source_workflow_pipelines", [])
     dest_org_workflow_pipelines = data.get("destination_workflow_pipelines", [])
 
-    # workflow pipelines
-    if len(set(src_org_workflow_pipelines) - set(org_workflow_pipelines)) > 0:
-        raise ValueError("Invalid UUIDs provided to source_workflow_pipelines")
-    src_workflow_pipelines = [
-        org_workflow_pipelines[sp_uuid] for sp_uuid in src_org_workflow_pipelines
-    ]
-    if len(set(dest_org_workflow_pipelines) - set(org_workflow_pipelines)) > 0:
-        raise ValueError("Invalid UUIDs provided to destination_workflow_pipelines")
-    dest_workflow_pipelines = [
-        org_workflow_pipelines[dp_uuid] for dp_uuid in dest_org_workflow_pipelines
-    ]
+    graph = _stored_workflow_graph(organization_workflow)
+
+    if organization_workflow_pipeline_uuid not in graph:
+        raise ValueError("Organization Workflow Pipeline not found.")
+
+    (src_workflow_pipelines, dest_workflow_pipelines) = _workflow_pipeline_edges(
+        graph, src_org_workflow_pipelines, dest_org_workflow_pipelines
+    )
 
     w_uuid = organization_workflow.workflow_uuid
-    wp_uuid = org_workflow_pipelines[organization_workflow_pipeline_uuid]
+    wp_uuid = graph.workflow_pipeline_uuid(organization_workflow_pipeline_uuid)
 
-    response = requests.put(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{w_uuid}/pipelines/{wp_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    graph = graph.with_pipeline(
+        organization_workflow_pipeline_uuid,
+        wp_uuid,
+        src_org_workflow_pipelines,
+        dest_org_workflow_pipelines,
+    )
+    _check_workflow_graph(graph)
+
+    response = workflow_client().put(
+        f"/v1/workflows/{w_uuid}/pipelines/{wp_uuid}",
         json={
             "pipeline_uuid": org_pipeline.pipeline_uuid,
             "source_workflow_pipelines": src_workflow_pipelines,
@@ -477,6 +556,8 @@ def update_workflow_pipeline(
         json_value = response.json()
         response.raise_for_status()
 
+        _save_workflow_graph(organization_workflow, graph)
+
         json_value["uuid"] = organization_workflow_pipeline_uuid
         json_value["pipeline_uuid"] = org_pipeline.uuid
         json_value["source_workflow_pipelines"] = src_org_workflow_pipelines
@@ -501,24 +582,54 @@ def delete_workflow_pipeline(
     if not organization_workflow_pipeline:
         raise ValueError("Organization Workflow Pipeline not found.")
 
-    organization_workflow = organization_workflow_pipeline.organization_workflow
+    # locked, so that concurrent edits of the graph are applied in turn.
+    organization_workflow = find_organization_workflow(
+        organization_uuid, organization_workflow_uuid, for_update=True
+    )
+
+    if not organization_workflow:
+        raise ValueError("Organization Workflow not found.")
+
+    graph = _stored_workflow_graph(organization_workflow)
 
     w_uuid = organization_workflow.workflow_uuid
     wp_uuid = organization_workflow_pipeline.workflow_pipeline_uuid
 
-    response = requests.delete(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{w_uuid}/pipelines/{wp_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
-    )
+    response = workflow_client().delete(f"/v1/workflows/{w_uuid}/pipelines/{wp_uuid}")
 
     response.raise_for_status()
 
     organization_workflow_pipeline.is_deleted = True
 
-    db.session.commit()
+    if organization_workflow_pipeline_uuid in graph:
+        graph = graph.without_pipeline(organization_workflow_pipeline_uuid)
+    _save_workflow_graph(organization_workflow, graph)
+
+
+def _find_org_pipeline_runs(organization_uuid, pipeline_run_uuids):
+    """Find the (OrganizationPipeline, OrganizationPipelineRun) of each
+    pipeline run uuid, that belong to organization_uuid, with one query.
+
+    Returns them in the order of pipeline_run_uuids.
+    """
+    org_pipeline_runs_by_uuid = {
+        opr.pipeline_run_uuid: (op, opr)
+        for (op, opr) in find_organization_pipelines_and_runs_by_pipeline_run_uuids(
+            pipeline_run_uuids
+        )
+    }
+
+    org_pipeline_runs = []
+    for pipeline_run_uuid in pipeline_run_uuids:
+        (org_pipeline, org_pipeline_run) = org_pipeline_runs_by_uuid.get(
+            pipeline_run_uuid, (None, None)
+        )
+        if not org_pipeline or org_pipeline.organization_uuid != organization_uuid:
+            raise ValueError({"message": "organization_pipeline_uuid not found"})
+
+        org_pipeline_runs.append((org_pipeline, org_pipeline_run))
+
+    return org_pipeline_runs
 
 
 def create_workflow_run(organization_uuid, organization_workflow_uuid, request_json):
@@ -540,74 +651,119 @@ def create_workflow_run(organization_uuid, organization_workflow_uuid, request_j
 
     input_file_meta = request_json.get("input_files", [])
 
-    response = requests.post(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{org_workflow.workflow_uuid}/runs",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
+    response = workflow_client().post(
+        f"/v1/workflows/{org_workflow.workflow_uuid}/runs",
         json=input_file_meta,
     )
 
-    try:
-        created_workflow_run = response.json()
-        response.raise_for_status()
-
-        # add org workflow run
-        new_workflow_run = OrganizationWorkflowRun(
-            organization_workflow_uuid=org_workflow.uuid,
-            workflow_run_uuid=created_workflow_run.get("uuid"),
-        )
+    created_workflow_run = _workflow_run_json(response)
 
-        db.session.add(new_workflow_run)
-        db.session.flush()
+    # the rows are looked up once the response is parsed, so that their
+    # ValueErrors are not mistaken for a bad response.
+    pipeline_run_uuids = [
+        wpr.get("pipeline_run").get("uuid")
+        for wpr in created_workflow_run.get("workflow_pipeline_runs")
+    ]
+    org_pipeline_runs = _find_org_pipeline_runs(organization_uuid, pipeline_run_uuids)
 
-        # add in org workflow pipeline runs
-        pipeline_runs = []
-        for workflow_pipeline_run in created_workflow_run.get("workflow_pipeline_runs"):
+    # add org workflow run
+    new_workflow_run = OrganizationWorkflowRun(
+        uuid=uuid.uuid4().hex,
+        organization_workflow_uuid=org_workflow.uuid,
+        workflow_run_uuid=created_workflow_run.get("uuid"),
+    )
 
-            # get org pipeline from pipeline run and then fetch the pipeline
-            org_pipeline_run_model = find_organization_pipeline_by_pipeline_run_uuid(
-                workflow_pipeline_run.get("pipeline_run").get("uuid")
-            )
+    db.session.add(new_workflow_run)
+    db.session.flush()
+
+    # add in org workflow pipeline runs, with a single insert.
+    new_workflow_pipeline_runs = [
+        {
+            "uuid": uuid.uuid4().hex,
+            "organization_workflow_id": org_workflow.id,
+            "organization_pipeline_run_id": org_pipeline_run.id,
+            "organization_workflow_run_id": new_workflow_run.id,
+            "workflow_run_uuid": created_workflow_run.get("uuid"),
+        }
+        for (_, org_pipeline_run) in org_pipeline_runs
+    ]
+    db.session.bulk_insert_mappings(
+        OrganizationWorkflowPipelineRun, new_workflow_pipeline_runs
+    )
 
-            org_pipeline_model = find_organization_pipeline_by_id(
-                org_pipeline_run_model.organization_pipeline_id
-            )
-            pipeline_run = fetch_pipeline_run(
-                organization_uuid, org_pipeline_model.uuid, org_pipeline_run_model.uuid
-            )
+    # commit before fetching the pipeline runs, so that the transaction is
+    # not held open for the requests to the workflow service.
+    new_workflow_run_uuid = new_workflow_run.uuid
+    db.session.commit()
 
-            # remove artifacts from response
-            pipeline_run.pop("artifacts", None)
+    # fetch the pipeline runs concurrently, reloading the rows the commit
+    # expired with a single query.
+    org_pipeline_runs = _find_org_pipeline_runs(organization_uuid, pipeline_run_uuids)
+    pipeline_runs = [
+        {"uuid": new_workflow_pipeline_run["uuid"], "pipeline_run": pipeline_run}
+        for new_workflow_pipeline_run, pipeline_run in zip(
+            new_workflow_pipeline_runs,
+            fetch_pipeline_run_summaries(org_pipeline_runs),
+        )
+    ]
 
-            new_workflow_pipeline_run = OrganizationWorkflowPipelineRun(
-                organization_workflow_id=org_workflow.id,
-                organization_pipeline_run_id=org_pipeline_run_model.id,
-                organization_workflow_run_id=new_workflow_run.id,
-                workflow_run_uuid=created_workflow_run.get("uuid"),
-            )
+    # save any pipeline run status that changed.
+    if db.session.dirty:
+        db.session.commit()
 
-            # add new model and grab uuid
-            db.session.add(new_workflow_pipeline_run)
-            db.session.flush()
+    created_workflow_run["uuid"] = new_workflow_run_uuid
+    created_workflow_run["workflow_pipeline_runs"] = pipeline_runs
 
-            # add to pipeline runs collection
-            pipeline_runs.append(
-                {"uuid": new_workflow_pipeline_run.uuid, "pipeline_run": pipeline_run}
-            )
+    return created_workflow_run
 
-        # commit and update response
-        db.session.commit()
 
-        created_workflow_run["uuid"] = new_workflow_run.uuid
-        created_workflow_run["workflow_pipeline_runs"] = pipeline_runs
+def _workflow_run_json(response):
+    """ Return the workflow run in a response from the workflow service. """
+    try:
+        workflow_run = response.json()
+        response.raise_for_status()
 
-        return created_workflow_run
+        return workflow_run
     except ValueError as value_error:
         raise HTTPError("Non JSON payload returned") from value_error
     except HTTPError as http_error:
-        raise ValueError(created_workflow_run) from http_error
+        raise ValueError(workflow_run) from http_error
+
+
+def _find_workflow_pipeline_runs(organization_uuid, workflow_pipeline_runs):
+    """Find the OrganizationWorkflowPipelineRun, and the (OrganizationPipeline,
+    OrganizationPipelineRun), of each workflow pipeline run from the workflow
+    service, with one query for all the OrganizationWorkflowPipelineRuns and
+    one for all the (OrganizationPipeline, OrganizationPipelineRun)s.
+
+    Raises a ValueError when one of them is not found.
+
+    Returns the two lists, in the order of workflow_pipeline_runs.
+    """
+    org_wf_pipeline_runs_by_uuid = {
+        owpr.workflow_run_uuid: owpr
+        for owpr in find_organization_workflow_pipeline_runs_by_workflow_run_uuids(
+            [wpr.get("uuid") for wpr in workflow_pipeline_runs]
+        )
+    }
+    org_wf_pipeline_runs = []
+    for workflow_pipeline_run in workflow_pipeline_runs:
+        org_wf_pipeline_run = org_wf_pipeline_runs_by_uuid.get(
+            workflow_pipeline_run.get("uuid")
+        )
+        if not org_wf_pipeline_run:
+            raise ValueError(
+                {"message": "organization_workflow_pipeline_run not found"}
+            )
+
+        org_wf_pipeline_runs.append(org_wf_pipeline_run)
+
+    org_pipeline_runs = _find_org_pipeline_runs(
+        organization_uuid,
+        [wpr.get("pipeline_run").get("uuid") for wpr in workflow_pipeline_runs],
+    )
+
+    return org_wf_pipeline_runs, org_pipeline_runs
 
 
 def fetch_workflow_run(
@@ -626,58 +782,35 @@ def fetch_workflow_run(
         organization_uuid, organization_workflow_uuid
     )
 
+    if not org_workflow:
+        raise ValueError({"message": "organization_workflow_uuid not found"})
+
     wf_uuid = org_workflow.workflow_uuid
     wfr_uuid = org_workflow_run.workflow_run_uuid
 
-    response = requests.get(
-        f"{current_app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{wf_uuid}/runs/{wfr_uuid}",
-        headers={
-            "Content-Type": "application/json",
-            ROLES_KEY: current_app.config[WORKFLOW_API_TOKEN],
-        },
-    )
-
-    try:
-        workflow_run = response.json()
-        response.raise_for_status()
-
-        workflow_run["uuid"] = org_workflow_run.uuid
-
-        # update org workflow pipeline runs
-        workflow_pipeline_runs = []
-        for workflow_pipeline_run in workflow_run.get("workflow_pipeline_runs"):
-            org_wf_pipeline_run = (
-                find_organization_workflow_pipeline_run_by_workflow_run_uuid(
-                    workflow_pipeline_run.get("uuid")
-                )
-            )
-
-            workflow_pipeline_run["uuid"] = org_wf_pipeline_run.uuid
+    response = workflow_client().get(f"/v1/workflows/{wf_uuid}/runs/{wfr_uuid}")
 
-            org_pipeline_run_model = find_organization_pipeline_by_pipeline_run_uuid(
-                workflow_pipeline_run.get("pipeline_run").get("uuid")
-            )
+    workflow_run = _workflow_run_json(response)
 
-            org_pipeline_model = find_organization_pipeline_by_id(
-                org_pipeline_run_model.organization_pipeline_id
-            )
-            pipeline_run = fetch_pipeline_run(
-                organization_uuid, org_pipeline_model.uuid, org_pipeline_run_model.uuid
-            )
+    org_wf_pipeline_runs, org_pipeline_runs = _find_workflow_pipeline_runs(
+        organization_uuid, workflow_run.get("workflow_pipeline_runs")
+    )
 
-            # remove artifacts from response
-            pipeline_run.pop("artifacts", None)
+    # fetch the pipeline runs concurrently
+    workflow_pipeline_runs = []
+    for org_wf_pipeline_run, pipeline_run in zip(
+        org_wf_pipeline_runs, fetch_pipeline_run_summaries(org_pipeline_runs)
+    ):
+        # add to updated workflow pipeline runs collection
+        workflow_pipeline_runs.append(
+            {"uuid": org_wf_pipeline_run.uuid, "pipeline_run": pipeline_run}
+        )
 
-            # add to updated workflow pipeline runs collection
-            workflow_pipeline_runs.append(
-                {"uuid": org_wf_pipeline_run.uuid, "pipeline_run": pipeline_run}
-            )
+    workflow_run["uuid"] = org_workflow_run.uuid
+    workflow_run["workflow_pipeline_runs"] = workflow_pipeline_runs
 
-        workflow_run["uuid"] = org_workflow_run.uuid
-        workflow_run["workflow_pipeline_runs"] = workflow_pipeline_runs
+    # save any pipeline run status that changed.
+    if db.session.dirty:
+        db.session.commit()
 
-        return workflow_run
-    except ValueError as value_error:
-        raise HTTPError("Non JSON payload returned") from value_error
-    except HTTPError as http_error:
-        raise ValueError(workflow_run) from http_error
+    return workflow_run
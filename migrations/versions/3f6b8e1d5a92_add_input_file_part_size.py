@@ -0,0 +1,24 @@
+"""add input file part size
+
+Revision ID: 3f6b8e1d5a92
+Revises: 9c3d2a6e8b17
+Create Date: 2026-10-18 16:48:05.612093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6b8e1d5a92'
+down_revision = '9c3d2a6e8b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('organization_pipeline_input_file', sa.Column('part_size', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('organization_pipeline_input_file', 'part_size')
@@ -0,0 +1,24 @@
+"""add organization workflow graph
+
+Revision ID: 4e7c9a2d5b18
+Revises: d72a9f3b6c84
+Create Date: 2026-10-18 19:42:05.316278
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7c9a2d5b18'
+down_revision = 'd72a9f3b6c84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('organization_workflow', sa.Column('graph', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('organization_workflow', 'graph')
@@ -0,0 +1,62 @@
+"""add lookup indexes
+
+Revision ID: 5d1a7c3e9f42
+Revises: 20369e3c3338
+Create Date: 2026-10-18 11:52:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1a7c3e9f42'
+down_revision = '20369e3c3338'
+branch_labels = None
+depends_on = None
+
+NOT_DELETED = sa.text("is_deleted = false")
+
+# (name, table, columns, only rows that are not deleted)
+INDEXES = (
+    ('ix_organization_pipeline_organization_uuid', 'organization_pipeline', ['organization_uuid', 'uuid'], True),
+    ('ix_organization_pipeline_input_file_pipeline_id', 'organization_pipeline_input_file', ['organization_pipeline_id'], False),
+    ('ix_organization_pipeline_input_file_pipeline_run_id', 'organization_pipeline_input_file', ['organization_pipeline_run_id'], False),
+    ('ix_organization_pipeline_run_organization_pipeline_id', 'organization_pipeline_run', ['organization_pipeline_id', 'created_at', 'id'], False),
+    ('ix_organization_pipeline_run_uuid', 'organization_pipeline_run', ['uuid'], False),
+    ('ix_organization_pipeline_run_pipeline_run_uuid', 'organization_pipeline_run', ['pipeline_run_uuid'], False),
+    ('ix_artifact_chart_organization_pipeline_run_id', 'artifact_chart', ['organization_pipeline_run_id'], False),
+    ('ix_organization_pipeline_run_post_processing_state_run_id', 'organization_pipeline_run_post_processing_state', ['organization_pipeline_run_id'], False),
+    ('ix_organization_workflow_organization_uuid', 'organization_workflow', ['organization_uuid', 'uuid'], True),
+    ('ix_organization_workflow_pipeline_organization_workflow_uuid', 'organization_workflow_pipeline', ['organization_workflow_uuid', 'workflow_pipeline_uuid'], True),
+    ('ix_organization_workflow_pipeline_organization_pipeline_id', 'organization_workflow_pipeline', ['organization_pipeline_id'], False),
+    ('ix_organization_workflow_pipeline_run_workflow_run_uuid', 'organization_workflow_pipeline_run', ['workflow_run_uuid'], False),
+    ('ix_organization_workflow_pipeline_run_workflow_run_id', 'organization_workflow_pipeline_run', ['organization_workflow_run_id'], False),
+    ('ix_organization_workflow_pipeline_run_pipeline_run_id', 'organization_workflow_pipeline_run', ['organization_pipeline_run_id'], False),
+    ('ix_organization_workflow_run_organization_workflow_uuid', 'organization_workflow_run', ['organization_workflow_uuid', 'uuid'], True),
+)
+
+
+def existing_indexes(table):
+    inspector = Inspector.from_engine(op.get_bind())
+    return [index['name'] for index in inspector.get_indexes(table)]
+
+
+def upgrade():
+    for name, table, columns, not_deleted in INDEXES:
+        # databases created from the models already have the indexes.
+        if name in existing_indexes(table):
+            continue
+
+        where = NOT_DELETED if not_deleted else None
+        op.create_index(name, table, columns, postgresql_where=where, sqlite_where=where)
+
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        # like upgrade, only touch the indexes that are there.
+        if name not in existing_indexes(table):
+            continue
+
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,26 @@
+"""add pipeline run status snapshot
+
+Revision ID: 7b2e4f81c0d6
+Revises: 5d1a7c3e9f42
+Create Date: 2026-10-18 14:07:12.520431
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4f81c0d6'
+down_revision = '5d1a7c3e9f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('organization_pipeline_run', sa.Column('status_snapshot', sa.JSON(), nullable=True))
+    op.add_column('organization_pipeline_run', sa.Column('status_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('organization_pipeline_run', 'status_updated_at')
+    op.drop_column('organization_pipeline_run', 'status_snapshot')
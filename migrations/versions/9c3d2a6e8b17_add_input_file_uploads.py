@@ -0,0 +1,28 @@
+"""add input file uploads
+
+Revision ID: 9c3d2a6e8b17
+Revises: e41a9c5b7d20
+Create Date: 2026-10-18 16:02:19.374810
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3d2a6e8b17'
+down_revision = 'e41a9c5b7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('organization_pipeline_input_file', sa.Column('is_pending', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('organization_pipeline_input_file', sa.Column('size', sa.BigInteger(), nullable=True))
+    op.add_column('organization_pipeline_input_file', sa.Column('upload_id', sa.String(length=1024), nullable=True))
+
+
+def downgrade():
+    op.drop_column('organization_pipeline_input_file', 'upload_id')
+    op.drop_column('organization_pipeline_input_file', 'size')
+    op.drop_column('organization_pipeline_input_file', 'is_pending')
@@ -0,0 +1,40 @@
+"""add input file content
+
+Revision ID: b58e2c7f4d13
+Revises: 3f6b8e1d5a92
+Create Date: 2026-10-18 17:26:51.204718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b58e2c7f4d13'
+down_revision = '3f6b8e1d5a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('input_file_content',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('uuid', sa.String(length=32), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('reference_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256')
+    )
+    op.create_index('ix_input_file_content_reference_count', 'input_file_content', ['reference_count', 'updated_at'], unique=False)
+    op.add_column('organization_pipeline_input_file', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_foreign_key(None, 'organization_pipeline_input_file', 'input_file_content', ['content_sha256'], ['sha256'])
+
+
+def downgrade():
+    op.drop_constraint(None, 'organization_pipeline_input_file', type_='foreignkey')
+    op.drop_column('organization_pipeline_input_file', 'content_sha256')
+    op.drop_index('ix_input_file_content_reference_count', table_name='input_file_content')
+    op.drop_table('input_file_content')
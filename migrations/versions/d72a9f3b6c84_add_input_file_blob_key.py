@@ -0,0 +1,64 @@
+"""add input file blob key
+
+Revision ID: d72a9f3b6c84
+Revises: b58e2c7f4d13
+Create Date: 2026-10-18 18:05:37.981456
+
+"""
+from urllib.parse import quote
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd72a9f3b6c84'
+down_revision = 'b58e2c7f4d13'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    op.add_column('organization_pipeline_input_file', sa.Column('blob_key', sa.String(length=2048), server_default='', nullable=False))
+
+    # store the key that existing files were uploaded under.
+    connection = op.get_bind()
+    input_file = sa.table(
+        'organization_pipeline_input_file',
+        sa.column('id', sa.Integer),
+        sa.column('uuid', sa.String),
+        sa.column('name', sa.String),
+        sa.column('organization_pipeline_id', sa.Integer),
+        sa.column('content_sha256', sa.String),
+        sa.column('blob_key', sa.String),
+    )
+    pipeline = sa.table(
+        'organization_pipeline',
+        sa.column('id', sa.Integer),
+        sa.column('uuid', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select([input_file.c.id, input_file.c.uuid, input_file.c.name, input_file.c.content_sha256, pipeline.c.uuid.label('pipeline_uuid')])
+            .select_from(input_file.join(pipeline, pipeline.c.id == input_file.c.organization_pipeline_id))
+            .where(input_file.c.id > last_id)
+            .order_by(input_file.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        for row in rows:
+            if row.content_sha256:
+                blob_key = f'content/{row.content_sha256}'
+            else:
+                blob_key = f'{row.pipeline_uuid}/{row.uuid}-{quote(row.name)}'
+            connection.execute(input_file.update().where(input_file.c.id == row.id).values(blob_key=blob_key))
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_column('organization_pipeline_input_file', 'blob_key')
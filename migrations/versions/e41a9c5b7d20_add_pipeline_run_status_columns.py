@@ -0,0 +1,30 @@
+"""add pipeline run status columns
+
+Revision ID: e41a9c5b7d20
+Revises: 7b2e4f81c0d6
+Create Date: 2026-10-18 15:21:44.806317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41a9c5b7d20'
+down_revision = '7b2e4f81c0d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('organization_pipeline_run', sa.Column('state', sa.String(length=32), nullable=True))
+    op.add_column('organization_pipeline_run', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('organization_pipeline_run', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    op.add_column('organization_pipeline_run', sa.Column('artifact_count', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('organization_pipeline_run', 'artifact_count')
+    op.drop_column('organization_pipeline_run', 'completed_at')
+    op.drop_column('organization_pipeline_run', 'started_at')
+    op.drop_column('organization_pipeline_run', 'state')
@@ -75,3 +75,53 @@ def create_organization_pipeline(c, organization_uuid, pipeline_uuid):
     with app.app_context():
         organization_pipeline = create_organization_pipeline(organization_uuid, pipeline_uuid)
         print(organization_pipeline.uuid)
+
+
+@task
+def backfill_pipeline_run_status(c, batch_size=100):
+    """Update the status columns of pipeline runs that have not finished, from
+    the workflow service.
+    """
+    from app import create_app
+    from app.pipelines.services import backfill_pipeline_run_status
+
+    (app, db, _) = create_app()
+    with app.app_context():
+        fetched = backfill_pipeline_run_status(int(batch_size))
+        print(f"Fetched {fetched} pipeline runs")
+
+
+@task
+def delete_unreferenced_input_file_contents(c, min_age_hours=24):
+    """Delete stored input file contents that no input file has referenced for
+    min_age_hours.
+    """
+    from datetime import timedelta
+
+    from app import create_app
+    from app.pipelines.services import delete_unreferenced_input_file_contents
+
+    (app, db, _) = create_app()
+    with app.app_context():
+        deleted = delete_unreferenced_input_file_contents(
+            timedelta(hours=float(min_age_hours))
+        )
+        print(f"Deleted {deleted} input file contents")
+
+
+@task
+def abort_expired_input_file_uploads(c, min_age_hours=None):
+    """Abort the uploads of input files still pending after min_age_hours (by
+    default, once their presigned URLs have expired).
+    """
+    from datetime import timedelta
+
+    from app import create_app
+    from app.pipelines.services import abort_expired_pipeline_input_file_uploads
+
+    (app, db, _) = create_app()
+    with app.app_context():
+        aborted = abort_expired_pipeline_input_file_uploads(
+            None if min_age_hours is None else timedelta(hours=float(min_age_hours))
+        )
+        print(f"Aborted {aborted} input file uploads")
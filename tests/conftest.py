@@ -2,11 +2,15 @@ import uuid
 from datetime import datetime, timedelta
 import pytest
 import responses
+from sqlalchemy import event
 from app import create_app
 from app.constants import (
     AUTH_HOSTNAME,
+    BLOB_CLIENT,
     MAX_CONTENT_LENGTH,
+    S3_ACCESS_KEY_ID,
     S3_ENDPOINT_URL,
+    S3_SECRET_ACCESS_KEY,
     SECRET_KEY,
     SQLALCHEMY_DATABASE_URI,
     WORKFLOW_API_TOKEN,
@@ -25,9 +29,12 @@ from app.workflows.models import (
     OrganizationWorkflowRun,
     db,
 )
+from app.workflows.graph import WorkflowGraph
 from app.utils import ApplicationsEnum
 from application_roles.services import create_application
 
+from .fake_s3 import FakeS3
+
 ORGANIZATION_UUID = "4d96f0b6fe9a4872813b3fac7a675505"
 ORGANIZATION_WORKFLOW_UUID = "5626c02f0a964aecb2e254a189c8c0ad"
 ORGANIZATION_WORKFLOW_PIPELINE_UUID = "d2830dff5d164b1fa5448ef041def206"
@@ -56,6 +63,8 @@ def app():
             SECRET_KEY: "PYTEST",
             MAX_CONTENT_LENGTH: "100",
             S3_ENDPOINT_URL: "http://example.com",
+            S3_ACCESS_KEY_ID: "test-key-id",
+            S3_SECRET_ACCESS_KEY: "test-secret",
             AUTH_HOSTNAME: "http://auth",
             WORKFLOW_HOSTNAME: "http://workflow",
             WORKFLOW_API_TOKEN: "workflow-api-token",
@@ -78,6 +87,28 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def fake_s3(app):
+    """ Replace the blob store with a FakeS3, that uploads in 4 byte parts. """
+    blob_client = app.extensions[BLOB_CLIENT]
+    blob_client.s3 = FakeS3(max_parts=2)
+    blob_client.part_size = 4
+    return blob_client.s3
+
+
+@pytest.fixture
+def query_counter(app):
+    """ Collects the SQL statements executed during a test. """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture
 def organization_pipeline(app):
     op = OrganizationPipeline(
@@ -95,6 +126,7 @@ def organization_workflow(app):
         organization_uuid=ORGANIZATION_UUID,
         workflow_uuid=WORKFLOW_UUID,
         uuid=ORGANIZATION_WORKFLOW_UUID,
+        graph=WorkflowGraph([], [], []).to_json(),
     )
     db.session.add(ow)
     db.session.commit()
@@ -111,6 +143,7 @@ def organization_pipeline_input_file(
         organization_pipeline_id=organization_pipeline.id,
         name=f"{PIPELINE_UUID}organization_pipeline_input_file.csv",
         organization_pipeline_run_id=organization_pipeline_run.id,
+        blob_key=f"{organization_pipeline.uuid}/{PIPELINE_RUN_INPUT_FILE_UUID}-{PIPELINE_UUID}organization_pipeline_input_file.csv",
     )
     db.session.add(opif)
     db.session.commit()
@@ -136,19 +169,47 @@ def organization_pipeline_run(app, organization_pipeline):
     return opr
 
 
-@pytest.fixture
-def organization_workflow_pipeline(app, organization_pipeline, organization_workflow):
+def _add_workflow_pipeline(
+    organization_workflow, organization_pipeline, workflow_pipeline_uuid, sources
+):
+    """Add an OrganizationWorkflowPipeline, and its node in the workflow graph."""
     ow_pipeline = OrganizationWorkflowPipeline(
         organization_workflow_uuid=organization_workflow.uuid,
         organization_pipeline_id=organization_pipeline.id,
-        workflow_pipeline_uuid=WORKFLOW_PIPELINE_UUID,
+        workflow_pipeline_uuid=workflow_pipeline_uuid,
     )
     db.session.add(ow_pipeline)
+    db.session.flush()
+    organization_workflow.graph = (
+        WorkflowGraph.from_json(organization_workflow.graph)
+        .with_pipeline(ow_pipeline.uuid, workflow_pipeline_uuid, sources, [])
+        .to_json()
+    )
     db.session.commit()
 
     return ow_pipeline
 
 
+@pytest.fixture
+def organization_workflow_pipeline(app, organization_pipeline, organization_workflow):
+    return _add_workflow_pipeline(
+        organization_workflow, organization_pipeline, WORKFLOW_PIPELINE_UUID, []
+    )
+
+
+@pytest.fixture
+def downstream_organization_workflow_pipeline(
+    app, organization_pipeline, organization_workflow, organization_workflow_pipeline
+):
+    """A workflow pipeline that runs after organization_workflow_pipeline."""
+    return _add_workflow_pipeline(
+        organization_workflow,
+        organization_pipeline,
+        WORKFLOW_PIPELINE_RESPONSE_UUID,
+        [organization_workflow_pipeline.uuid],
+    )
+
+
 @pytest.fixture
 def organization_workflow_run(app, organization_pipeline, organization_workflow):
     owr = OrganizationWorkflowRun(
@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import uuid
+
+from botocore.exceptions import ClientError
+
+
+def _client_error(operation, code, status):
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"HTTPStatusCode": status},
+        },
+        operation,
+    )
+
+
+def _etag(data):
+    return hashlib.md5(data).hexdigest()
+
+
+class FakeS3:
+    """An in-memory stand-in for the S3 client of a BlobClient, supporting the
+    object and multipart upload operations it uses (like a local MinIO)."""
+
+    def __init__(self, max_parts=1000):
+        self.max_parts = max_parts
+        self.objects = {}
+        self.uploads = {}
+        self._lock = threading.Lock()
+
+    def generate_presigned_url(self, method, Params, ExpiresIn):
+        return f"http://fake-s3/{Params['Bucket']}/{Params['Key']}?method={method}"
+
+    def put_object(self, Bucket, Key, Body):
+        with self._lock:
+            self.objects[(Bucket, Key)] = Body
+
+    def head_object(self, Bucket, Key):
+        with self._lock:
+            if (Bucket, Key) not in self.objects:
+                raise _client_error("HeadObject", "404", 404)
+            data = self.objects[(Bucket, Key)]
+        return {"ContentLength": len(data), "ETag": f'"{_etag(data)}"'}
+
+    def delete_object(self, Bucket, Key):
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+
+    def _upload(self, operation, Bucket, Key, UploadId):
+        upload = self.uploads.get(UploadId)
+        if not upload or upload["key"] != (Bucket, Key):
+            raise _client_error(operation, "NoSuchUpload", 404)
+        return upload
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = {"key": (Bucket, Key), "parts": {}}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, ContentLength):
+        data = Body.read()
+        assert len(data) == ContentLength
+        with self._lock:
+            self._upload("UploadPart", Bucket, Key, UploadId)["parts"][
+                PartNumber
+            ] = data
+        return {"ETag": f'"{_etag(data)}"'}
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0):
+        with self._lock:
+            parts = self._upload("ListParts", Bucket, Key, UploadId)["parts"]
+            part_numbers = sorted(n for n in parts if n > PartNumberMarker)
+            page = part_numbers[: self.max_parts]
+            return {
+                "Parts": [
+                    {
+                        "PartNumber": n,
+                        "Size": len(parts[n]),
+                        "ETag": f'"{_etag(parts[n])}"',
+                    }
+                    for n in page
+                ],
+                "IsTruncated": len(part_numbers) > len(page),
+                "NextPartNumberMarker": page[-1] if page else PartNumberMarker,
+            }
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        with self._lock:
+            parts = self._upload("CompleteMultipartUpload", Bucket, Key, UploadId)[
+                "parts"
+            ]
+            data = b""
+            for part in MultipartUpload["Parts"]:
+                if _etag(parts.get(part["PartNumber"], b"")) != part["ETag"]:
+                    raise _client_error("CompleteMultipartUpload", "InvalidPart", 400)
+                data += parts[part["PartNumber"]]
+            del self.uploads[UploadId]
+            self.objects[(Bucket, Key)] = data
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        with self._lock:
+            self._upload("AbortMultipartUpload", Bucket, Key, UploadId)
+            del self.uploads[UploadId]
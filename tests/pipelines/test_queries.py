@@ -1,15 +1,29 @@
+import uuid
+from datetime import datetime, timedelta
+
 from ..conftest import ORGANIZATION_UUID, PIPELINE_UUID
 from app.pipelines.queries import (
+    estimate_organization_pipeline_run_count,
     find_organization_pipeline,
+    find_organization_pipeline_and_run,
     find_organization_pipeline_by_id,
     find_organization_pipelines,
+    find_organization_pipelines_and_runs_by_pipeline_run_uuids,
     find_organization_pipeline_input_files,
     find_organization_pipeline_run,
     find_latest_organization_pipeline_run,
+    find_latest_organization_pipeline_runs,
+    find_organization_pipeline_run_input_files,
+    find_organization_pipeline_runs_page,
+    find_unfinished_organization_pipeline_runs,
     search_organization_pipeline_input_files,
     search_organization_pipeline_runs,
 )
-from app.pipelines.models import db
+from app.pipelines.models import (
+    OrganizationPipeline,
+    OrganizationPipelineRun,
+    db,
+)
 
 
 def test_find_organization_pipelines(app, organization_pipeline):
@@ -89,6 +103,57 @@ def test_find_organization_pipeline_run(
     )
 
 
+def test_find_organization_pipeline_and_run(
+    app, organization_pipeline, organization_pipeline_run
+):
+    assert find_organization_pipeline_and_run(
+        ORGANIZATION_UUID, organization_pipeline.uuid, organization_pipeline_run.uuid
+    ) == (organization_pipeline, organization_pipeline_run)
+
+    # runs of other organizations and pipelines are not returned
+    assert (
+        find_organization_pipeline_and_run(
+            uuid.uuid4().hex,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+        is None
+    )
+    assert (
+        find_organization_pipeline_and_run(
+            ORGANIZATION_UUID, uuid.uuid4().hex, organization_pipeline_run.uuid
+        )
+        is None
+    )
+
+    # deleted pipeline runs are not returned
+    organization_pipeline_run.is_deleted = True
+    db.session.commit()
+
+    assert (
+        find_organization_pipeline_and_run(
+            ORGANIZATION_UUID,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+        is None
+    )
+
+    # nor are the runs of deleted pipelines
+    organization_pipeline_run.is_deleted = False
+    organization_pipeline.is_deleted = True
+    db.session.commit()
+
+    assert (
+        find_organization_pipeline_and_run(
+            ORGANIZATION_UUID,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+        is None
+    )
+
+
 def test_find_latest_organization_pipeline_run(
     app, organization_pipeline, organization_pipeline_run
 ):
@@ -100,6 +165,91 @@ def test_find_latest_organization_pipeline_run(
     assert pipeline_run == organization_pipeline_run
 
 
+def test_find_organization_pipeline_run_input_files(
+    app, organization_pipeline_run, organization_pipeline_input_file
+):
+    assert find_organization_pipeline_run_input_files(
+        [organization_pipeline_run.id]
+    ) == [organization_pipeline_input_file]
+    assert find_organization_pipeline_run_input_files([]) == []
+
+
+def test_find_organization_pipelines_and_runs_by_pipeline_run_uuids(
+    app, organization_pipeline, organization_pipeline_run
+):
+    assert find_organization_pipelines_and_runs_by_pipeline_run_uuids(
+        [organization_pipeline_run.pipeline_run_uuid, uuid.uuid4().hex]
+    ) == [(organization_pipeline, organization_pipeline_run)]
+    assert find_organization_pipelines_and_runs_by_pipeline_run_uuids([]) == []
+
+
+def _create_run(organization_pipeline, created_at):
+    opr = OrganizationPipelineRun(
+        organization_pipeline_id=organization_pipeline.id,
+        pipeline_run_uuid=uuid.uuid4().hex,
+        status_update_token=uuid.uuid4().hex,
+        status_update_token_expires_at=datetime.now() + timedelta(days=7),
+        share_token=uuid.uuid4().hex,
+        created_at=created_at,
+    )
+    db.session.add(opr)
+    db.session.commit()
+
+    return opr
+
+
+def test_find_latest_organization_pipeline_runs(app, organization_pipeline):
+    other_pipeline = OrganizationPipeline(
+        organization_uuid=ORGANIZATION_UUID, pipeline_uuid=PIPELINE_UUID
+    )
+    empty_pipeline = OrganizationPipeline(
+        organization_uuid=ORGANIZATION_UUID, pipeline_uuid=PIPELINE_UUID
+    )
+    db.session.add_all([other_pipeline, empty_pipeline])
+    db.session.commit()
+
+    now = datetime.now()
+    _create_run(organization_pipeline, now - timedelta(days=2))
+    latest = _create_run(organization_pipeline, now - timedelta(days=1))
+    deleted = _create_run(organization_pipeline, now)
+    deleted.is_deleted = True
+    other_latest = _create_run(other_pipeline, now - timedelta(days=3))
+    db.session.commit()
+
+    assert set(
+        find_latest_organization_pipeline_runs(
+            [organization_pipeline.id, other_pipeline.id, empty_pipeline.id]
+        )
+    ) == {latest, other_latest}
+
+
+def test_find_organization_pipeline_runs_page(app, organization_pipeline):
+    now = datetime.now()
+    oldest = _create_run(organization_pipeline, now - timedelta(days=2))
+    # runs created at the same time are ordered by id.
+    middle = _create_run(organization_pipeline, now)
+    newest = _create_run(organization_pipeline, now)
+    deleted = _create_run(organization_pipeline, now)
+    deleted.is_deleted = True
+    db.session.commit()
+
+    first_page = find_organization_pipeline_runs_page(organization_pipeline.id, 2)
+    assert first_page == [newest, middle]
+
+    last = first_page[-1]
+    assert find_organization_pipeline_runs_page(
+        organization_pipeline.id, 2, (last.created_at, last.id)
+    ) == [oldest]
+
+
+def test_estimate_organization_pipeline_run_count(app, organization_pipeline):
+    assert estimate_organization_pipeline_run_count(organization_pipeline.id) == 0
+
+    _create_run(organization_pipeline, datetime.now())
+    _create_run(organization_pipeline, datetime.now())
+    assert estimate_organization_pipeline_run_count(organization_pipeline.id) == 2
+
+
 def test_search_organization_pipeline_runs(
     app, organization_pipeline, organization_pipeline_run
 ):
@@ -109,3 +259,36 @@ def test_search_organization_pipeline_runs(
     )
 
     assert pipeline_run == [organization_pipeline_run]
+
+
+def test_find_unfinished_organization_pipeline_runs(
+    app, organization_pipeline, organization_pipeline_run
+):
+    runs = [
+        OrganizationPipelineRun(
+            organization_pipeline_id=organization_pipeline.id,
+            pipeline_run_uuid=uuid.uuid4().hex,
+            status_update_token=uuid.uuid4().hex,
+            status_update_token_expires_at=datetime.now() + timedelta(days=7),
+            share_token=uuid.uuid4().hex,
+            state=state,
+        )
+        for state in ("RUNNING", "COMPLETED", "FAILED", "QUEUED")
+    ]
+    db.session.add_all(runs)
+    db.session.commit()
+
+    assert find_unfinished_organization_pipeline_runs(10) == [
+        (organization_pipeline, organization_pipeline_run),
+        (organization_pipeline, runs[0]),
+        (organization_pipeline, runs[3]),
+    ]
+    assert find_unfinished_organization_pipeline_runs(1, runs[0].id) == [
+        (organization_pipeline, runs[3])
+    ]
+
+    # deleted runs are not included
+    runs[3].is_deleted = True
+    db.session.commit()
+
+    assert find_unfinished_organization_pipeline_runs(10, runs[0].id) == []
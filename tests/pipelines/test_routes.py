@@ -2,7 +2,11 @@ import io
 from unittest.mock import patch
 
 import responses
-from app.constants import WORKFLOW_HOSTNAME, AUTH_HOSTNAME
+from app.constants import (
+    AUTH_HOSTNAME,
+    CONSOLE_STREAM_MAX_DURATION,
+    WORKFLOW_HOSTNAME,
+)
 from app.pipelines.models import (
     ArtifactChart,
     OrganizationPipeline,
@@ -108,7 +112,7 @@ def test_pipelines_bad_search(app, client, client_application):
     assert result.json == json_response
 
 
-@patch("app.pipelines.services.fetch_pipeline_run")
+@patch("app.pipelines.services.fetch_pipeline_run_batch")
 @responses.activate
 def test_pipelines(
     mock_runs,
@@ -118,7 +122,7 @@ def test_pipelines(
     organization_pipeline,
     organization_pipeline_run,
 ):
-    mock_runs.return_value = PIPELINE_RUN_RESPONSE_JSON
+    mock_runs.return_value = [PIPELINE_RUN_RESPONSE_JSON]
     pipeline_json = dict(PIPELINE_JSON)
     pipeline_json.update(
         {
@@ -554,6 +558,101 @@ def test_upload_input_file(
     assert len(organization_pipeline.organization_pipeline_input_files) == 1
 
 
+@responses.activate
+def test_create_input_file_upload(
+    app, client, client_application, organization_pipeline
+):
+    path = f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{organization_pipeline.uuid}/input_files/uploads"
+    headers = {
+        "Authorization": f"Bearer {JWT_TOKEN}",
+        ROLES_KEY: client_application.api_key,
+    }
+
+    result = client.post(
+        f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{'0' * 32}/input_files/uploads",
+        json={"name": "a.csv", "size": 10},
+        headers=headers,
+    )
+    assert result.status_code == 400
+
+    result = client.post(path, json={"name": "a.csv"}, headers=headers)
+    assert result.status_code == 400
+    assert result.json["errors"] == {"size": ["Missing data for required field."]}
+
+    result = client.post(path, json={"name": "a.csv", "size": 10}, headers=headers)
+    assert result.status_code == 200
+    assert result.json["name"] == "a.csv"
+    assert result.json["url"]
+
+
+@responses.activate
+def test_upload_input_file_chunk(
+    app, client, client_application, fake_s3, organization_pipeline
+):
+    path = f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{organization_pipeline.uuid}/input_files"
+    headers = {
+        "Authorization": f"Bearer {JWT_TOKEN}",
+        ROLES_KEY: client_application.api_key,
+    }
+    input_file_uuid = client.post(
+        f"{path}/uploads",
+        json={"name": "a.csv", "size": 6, "chunked": True},
+        headers=headers,
+    ).json["uuid"]
+
+    result = client.put(
+        f"{path}/{input_file_uuid}/chunks/2",
+        data=b"ef",
+        headers=dict(headers, **{"Content-Range": "bytes 4-5/6"}),
+    )
+    assert result.status_code == 200
+    assert result.json["part_number"] == 2
+
+    result = client.put(
+        f"{path}/{input_file_uuid}/chunks/1?offset=2", data=b"abcd", headers=headers
+    )
+    assert result.status_code == 400
+
+    result = client.get(f"{path}/{input_file_uuid}/upload", headers=headers)
+    assert result.status_code == 200
+    assert result.json["missing"] == [1]
+
+    result = client.put(
+        f"{path}/{input_file_uuid}/chunks/1?offset=0", data=b"abcd", headers=headers
+    )
+    assert result.status_code == 200
+
+    result = client.post(f"{path}/{input_file_uuid}/complete", json={}, headers=headers)
+    assert result.status_code == 200
+    assert list(fake_s3.objects.values()) == [b"abcdef"]
+
+
+@patch("app.pipelines.routes.complete_pipeline_input_file_upload")
+@responses.activate
+def test_complete_input_file_upload(
+    mock_complete, app, client, client_application, organization_pipeline
+):
+    path = f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{organization_pipeline.uuid}/input_files/{'1' * 32}/complete"
+    headers = {
+        "Authorization": f"Bearer {JWT_TOKEN}",
+        ROLES_KEY: client_application.api_key,
+    }
+    mock_complete.return_value = {"uuid": "1" * 32, "name": "a.csv"}
+
+    result = client.post(path, json={"etag": "abc"}, headers=headers)
+    assert result.status_code == 200
+    assert result.json == {"uuid": "1" * 32, "name": "a.csv"}
+    assert mock_complete.call_args[0][1:] == ("1" * 32, {"etag": "abc"})
+
+    mock_complete.side_effect = ValueError({"message": "uploaded file does not match"})
+    result = client.post(path, json={"etag": "abc"}, headers=headers)
+    assert result.status_code == 400
+
+    mock_complete.side_effect = HTTPError("unavailable")
+    result = client.post(path, json={"etag": "abc"}, headers=headers)
+    assert result.status_code == 503
+
+
 @patch("app.pipelines.services.create_url")
 @responses.activate
 def test_create_pipeline_run(
@@ -696,6 +795,117 @@ def test_list_pipeline_runs(
     assert result.json == json_response
 
 
+@patch("app.pipelines.routes.fetch_pipeline_runs_page")
+@responses.activate
+def test_list_pipeline_runs_page(
+    mock_fetch, app, client, client_application, organization_pipeline
+):
+    mock_fetch.return_value = ([PIPELINE_RUN_RESPONSE_JSON], "nextcursor", 10)
+
+    result = client.get(
+        f"/v1/organizations/{organization_pipeline.organization_uuid}/pipelines/{organization_pipeline.uuid}/runs?limit=1&cursor=somecursor&total=true",
+        content_type="application/json",
+        headers={
+            "Authorization": f"Bearer {JWT_TOKEN}",
+            ROLES_KEY: client_application.api_key,
+        },
+    )
+
+    assert result.status_code == 200
+    assert result.json == [PIPELINE_RUN_RESPONSE_JSON]
+    assert result.headers["X-Next-Cursor"] == "nextcursor"
+    assert result.headers["X-Total-Count"] == "10"
+    mock_fetch.assert_called_once_with(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        1,
+        "somecursor",
+        True,
+        False,
+    )
+
+
+@patch("app.pipelines.routes.fetch_pipeline_runs_page")
+@responses.activate
+def test_list_pipeline_runs_summary(
+    mock_fetch, app, client, client_application, organization_pipeline
+):
+    mock_fetch.return_value = ([{"uuid": PIPELINE_RUN_UUID}], None, None)
+
+    result = client.get(
+        f"/v1/organizations/{organization_pipeline.organization_uuid}/pipelines/{organization_pipeline.uuid}/runs?summary=true",
+        content_type="application/json",
+        headers={
+            "Authorization": f"Bearer {JWT_TOKEN}",
+            ROLES_KEY: client_application.api_key,
+        },
+    )
+
+    assert result.status_code == 200
+    assert result.json == [{"uuid": PIPELINE_RUN_UUID}]
+    assert "X-Next-Cursor" not in result.headers
+    # summaries are always paged.
+    mock_fetch.assert_called_once_with(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        100,
+        None,
+        False,
+        True,
+    )
+
+
+@responses.activate
+def test_list_pipeline_runs_page_bad_limit(
+    app, client, client_application, organization_pipeline
+):
+    for limit in ("none", "0", "501"):
+        result = client.get(
+            f"/v1/organizations/{organization_pipeline.organization_uuid}/pipelines/{organization_pipeline.uuid}/runs?limit={limit}",
+            content_type="application/json",
+            headers={
+                "Authorization": f"Bearer {JWT_TOKEN}",
+                ROLES_KEY: client_application.api_key,
+            },
+        )
+
+        assert result.status_code == 400
+
+
+@responses.activate
+def test_list_pipeline_runs_page_no_pipeline(
+    app, client, client_application, organization_pipeline
+):
+    result = client.get(
+        f"/v1/organizations/{organization_pipeline.organization_uuid}/pipelines/{'0' * 32}/runs?limit=5",
+        content_type="application/json",
+        headers={
+            "Authorization": f"Bearer {JWT_TOKEN}",
+            ROLES_KEY: client_application.api_key,
+        },
+    )
+
+    assert result.status_code == 400
+    assert result.json == {"message": "organization_pipeline_uuid not found"}
+
+
+@responses.activate
+def test_list_pipeline_runs_no_pipeline(
+    app, client, client_application, organization_pipeline
+):
+    result = client.get(
+        f"/v1/organizations/{organization_pipeline.organization_uuid}/pipelines/{'0' * 32}/runs",
+        content_type="application/json",
+        headers={
+            "Authorization": f"Bearer {JWT_TOKEN}",
+            ROLES_KEY: client_application.api_key,
+        },
+    )
+
+    assert result.status_code == 400
+    assert result.json == {"message": "organization_pipeline_uuid not found"}
+
+
 @patch("app.pipelines.routes.fetch_pipeline_runs")
 @patch("flask.jsonify")
 @responses.activate
@@ -876,6 +1086,57 @@ def test_delete_pipeline_run_bad_response(
     assert result.json == {"message": "error"}
 
 
+def test_update_pipeline_run_status(
+    app, client, organization_pipeline, organization_pipeline_run
+):
+    path = f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{organization_pipeline.uuid}/runs/{organization_pipeline_run.uuid}/status"
+
+    result = client.post(
+        path,
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+        headers={"Authorization": "Bearer not-the-token"},
+    )
+    assert result.status_code == 401
+    result = client.post(
+        path,
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+        headers={"Authorization": "Bearer t\u00f6ken"},
+    )
+    assert result.status_code == 401
+    assert organization_pipeline_run.status_snapshot is None
+
+    result = client.post(
+        path,
+        json={"artifacts": []},
+        headers={
+            "Authorization": f"Bearer {organization_pipeline_run.status_update_token}"
+        },
+    )
+    assert result.status_code == 400
+    assert result.json["errors"] == {"states": ["Missing data for required field."]}
+
+    result = client.post(
+        f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{organization_pipeline.uuid}/runs/{PIPELINE_UUID}/status",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+        headers={
+            "Authorization": f"Bearer {organization_pipeline_run.status_update_token}"
+        },
+    )
+    assert result.status_code == 400
+
+    result = client.post(
+        path,
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+        headers={
+            "Authorization": f"Bearer {organization_pipeline_run.status_update_token}"
+        },
+    )
+    assert result.status_code == 200
+    assert (
+        organization_pipeline_run.status_snapshot == FINISHED_PIPELINE_RUN_RESPONSE_JSON
+    )
+
+
 @patch("app.pipelines.routes.fetch_pipeline_run")
 @patch("flask.jsonify")
 @responses.activate
@@ -1089,6 +1350,137 @@ def test_pipeline_run_console(
     assert result.json == json_response
 
 
+def _get_console_output(client, client_application, pipeline_run, path, headers={}):
+    pipeline = pipeline_run.organization_pipeline
+    return client.get(
+        f"/v1/organizations/{pipeline.organization_uuid}/pipelines/{pipeline.uuid}/runs/{pipeline_run.uuid}/console/{path}",
+        headers=dict(
+            headers,
+            Authorization=f"Bearer {JWT_TOKEN}",
+            **{ROLES_KEY: client_application.api_key},
+        ),
+    )
+
+
+@patch("app.pipelines.routes.fetch_pipeline_run_console_output")
+@responses.activate
+def test_pipeline_run_console_output(
+    mock_output, app, client, client_application, organization_pipeline_run
+):
+    mock_output.return_value = (b"lo world", 10, False)
+
+    result = _get_console_output(
+        client, client_application, organization_pipeline_run, "std_out?offset=2"
+    )
+
+    assert result.status_code == 200
+    assert result.data == b"lo world"
+    assert result.headers["X-Next-Offset"] == "10"
+    assert result.headers["X-Run-Finished"] == "false"
+    assert mock_output.call_args[0][3:] == ("std_out", 2)
+
+
+@patch("app.pipelines.routes.fetch_pipeline_run_console_output")
+@responses.activate
+def test_pipeline_run_console_output_range(
+    mock_output, app, client, client_application, organization_pipeline_run
+):
+    mock_output.return_value = (b"lo world", 10, True)
+
+    result = _get_console_output(
+        client,
+        client_application,
+        organization_pipeline_run,
+        "std_err",
+        {"Range": "bytes=2-4"},
+    )
+
+    assert result.status_code == 206
+    assert result.data == b"lo "
+    assert result.headers["Content-Range"] == "bytes 2-4/10"
+    assert result.headers["X-Next-Offset"] == "5"
+    assert mock_output.call_args[0][3:] == ("std_err", 2)
+
+    mock_output.return_value = (b"", 10, True)
+    result = _get_console_output(
+        client,
+        client_application,
+        organization_pipeline_run,
+        "std_err",
+        {"Range": "bytes=10-"},
+    )
+
+    assert result.status_code == 416
+    assert result.headers["Content-Range"] == "bytes */10"
+
+
+@responses.activate
+def test_pipeline_run_console_output_bad_request(
+    app, client, client_application, organization_pipeline_run
+):
+    for path in ("std_in", "std_out?offset=a", "std_out?offset=-1"):
+        result = _get_console_output(
+            client, client_application, organization_pipeline_run, path
+        )
+        assert result.status_code == 400, path
+
+    result = client.get(
+        f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{'0' * 32}/runs/{'0' * 32}/console/std_out",
+        headers={
+            "Authorization": f"Bearer {JWT_TOKEN}",
+            ROLES_KEY: client_application.api_key,
+        },
+    )
+    assert result.status_code == 400
+
+
+@patch("app.pipelines.routes.stream_pipeline_run_console_output")
+@responses.activate
+def test_pipeline_run_console_output_events(
+    mock_stream, app, client, client_application, organization_pipeline_run
+):
+    mock_stream.return_value = iter(
+        [(4, "one\n", False), (4, "", False), (8, "two\n", True)]
+    )
+
+    result = _get_console_output(
+        client,
+        client_application,
+        organization_pipeline_run,
+        "std_out",
+        {"Accept": "text/event-stream", "Last-Event-ID": "0"},
+    )
+
+    assert result.status_code == 200
+    assert result.mimetype == "text/event-stream"
+    assert result.get_data(as_text=True) == (
+        'id: 4\ndata: "one\\n"\n\n'
+        ": waiting\n\n"
+        'id: 8\ndata: "two\\n"\n\n'
+        "event: finished\ndata: {}\n\n"
+    )
+
+
+@patch("app.pipelines.routes.stream_pipeline_run_console_output")
+@responses.activate
+def test_pipeline_run_console_output_events_unfinished(
+    mock_stream, app, client, client_application, organization_pipeline_run
+):
+    mock_stream.return_value = iter([(4, "one\n", False)])
+
+    result = _get_console_output(
+        client,
+        client_application,
+        organization_pipeline_run,
+        "std_out",
+        {"Accept": "text/event-stream", "Last-Event-ID": "0"},
+    )
+
+    # the client reconnects to a stream that ends before the run finishes.
+    assert result.get_data(as_text=True) == 'id: 4\ndata: "one\\n"\n\n'
+    assert mock_stream.call_args[0][-1] == app.config[CONSOLE_STREAM_MAX_DURATION]
+
+
 @responses.activate
 def test_create_chart_no_organization_pipeline(
     app, client, client_application, organization_pipeline
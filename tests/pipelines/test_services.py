@@ -1,34 +1,65 @@
+import hashlib
 import io
+import json
+import uuid
+from datetime import datetime, timedelta
 from unittest.mock import patch
+from urllib.parse import quote
 
 import pytest
 import responses
-from app.constants import WORKFLOW_API_TOKEN, WORKFLOW_HOSTNAME
+from botocore.stub import Stubber
+from app.constants import (
+    BLOB_CLIENT,
+    PIPELINE_RUN_CACHE,
+    PIPELINE_RUN_CACHE_ACTIVE_TTL,
+    PRESIGNED_URL_CACHE,
+    WORKFLOW_HOSTNAME,
+)
+from app.cache import TTLCache
+from app.pipelines.queries import search_organization_pipeline_input_files
 from app.pipelines.models import (
+    InputFileContent,
     OrganizationPipeline,
+    OrganizationPipelineInputFile,
     OrganizationPipelineRun,
     ArtifactChart,
     db,
 )
 from app.pipelines.services import (
+    abort_expired_pipeline_input_file_uploads,
+    _update_pipeline_runs,
+    backfill_pipeline_run_status,
+    complete_pipeline_input_file_upload,
     create_artifact_chart,
     create_pipeline,
     create_pipeline_input_file,
+    create_pipeline_input_file_upload,
     create_pipeline_run,
     delete_artifact_chart,
     delete_pipeline,
+    delete_pipeline_run,
+    delete_unreferenced_input_file_contents,
     fetch_artifact_charts,
     fetch_pipeline,
+    fetch_pipeline_input_file_upload,
     fetch_pipeline_run,
+    fetch_pipeline_run_batch,
     fetch_pipeline_run_console,
+    fetch_pipeline_run_console_output,
+    fetch_pipeline_run_summaries,
     fetch_pipeline_runs,
+    fetch_pipeline_runs_page,
     fetch_pipelines,
+    stream_pipeline_run_console_output,
     update_artifact_chart,
     update_pipeline,
+    update_pipeline_run_status,
+    upload_pipeline_input_file_chunk,
 )
-from application_roles.decorators import ROLES_KEY
 from requests import HTTPError
 from marshmallow.exceptions import ValidationError
+from sqlalchemy import event
 
 from ..conftest import (
     ORGANIZATION_UUID,
@@ -36,6 +67,7 @@ from ..conftest import (
     PIPELINE_RUN_UUID,
     PIPELINE_UUID,
 )
+from ..test_cache import DictBackend
 
 PIPELINE_RUN_JSON = {
     "inputs": [PIPELINE_RUN_INPUT_FILE_UUID],
@@ -64,16 +96,10 @@ FINISHED_PIPELINE_RUN_RESPONSE_JSON["artifacts"] = [
         "uuid": "81695d86c7a14156aa911ee513ed68a7",
     }
 ]
-FINISHED_PIPELINE_RUN_RESPONSE_JSON["states"].append(
-    [
-        {"created_at": "2020-10-28T22:02:48.955688", "state": "RUNNING"},
-    ]
-)
-FINISHED_PIPELINE_RUN_RESPONSE_JSON["states"].append(
-    [
-        {"created_at": "2020-10-28T22:03:48.955688", "state": "COMPLETED"},
-    ]
-)
+FINISHED_PIPELINE_RUN_RESPONSE_JSON["states"] = PIPELINE_RUN_RESPONSE_JSON["states"] + [
+    {"created_at": "2020-10-28T22:02:48.955688", "state": "RUNNING"},
+    {"created_at": "2020-10-28T22:03:48.955688", "state": "COMPLETED"},
+]
 PIPELINE_RUN_CONSOLE_RESPONSE_JSON = {
     "std_out": "success messages",
     "std_err": "the error output...",
@@ -153,12 +179,12 @@ def test_fetch_pipelines_bad_workflow_response(app, organization_pipeline):
         fetch_pipelines(ORGANIZATION_UUID)
 
 
-@patch("app.pipelines.services.fetch_pipeline_run")
-@patch("app.pipelines.services.requests.post")
+@patch("app.pipelines.services.fetch_pipeline_run_batch")
+@patch("app.workflow_client.WorkflowClient.post")
 def test_fetch_pipelines_bad_workflow_json(
     post_mock, mock_runs, app, organization_pipeline
 ):
-    mock_runs.return_value = None
+    mock_runs.return_value = []
     pipeline_list = [
         {"uuid": organization_pipeline.pipeline_uuid, "name": "name 1"},
         {"uuid": "12345", "name": "name 2"},
@@ -169,10 +195,10 @@ def test_fetch_pipelines_bad_workflow_json(
         fetch_pipelines(ORGANIZATION_UUID)
 
 
-@patch("app.pipelines.services.fetch_pipeline_run")
-@patch("app.pipelines.services.requests.post")
+@patch("app.pipelines.services.fetch_pipeline_run_batch")
+@patch("app.workflow_client.WorkflowClient.post")
 def test_fetch_pipelines_no_runs(post_mock, mock_runs, app, organization_pipeline):
-    mock_runs.return_value = None
+    mock_runs.return_value = []
     pipeline_list = [
         {"uuid": organization_pipeline.pipeline_uuid, "name": "name 1"},
     ]
@@ -188,13 +214,12 @@ def test_fetch_pipelines_no_runs(post_mock, mock_runs, app, organization_pipelin
     assert fetch_pipelines(ORGANIZATION_UUID) == expected_result
     post_mock.assert_called()
     get_call = post_mock.call_args
-    assert get_call[0][0].startswith(app.config[WORKFLOW_HOSTNAME])
-    assert get_call[1]["headers"][ROLES_KEY] == app.config[WORKFLOW_API_TOKEN]
+    assert get_call[0][0] == "/v1/pipelines/search"
     assert get_call[1]["json"] == {"uuids": [organization_pipeline.pipeline_uuid]}
 
     post_mock().raise_for_status.assert_called()
     post_mock().json.assert_called()
-    assert not mock_runs.called
+    mock_runs.assert_called_once_with([])
 
 
 def test_fetch_pipeline_no_org_run(app):
@@ -220,13 +245,13 @@ def test_fetch_pipeline(app, organization_pipeline, organization_pipeline_run):
     )
 
 
-@patch("app.pipelines.services.fetch_pipeline_run")
-@patch("app.pipelines.services.requests.post")
+@patch("app.pipelines.services.fetch_pipeline_run_batch")
+@patch("app.workflow_client.WorkflowClient.post")
 @responses.activate
 def test_fetch_pipelines(
     post_mock, mock_runs, app, organization_pipeline, organization_pipeline_run
 ):
-    mock_runs.return_value = PIPELINE_RUN_RESPONSE_JSON
+    mock_runs.return_value = [PIPELINE_RUN_RESPONSE_JSON]
     pipeline_list = [
         {
             "uuid": organization_pipeline.pipeline_uuid,
@@ -251,13 +276,102 @@ def test_fetch_pipelines(
     assert fetch_pipelines(ORGANIZATION_UUID) == expected_result
     post_mock.assert_called()
     get_call = post_mock.call_args
-    assert get_call[0][0].startswith(app.config[WORKFLOW_HOSTNAME])
-    assert get_call[1]["headers"][ROLES_KEY] == app.config[WORKFLOW_API_TOKEN]
+    assert get_call[0][0] == "/v1/pipelines/search"
     assert get_call[1]["json"] == {"uuids": [organization_pipeline.pipeline_uuid]}
 
     post_mock().raise_for_status.assert_called()
     post_mock().json.assert_called()
-    mock_runs.assert_called()
+    mock_runs.assert_called_once_with(
+        [(organization_pipeline, organization_pipeline_run)]
+    )
+
+
+@patch("app.pipelines.services.fetch_pipeline_run_batch")
+@patch("app.workflow_client.WorkflowClient.post")
+@responses.activate
+def test_fetch_pipelines_summary(
+    post_mock, mock_runs, app, organization_pipeline, organization_pipeline_run
+):
+    post_mock().json.return_value = [
+        {"uuid": organization_pipeline.pipeline_uuid, "name": "name 1"}
+    ]
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+    expected = [
+        {
+            "uuid": organization_pipeline.uuid,
+            "name": "name 1",
+            "last_pipeline_run": {
+                "uuid": organization_pipeline_run.uuid,
+                "state": "COMPLETED",
+                "created_at": organization_pipeline_run.created_at.isoformat(),
+                "started_at": "2020-10-28T22:02:48.955688",
+                "completed_at": "2020-10-28T22:03:48.955688",
+                "duration": 60.0,
+                "artifact_count": 1,
+            },
+        }
+    ]
+
+    # the unfinished run is refreshed from the workflow service...
+    assert fetch_pipelines(ORGANIZATION_UUID, summary=True) == expected
+    assert organization_pipeline_run.state == "COMPLETED"
+
+    # ...and is summarized from its status columns once it has finished.
+    app.extensions[PIPELINE_RUN_CACHE].clear()
+    post_mock().json.return_value = [
+        {"uuid": organization_pipeline.pipeline_uuid, "name": "name 1"}
+    ]
+    assert fetch_pipelines(ORGANIZATION_UUID, summary=True) == expected
+    assert len(responses.calls) == 1
+    mock_runs.assert_not_called()
+
+
+@patch("app.pipelines.services._get_pipeline_runs")
+def test_fetch_pipeline_runs_page_summary_unfinished(
+    mock_runs, app, organization_pipeline
+):
+    runs = _create_runs(organization_pipeline, 3)
+    runs[1].state = "COMPLETED"
+    runs[2].state = "RUNNING"
+    db.session.commit()
+
+    (pipeline_runs, _, _) = fetch_pipeline_runs_page(
+        ORGANIZATION_UUID, organization_pipeline.uuid, 10, summary=True
+    )
+
+    assert len(pipeline_runs) == 3
+    # only the unfinished runs are refreshed, in a single batch.
+    mock_runs.assert_called_once()
+    (refreshed,) = mock_runs.call_args[0]
+    assert sorted(opr.uuid for _, opr in refreshed) == sorted(
+        [runs[0].uuid, runs[2].uuid]
+    )
+
+
+@patch("app.pipelines.services.db.session.commit")
+@responses.activate
+def test_fetch_pipeline_run_commits_changed_status(
+    commit_mock, app, organization_pipeline, organization_pipeline_run
+):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=dict(FINISHED_PIPELINE_RUN_RESPONSE_JSON, inputs=[]),
+    )
+
+    for _ in range(2):
+        fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+
+    # only the first fetch changes the run status.
+    commit_mock.assert_called_once()
 
 
 @responses.activate
@@ -352,13 +466,328 @@ def test_create_pipeline_input_file_validate(
 
 @patch("app.pipelines.services.upload_stream")
 def test_create_pipeline_input_file(upload_stream_mock, app, organization_pipeline):
-    data = io.StringIO("some data")
+    data = io.BytesIO(b"some data")
     input_file = create_pipeline_input_file(organization_pipeline, "aname.txt", data)
     assert input_file.name == "aname.txt"
     assert upload_stream_mock.called
     assert set(organization_pipeline.organization_pipeline_input_files) == {input_file}
 
 
+@patch("app.pipelines.services.upload_stream")
+def test_create_pipeline_input_file_deduplicates(
+    upload_stream_mock, app, organization_pipeline
+):
+    sha256 = hashlib.sha256(b"some data").hexdigest()
+    input_files = [
+        create_pipeline_input_file(organization_pipeline, name, io.BytesIO(data))
+        for (name, data) in (
+            ("a.csv", b"some data"),
+            ("b.csv", b"some data"),
+            ("c.csv", b"other data"),
+        )
+    ]
+
+    assert [f.content_sha256 for f in input_files[:2]] == [sha256, sha256]
+    assert input_files[0].size == 9
+    assert [call[0][0] for call in upload_stream_mock.call_args_list] == [
+        f"content/{sha256}",
+        f"content/{input_files[2].content_sha256}",
+    ]
+    content = InputFileContent.query.filter_by(sha256=sha256).one()
+    assert content.reference_count == 2
+    assert input_files[1].blob_key == f"content/{sha256}"
+
+
+@patch("app.pipelines.services.upload_stream")
+def test_create_pipeline_input_file_upload_outside_transaction(
+    upload_stream_mock, app, organization_pipeline
+):
+    transactions = []
+    event.listen(db.engine, "begin", lambda conn: transactions.append("begin"))
+    event.listen(db.engine, "commit", lambda conn: transactions.append("commit"))
+    upload_stream_mock.side_effect = lambda *args: transactions.append("upload")
+
+    input_file = create_pipeline_input_file(
+        organization_pipeline, "a.csv", io.BytesIO(b"some data")
+    )
+
+    # the content is uploaded between transactions, then inserted with the file.
+    assert transactions == ["begin", "commit", "upload", "begin", "commit"]
+    assert InputFileContent.query.one().sha256 == input_file.content_sha256
+
+
+@patch("app.pipelines.services._reference_input_file_content")
+@patch("app.pipelines.services.upload_stream")
+def test_create_pipeline_input_file_concurrent_upload(
+    upload_stream_mock, reference_mock, app, organization_pipeline
+):
+    sha256 = hashlib.sha256(b"some data").hexdigest()
+    db.session.add(InputFileContent(sha256=sha256, size=9, reference_count=1))
+    db.session.commit()
+    db.session.add(
+        OrganizationPipeline(
+            organization_uuid=ORGANIZATION_UUID, pipeline_uuid="a" * 32
+        )
+    )
+
+    # another upload of the same content creates its InputFileContent first.
+    reference_mock.side_effect = [False, True]
+    input_file = create_pipeline_input_file(
+        organization_pipeline, "a.csv", io.BytesIO(b"some data")
+    )
+
+    assert input_file.content_sha256 == sha256
+    assert reference_mock.call_count == 2
+    assert InputFileContent.query.filter_by(sha256=sha256).count() == 1
+    # the rest of the transaction is kept.
+    assert OrganizationPipeline.query.filter_by(pipeline_uuid="a" * 32).count() == 1
+
+
+@patch("app.pipelines.services.upload_stream")
+@responses.activate
+def test_delete_unreferenced_input_file_contents(
+    upload_stream_mock, app, fake_s3, organization_pipeline
+):
+    create_pipeline_input_file(organization_pipeline, "a.csv", io.BytesIO(b"data"))
+    responses.add(
+        responses.DELETE,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}",
+    )
+    delete_pipeline(organization_pipeline.organization_uuid, organization_pipeline.uuid)
+
+    content = InputFileContent.query.one()
+    assert content.reference_count == 0
+    # recently released content is kept, in case it is uploaded again.
+    assert delete_unreferenced_input_file_contents() == 0
+
+    # the row is only deleted once its blob is.
+    with patch.object(
+        app.extensions[BLOB_CLIENT], "delete", side_effect=HTTPError("unavailable")
+    ):
+        with pytest.raises(HTTPError):
+            delete_unreferenced_input_file_contents(timedelta(0))
+    db.session.rollback()
+    assert InputFileContent.query.one().sha256 == content.sha256
+
+    fake_s3.objects[("openfido-app-service", f"content/{content.sha256}")] = b"data"
+    assert delete_unreferenced_input_file_contents(timedelta(0)) == 1
+    assert not InputFileContent.query.all()
+    assert not fake_s3.objects
+
+
+def test_abort_expired_pipeline_input_file_uploads(app, fake_s3, organization_pipeline):
+    completed = create_pipeline_input_file_upload(
+        organization_pipeline, {"name": "a.csv", "size": 4}
+    )
+    completed_key = f"{organization_pipeline.uuid}/{completed['uuid']}-a.csv"
+    fake_s3.objects[("openfido-app-service", completed_key)] = b"abcd"
+    complete_pipeline_input_file_upload(organization_pipeline, completed["uuid"], {})
+
+    upload = create_pipeline_input_file_upload(
+        organization_pipeline, {"name": "b.csv", "size": 10, "chunked": True}
+    )
+    upload_pipeline_input_file_chunk(
+        organization_pipeline, upload["uuid"], 1, io.BytesIO(b"abcd")
+    )
+
+    # uploads are kept until their presigned URLs expire.
+    assert abort_expired_pipeline_input_file_uploads() == 0
+
+    # the file is only deleted once its upload is aborted.
+    with patch.object(
+        app.extensions[BLOB_CLIENT],
+        "abort_upload",
+        side_effect=HTTPError("unavailable"),
+    ):
+        with pytest.raises(HTTPError):
+            abort_expired_pipeline_input_file_uploads(timedelta(0))
+    db.session.rollback()
+    assert fake_s3.uploads
+
+    assert abort_expired_pipeline_input_file_uploads(timedelta(0)) == 1
+    assert not fake_s3.uploads
+    assert [
+        input_file.uuid for input_file in OrganizationPipelineInputFile.query.all()
+    ] == [completed["uuid"]]
+    assert list(fake_s3.objects) == [("openfido-app-service", completed_key)]
+
+
+def test_create_pipeline_input_file_upload(app, organization_pipeline):
+    with pytest.raises(ValidationError):
+        create_pipeline_input_file_upload(organization_pipeline, {"name": "a.csv"})
+
+    upload = create_pipeline_input_file_upload(
+        organization_pipeline, {"name": "a name.csv", "size": 10}
+    )
+
+    assert upload["name"] == "a name.csv"
+    assert upload["method"] == "PUT"
+    assert f"/{organization_pipeline.uuid}/{upload['uuid']}-a%2520name.csv?" in (
+        upload["url"]
+    )
+    input_file = OrganizationPipelineInputFile.query.filter_by(
+        uuid=upload["uuid"]
+    ).one()
+    assert input_file.is_pending
+    assert input_file.size == 10
+    assert (
+        input_file.blob_key
+        == f"{organization_pipeline.uuid}/{upload['uuid']}-a%20name.csv"
+    )
+    # pending files can't be used by a run.
+    assert not search_organization_pipeline_input_files(
+        organization_pipeline.id, [upload["uuid"]]
+    )
+
+
+def test_complete_pipeline_input_file_upload(app, organization_pipeline):
+    upload = create_pipeline_input_file_upload(
+        organization_pipeline, {"name": "a.csv", "size": 10}
+    )
+
+    with pytest.raises(ValueError):
+        complete_pipeline_input_file_upload(organization_pipeline, "0" * 32, {})
+
+    with Stubber(app.extensions[BLOB_CLIENT].s3) as stubber:
+        stubber.add_response("head_object", {"ContentLength": 10, "ETag": '"abc"'})
+        assert complete_pipeline_input_file_upload(
+            organization_pipeline, upload["uuid"], {"etag": '"abc"'}
+        ) == {"uuid": upload["uuid"], "name": "a.csv"}
+
+        # completing again changes nothing.
+        complete_pipeline_input_file_upload(organization_pipeline, upload["uuid"], {})
+
+    assert search_organization_pipeline_input_files(
+        organization_pipeline.id, [upload["uuid"]]
+    )
+
+
+def test_complete_pipeline_input_file_upload_mismatch(app, organization_pipeline):
+    upload = create_pipeline_input_file_upload(
+        organization_pipeline, {"name": "a.csv", "size": 10}
+    )
+
+    with Stubber(app.extensions[BLOB_CLIENT].s3) as stubber:
+        stubber.add_response("head_object", {"ContentLength": 9, "ETag": '"abc"'})
+        stubber.add_response("delete_object", {})
+        with pytest.raises(ValueError):
+            complete_pipeline_input_file_upload(
+                organization_pipeline, upload["uuid"], {}
+            )
+
+    assert not OrganizationPipelineInputFile.query.filter_by(uuid=upload["uuid"]).all()
+
+
+def test_complete_pipeline_input_file_upload_multipart(app, organization_pipeline):
+    size = app.extensions[BLOB_CLIENT].part_size + 1
+    with Stubber(app.extensions[BLOB_CLIENT].s3) as stubber:
+        stubber.add_response("create_multipart_upload", {"UploadId": "upload-id"})
+        upload = create_pipeline_input_file_upload(
+            organization_pipeline, {"name": "a.csv", "size": size}
+        )
+        assert len(upload["parts"]) == 2
+
+        stubber.add_response("list_parts", {"Parts": [], "IsTruncated": False})
+        with pytest.raises(ValueError):
+            complete_pipeline_input_file_upload(
+                organization_pipeline, upload["uuid"], {}
+            )
+
+        stubber.add_client_error(
+            "complete_multipart_upload", "InvalidPart", http_status_code=400
+        )
+        with pytest.raises(ValueError):
+            complete_pipeline_input_file_upload(
+                organization_pipeline,
+                upload["uuid"],
+                {"parts": [{"part_number": 1, "etag": "a"}]},
+            )
+
+        stubber.add_client_error(
+            "complete_multipart_upload", "ServiceUnavailable", http_status_code=503
+        )
+        with pytest.raises(HTTPError):
+            complete_pipeline_input_file_upload(
+                organization_pipeline,
+                upload["uuid"],
+                {"parts": [{"part_number": 1, "etag": "a"}]},
+            )
+
+        stubber.add_response("complete_multipart_upload", {})
+        stubber.add_response("head_object", {"ContentLength": size, "ETag": '"b-2"'})
+        complete_pipeline_input_file_upload(
+            organization_pipeline,
+            upload["uuid"],
+            {
+                "parts": [
+                    {"part_number": 1, "etag": "a"},
+                    {"part_number": 2, "etag": "b"},
+                ]
+            },
+        )
+
+    input_file = OrganizationPipelineInputFile.query.filter_by(
+        uuid=upload["uuid"]
+    ).one()
+    assert not input_file.is_pending
+    assert input_file.upload_id is None
+
+
+def test_upload_pipeline_input_file_chunks(app, fake_s3, organization_pipeline):
+    with pytest.raises(ValueError):
+        create_pipeline_input_file_upload(
+            organization_pipeline, {"name": "a.csv", "size": 0, "chunked": True}
+        )
+
+    upload = create_pipeline_input_file_upload(
+        organization_pipeline, {"name": "a.csv", "size": 10, "chunked": True}
+    )
+    assert (upload["part_size"], upload["chunks"]) == (4, 3)
+
+    def upload_chunk(part_number, data, offset=None):
+        return upload_pipeline_input_file_chunk(
+            organization_pipeline,
+            upload["uuid"],
+            part_number,
+            io.BytesIO(data),
+            offset,
+        )
+
+    # chunks can be uploaded in any order.
+    assert upload_chunk(3, b"ij")["part_number"] == 3
+    upload_chunk(1, b"abcd", 0)
+    for (part_number, data, offset) in (
+        (2, b"efgh", 0),
+        (2, b"efg", None),
+        (2, b"efghi", None),
+        (4, b"", None),
+    ):
+        with pytest.raises(ValueError):
+            upload_chunk(part_number, data, offset)
+
+    status = fetch_pipeline_input_file_upload(organization_pipeline, upload["uuid"])
+    assert [chunk["part_number"] for chunk in status["chunks"]] == [1, 3]
+    assert status["missing"] == [2]
+    with pytest.raises(ValueError):
+        complete_pipeline_input_file_upload(organization_pipeline, upload["uuid"], {})
+
+    upload_chunk(2, b"xxxx", 4)
+    # a chunk can be uploaded again.
+    upload_chunk(2, b"efgh", 4)
+
+    status = fetch_pipeline_input_file_upload(organization_pipeline, upload["uuid"])
+    assert [chunk["part_number"] for chunk in status["chunks"]] == [1, 2, 3]
+    assert status["missing"] == []
+
+    complete_pipeline_input_file_upload(organization_pipeline, upload["uuid"], {})
+
+    assert list(fake_s3.objects.values()) == [b"abcdefghij"]
+    status = fetch_pipeline_input_file_upload(organization_pipeline, upload["uuid"])
+    assert not status["is_pending"]
+    with pytest.raises(ValueError):
+        upload_chunk(1, b"abcd")
+
+
 @patch("app.pipelines.services.create_url")
 @responses.activate
 def test_create_pipeline_run(
@@ -389,6 +818,38 @@ def test_create_pipeline_run(
     assert created_pipeline_run == json_response
 
 
+@patch("app.pipelines.services.create_url")
+@responses.activate
+def test_create_pipeline_run_signs_urls(
+    mock_url, app, organization_pipeline, organization_pipeline_input_file
+):
+    mock_url.return_value = "http://freshfileurl.com"
+    # a url cached for the listings, that may expire before the run starts.
+    app.extensions[PRESIGNED_URL_CACHE].url(
+        organization_pipeline_input_file.blob_key,
+        organization_pipeline_input_file.name,
+        lambda key, name: "http://cachedfileurl.com",
+    )
+    responses.add(
+        responses.POST,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs",
+        json=dict(PIPELINE_RUN_RESPONSE_JSON),
+    )
+
+    create_pipeline_run(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        PIPELINE_RUN_JSON,
+    )
+
+    assert json.loads(responses.calls[0].request.body)["inputs"] == [
+        {
+            "url": "http://freshfileurl.com",
+            "name": organization_pipeline_input_file.name,
+        }
+    ]
+
+
 @patch("app.pipelines.services.create_url")
 def test_create_pipeline_run_invalid_org(
     mock_url, app, organization_pipeline, organization_pipeline_input_file
@@ -501,6 +962,212 @@ def test_fetch_pipeline_runs(
     assert pipeline_runs == json_response
 
 
+@responses.activate
+def test_fetch_pipeline_runs_unmatched(app, organization_pipeline):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs",
+        json=[PIPELINE_RUN_RESPONSE_JSON],
+    )
+
+    with pytest.raises(ValueError):
+        fetch_pipeline_runs(
+            organization_pipeline.organization_uuid, organization_pipeline.uuid
+        )
+
+
+def _create_runs(organization_pipeline, count):
+    """ Bulk create count OrganizationPipelineRuns, each with an input file. """
+    db.session.bulk_insert_mappings(
+        OrganizationPipelineRun,
+        [
+            {
+                "uuid": uuid.uuid4().hex,
+                "organization_pipeline_id": organization_pipeline.id,
+                "pipeline_run_uuid": uuid.uuid4().hex,
+                "status_update_token": uuid.uuid4().hex,
+                "status_update_token_expires_at": datetime.now() + timedelta(days=7),
+                "share_token": uuid.uuid4().hex,
+            }
+            for _ in range(count)
+        ],
+    )
+    runs = OrganizationPipelineRun.query.filter(
+        OrganizationPipelineRun.organization_pipeline_id == organization_pipeline.id
+    ).all()
+    db.session.bulk_insert_mappings(
+        OrganizationPipelineInputFile,
+        [
+            {
+                "uuid": uuid.uuid4().hex,
+                "name": "input.csv",
+                "organization_pipeline_id": organization_pipeline.id,
+                "organization_pipeline_run_id": run.id,
+            }
+            for run in runs
+        ],
+    )
+    db.session.commit()
+
+    return runs
+
+
+@patch("app.pipelines.services.create_url")
+def test_update_pipeline_runs_query_count(
+    mock_url, app, organization_pipeline, query_counter
+):
+    mock_url.return_value = "http://somefileurl.com"
+    runs = _create_runs(organization_pipeline, 2000)
+    pipeline_runs = [{"uuid": run.pipeline_run_uuid} for run in runs]
+    db.session.refresh(organization_pipeline)
+
+    query_counter.clear()
+    _update_pipeline_runs(organization_pipeline, pipeline_runs)
+
+    # one query for the runs, and one for their input files.
+    assert len(query_counter) == 2
+    assert [pr["uuid"] for pr in pipeline_runs] == [run.uuid for run in runs]
+    assert all(len(pr["inputs"]) == 1 for pr in pipeline_runs)
+
+
+@patch("app.pipelines.services.fetch_pipeline_run_batch")
+def test_fetch_pipeline_runs_page(mock_batch, app, organization_pipeline):
+    mock_batch.side_effect = lambda org_pipeline_runs: [
+        {"uuid": opr.uuid} for _, opr in org_pipeline_runs
+    ]
+    runs = _create_runs(organization_pipeline, 3)
+    runs.sort(key=lambda run: (run.created_at, run.id), reverse=True)
+
+    (pipeline_runs, cursor, total) = fetch_pipeline_runs_page(
+        ORGANIZATION_UUID, organization_pipeline.uuid, 2, include_total=True
+    )
+    assert pipeline_runs == [{"uuid": run.uuid} for run in runs[:2]]
+    assert cursor is not None
+    assert total == 3
+
+    (pipeline_runs, cursor, total) = fetch_pipeline_runs_page(
+        ORGANIZATION_UUID, organization_pipeline.uuid, 2, cursor
+    )
+    assert pipeline_runs == [{"uuid": runs[2].uuid}]
+    assert cursor is None
+    assert total is None
+
+
+def test_fetch_pipeline_runs_no_pipeline(app, organization_pipeline):
+    with pytest.raises(ValueError) as error:
+        fetch_pipeline_runs(ORGANIZATION_UUID, "0" * 32)
+
+    assert error.value.args[0] == {"message": "organization_pipeline_uuid not found"}
+
+
+def test_fetch_pipeline_runs_page_bad_cursor(app, organization_pipeline):
+    with pytest.raises(ValueError):
+        fetch_pipeline_runs_page(
+            ORGANIZATION_UUID, organization_pipeline.uuid, 2, "notacursor"
+        )
+
+
+def test_fetch_pipeline_runs_page_no_pipeline(app, organization_pipeline):
+    with pytest.raises(ValueError) as error:
+        fetch_pipeline_runs_page(ORGANIZATION_UUID, "0" * 32, 2)
+
+    assert error.value.args[0] == {"message": "organization_pipeline_uuid not found"}
+
+
+@responses.activate
+def test_fetch_pipeline_runs_page_summary(
+    app, query_counter, organization_pipeline, organization_pipeline_run
+):
+    organization_pipeline_run.state = "COMPLETED"
+    organization_pipeline_run.started_at = datetime(2020, 10, 28, 22, 2, 48)
+    organization_pipeline_run.completed_at = datetime(2020, 10, 28, 22, 3, 48)
+    organization_pipeline_run.artifact_count = 1
+    db.session.commit()
+    (pipeline_uuid, run_uuid, created_at) = (
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+        organization_pipeline_run.created_at,
+    )
+
+    query_counter.clear()
+    (pipeline_runs, cursor, total) = fetch_pipeline_runs_page(
+        ORGANIZATION_UUID, pipeline_uuid, 10, summary=True
+    )
+    query_count = len(query_counter)
+
+    assert pipeline_runs == [
+        {
+            "uuid": run_uuid,
+            "state": "COMPLETED",
+            "created_at": created_at.isoformat(),
+            "started_at": "2020-10-28T22:02:48",
+            "completed_at": "2020-10-28T22:03:48",
+            "duration": 60.0,
+            "artifact_count": 1,
+        }
+    ]
+    assert cursor is None
+    # the pipeline, and the page of runs.
+    assert query_count == 2
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_fetch_pipeline_run_updates_status(
+    app, organization_pipeline, organization_pipeline_run
+):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    fetch_pipeline_run(
+        ORGANIZATION_UUID, organization_pipeline.uuid, organization_pipeline_run.uuid
+    )
+    db.session.expire_all()
+
+    assert organization_pipeline_run.state == "COMPLETED"
+    assert organization_pipeline_run.started_at == datetime(
+        2020, 10, 28, 22, 2, 48, 955688
+    )
+    assert organization_pipeline_run.completed_at == datetime(
+        2020, 10, 28, 22, 3, 48, 955688
+    )
+    assert organization_pipeline_run.artifact_count == 1
+
+
+@responses.activate
+def test_backfill_pipeline_run_status(app, organization_pipeline):
+    (finished, unfinished, missing) = _create_runs(organization_pipeline, 3)
+    finished.state = "COMPLETED"
+    db.session.commit()
+
+    path = f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs"
+    responses.add(
+        responses.GET,
+        f"{path}/{unfinished.pipeline_run_uuid}",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+    responses.add(
+        responses.GET,
+        f"{path}/{missing.pipeline_run_uuid}",
+        json={"message": "not found"},
+        status=404,
+    )
+
+    assert backfill_pipeline_run_status(batch_size=2) == 1
+    db.session.expire_all()
+
+    assert unfinished.state == "COMPLETED"
+    assert unfinished.artifact_count == 1
+    assert missing.state is None
+    # finished runs are not fetched again.
+    assert f"{path}/{finished.pipeline_run_uuid}" not in [
+        call.request.url for call in responses.calls
+    ]
+
+
 @responses.activate
 def test_fetch_pipeline_runs_response_error(app, organization_pipeline):
     json_response = dict(PIPELINE_RUN_RESPONSE_JSON)
@@ -562,16 +1229,385 @@ def test_fetch_pipeline_run(
     assert pipeline_run == json_response
 
 
+@patch("app.pipelines.services.create_url")
 @responses.activate
-def test_fetch_pipeline_error(app, organization_pipeline, organization_pipeline_run):
+def test_fetch_pipeline_run_reuses_input_file_urls(
+    mock_url,
+    app,
+    organization_pipeline,
+    organization_pipeline_run,
+    organization_pipeline_input_file,
+):
+    mock_url.return_value = "http://somefileurl.com"
     responses.add(
         responses.GET,
         f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
-        status=503,
+        json=PIPELINE_RUN_RESPONSE_JSON,
     )
 
-    with pytest.raises(HTTPError):
-        fetch_pipeline_run(
+    for _ in range(3):
+        pipeline_run = fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+        assert pipeline_run["inputs"][0]["url"] == "http://somefileurl.com"
+
+    mock_url.assert_called_once_with(
+        organization_pipeline_input_file.blob_key,
+        quote(organization_pipeline_input_file.name),
+    )
+
+
+@responses.activate
+def test_fetch_pipeline_run_cached(
+    app, organization_pipeline, organization_pipeline_run
+):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    for _ in range(3):
+        pipeline_run = fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+        assert pipeline_run["uuid"] == organization_pipeline_run.uuid
+        assert (
+            pipeline_run["artifacts"]
+            == FINISHED_PIPELINE_RUN_RESPONSE_JSON["artifacts"]
+        )
+
+    # finished pipeline runs are only fetched once.
+    assert len(responses.calls) == 1
+
+    # deleting the run removes it from the cache.
+    responses.add(
+        responses.DELETE,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+    )
+    delete_pipeline_run(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+    )
+    assert (
+        app.extensions[PIPELINE_RUN_CACHE].get(
+            organization_pipeline_run.pipeline_run_uuid
+        )
+        is None
+    )
+
+
+@responses.activate
+def test_fetch_pipeline_run_in_progress_not_cached(
+    app, organization_pipeline, organization_pipeline_run
+):
+    app.config[PIPELINE_RUN_CACHE_ACTIVE_TTL] = 0
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=dict(PIPELINE_RUN_RESPONSE_JSON, inputs=[]),
+    )
+
+    for _ in range(3):
+        fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_fetch_pipeline_run_in_progress_shared_cache(
+    app, organization_pipeline, organization_pipeline_run
+):
+    with patch("app.cache.time") as time_mock:
+        backend = DictBackend(lambda: time_mock.monotonic())
+        time_mock.monotonic.return_value = 100
+        app.config[PIPELINE_RUN_CACHE_ACTIVE_TTL] = 5
+        app.extensions[PIPELINE_RUN_CACHE] = TTLCache(10, 86400, backend)
+        responses.add(
+            responses.GET,
+            f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+            json=dict(PIPELINE_RUN_RESPONSE_JSON, inputs=[]),
+        )
+        fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+
+        # another worker reads the in progress run from the shared backend...
+        app.extensions[PIPELINE_RUN_CACHE] = TTLCache(10, 86400, backend)
+        time_mock.monotonic.return_value = 103
+        fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+        assert len(responses.calls) == 1
+
+        # ...but only keeps it for as long as PIPELINE_RUN_CACHE_ACTIVE_TTL.
+        time_mock.monotonic.return_value = 106
+        fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+        assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_fetch_pipeline_run_errors_not_cached(
+    app, organization_pipeline, organization_pipeline_run
+):
+    path = f"/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}"
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}{path}",
+        json={"message": "unavailable"},
+        status=500,
+    )
+    with pytest.raises(ValueError):
+        fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+
+    responses.replace(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}{path}",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+    pipeline_run = fetch_pipeline_run(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+    )
+
+    assert pipeline_run["artifacts"] == FINISHED_PIPELINE_RUN_RESPONSE_JSON["artifacts"]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_update_pipeline_run_status(
+    app, organization_pipeline, organization_pipeline_run
+):
+    update_pipeline_run_status(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+        organization_pipeline_run.status_update_token,
+        FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    assert (
+        organization_pipeline_run.status_snapshot == FINISHED_PIPELINE_RUN_RESPONSE_JSON
+    )
+    assert organization_pipeline_run.status_updated_at is not None
+
+    # updates replace only the keys they include.
+    states = FINISHED_PIPELINE_RUN_RESPONSE_JSON["states"] + [
+        {"created_at": "2020-10-28T22:04:48.955688", "state": "FAILED"}
+    ]
+    update_pipeline_run_status(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+        organization_pipeline_run.status_update_token,
+        {"states": states},
+    )
+
+    assert organization_pipeline_run.status_snapshot == dict(
+        FINISHED_PIPELINE_RUN_RESPONSE_JSON, states=states
+    )
+    assert organization_pipeline_run.state == "FAILED"
+    assert organization_pipeline_run.artifact_count == 1
+
+    # a complete snapshot answers without calling the workflow service.
+    pipeline_run = fetch_pipeline_run(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+    )
+
+    assert pipeline_run["states"] == states
+    assert pipeline_run["artifacts"] == FINISHED_PIPELINE_RUN_RESPONSE_JSON["artifacts"]
+    assert pipeline_run["uuid"] == organization_pipeline_run.uuid
+    assert organization_pipeline_run.state == "FAILED"
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_update_pipeline_run_status_states_only(
+    app, organization_pipeline, organization_pipeline_run
+):
+    organization_pipeline_run.artifact_count = 1
+    db.session.commit()
+    states = FINISHED_PIPELINE_RUN_RESPONSE_JSON["states"]
+    update_pipeline_run_status(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+        organization_pipeline_run.status_update_token,
+        {"states": states},
+    )
+
+    assert organization_pipeline_run.state == "COMPLETED"
+    assert organization_pipeline_run.artifact_count == 1
+
+    # the artifacts still come from the workflow service, once: the finished
+    # run is then saved as the snapshot.
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=dict(FINISHED_PIPELINE_RUN_RESPONSE_JSON, states=states[:2]),
+    )
+    for _ in range(2):
+        app.extensions[PIPELINE_RUN_CACHE].clear()
+        pipeline_run = fetch_pipeline_run(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+        )
+
+        assert pipeline_run["states"] == states
+        assert (
+            pipeline_run["artifacts"]
+            == FINISHED_PIPELINE_RUN_RESPONSE_JSON["artifacts"]
+        )
+    assert organization_pipeline_run.artifact_count == 1
+    assert len(responses.calls) == 1
+
+
+def test_update_pipeline_run_status_invalid(
+    app, organization_pipeline, organization_pipeline_run
+):
+    def update(status_update_token, request_json=FINISHED_PIPELINE_RUN_RESPONSE_JSON):
+        update_pipeline_run_status(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+            status_update_token,
+            request_json,
+        )
+
+    with pytest.raises(PermissionError):
+        update("not-the-token")
+    with pytest.raises(PermissionError):
+        update(None)
+    with pytest.raises(PermissionError):
+        update("t\u00f6ken")
+    with pytest.raises(ValidationError):
+        update(organization_pipeline_run.status_update_token, {"states": []})
+    with pytest.raises(ValidationError):
+        update(
+            organization_pipeline_run.status_update_token,
+            {"states": [{"state": "RUNNING"}]},
+        )
+
+    # expired tokens are rejected.
+    organization_pipeline_run.status_update_token_expires_at = (
+        datetime.now() - timedelta(minutes=1)
+    )
+    db.session.commit()
+    with pytest.raises(PermissionError):
+        update(organization_pipeline_run.status_update_token)
+
+    assert organization_pipeline_run.status_snapshot is None
+
+
+@patch("app.pipelines.services.create_url")
+@responses.activate
+def test_fetch_pipeline_run_batch(
+    mock_url,
+    app,
+    organization_pipeline,
+    organization_pipeline_run,
+    organization_pipeline_input_file,
+):
+    mock_url.return_value = "http://somefileurl.com"
+    other_run = OrganizationPipelineRun(
+        organization_pipeline_id=organization_pipeline.id,
+        pipeline_run_uuid="0" * 32,
+        status_update_token=uuid.uuid4().hex,
+        status_update_token_expires_at=datetime.now() + timedelta(days=7),
+        share_token=uuid.uuid4().hex,
+    )
+    db.session.add(other_run)
+    db.session.commit()
+
+    for run in (organization_pipeline_run, other_run):
+        responses.add(
+            responses.GET,
+            f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{run.pipeline_run_uuid}",
+            json=dict(PIPELINE_RUN_RESPONSE_JSON, uuid=run.pipeline_run_uuid),
+        )
+
+    pipeline_runs = fetch_pipeline_run_batch(
+        [
+            (organization_pipeline, organization_pipeline_run),
+            (organization_pipeline, other_run),
+        ]
+    )
+
+    assert pipeline_runs == [
+        dict(PIPELINE_RUN_RESPONSE_JSON, uuid=organization_pipeline_run.uuid),
+        dict(PIPELINE_RUN_RESPONSE_JSON, uuid=other_run.uuid, inputs=[]),
+    ]
+    assert fetch_pipeline_run_batch([]) == []
+
+
+@patch("app.pipelines.services.create_url")
+@responses.activate
+def test_fetch_pipeline_run_summaries(
+    mock_url,
+    app,
+    organization_pipeline,
+    organization_pipeline_run,
+    organization_pipeline_input_file,
+):
+    mock_url.return_value = "http://somefileurl.com"
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    (summary,) = fetch_pipeline_run_summaries(
+        [(organization_pipeline, organization_pipeline_run)]
+    )
+
+    expected = dict(
+        FINISHED_PIPELINE_RUN_RESPONSE_JSON, uuid=organization_pipeline_run.uuid
+    )
+    del expected["artifacts"]
+    del expected["inputs"]
+    assert summary == expected
+    # the input files are neither queried nor signed.
+    mock_url.assert_not_called()
+    # the status columns still count the artifacts.
+    assert organization_pipeline_run.artifact_count == 1
+    assert fetch_pipeline_run_summaries([]) == []
+
+
+@responses.activate
+def test_fetch_pipeline_error(app, organization_pipeline, organization_pipeline_run):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        status=503,
+    )
+
+    with pytest.raises(HTTPError):
+        fetch_pipeline_run(
             organization_pipeline.organization_uuid,
             organization_pipeline.uuid,
             organization_pipeline_run.uuid,
@@ -617,6 +1653,106 @@ def test_fetch_pipeline_run_console(
     assert console_output == json_response
 
 
+@responses.activate
+def test_fetch_pipeline_run_console_output(
+    app, organization_pipeline, organization_pipeline_run
+):
+    path = f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}"
+    responses.add(responses.GET, path, json=FINISHED_PIPELINE_RUN_RESPONSE_JSON)
+    responses.add(
+        responses.GET,
+        f"{path}/console",
+        json={"std_out": "h\u00e9llo", "std_err": ""},
+    )
+
+    def fetch(output, offset=0):
+        return fetch_pipeline_run_console_output(
+            organization_pipeline.organization_uuid,
+            organization_pipeline.uuid,
+            organization_pipeline_run.uuid,
+            output,
+            offset,
+        )
+
+    assert fetch("std_out") == ("h\u00e9llo".encode(), 6, True)
+    assert fetch("std_out", 3) == (b"llo", 6, True)
+    assert fetch("std_out", 6) == (b"", 6, True)
+    assert fetch("std_err") == (b"", 0, True)
+    with pytest.raises(ValueError):
+        fetch("std_in")
+
+
+@responses.activate
+def test_stream_pipeline_run_console_output(
+    app, organization_pipeline, organization_pipeline_run
+):
+    app.config[PIPELINE_RUN_CACHE_ACTIVE_TTL] = 0
+    path = f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}"
+    # responses are returned in the order they are added.
+    for pipeline_run in (
+        PIPELINE_RUN_RESPONSE_JSON,
+        FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    ):
+        responses.add(responses.GET, path, json=pipeline_run)
+    for std_out in ("h\u00e9", "h\u00e9llo\n", "h\u00e9llo\n", "h\u00e9llo\nbye\n"):
+        responses.add(
+            responses.GET, f"{path}/console", json={"std_out": std_out, "std_err": ""}
+        )
+
+    events = stream_pipeline_run_console_output(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+        "std_out",
+        offset=1,
+        poll_interval=0,
+    )
+
+    assert list(events) == [
+        (3, "\u00e9", False),
+        (7, "llo\n", False),
+        (7, "", False),
+        (11, "bye\n", True),
+    ]
+    # the state is only read while the output is not growing.
+    assert [call.request.url.endswith("/console") for call in responses.calls] == [
+        False,
+        True,
+        True,
+        True,
+        False,
+        True,
+    ]
+
+
+@responses.activate
+def test_stream_pipeline_run_console_output_max_duration(
+    app, organization_pipeline, organization_pipeline_run
+):
+    run_uuids = (
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+    )
+    path = f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}"
+    responses.add(responses.GET, path, json=PIPELINE_RUN_RESPONSE_JSON)
+    responses.add(
+        responses.GET, f"{path}/console", json={"std_out": "one\n", "std_err": ""}
+    )
+
+    events = stream_pipeline_run_console_output(
+        *run_uuids,
+        "std_out",
+        poll_interval=0,
+        max_duration=0,
+    )
+
+    # the stream ends before the run finishes.
+    assert list(events) == [(4, "one\n", False)]
+    with pytest.raises(ValueError):
+        next(stream_pipeline_run_console_output(*run_uuids, "std_in"))
+
+
 @responses.activate
 def test_fetch_pipeline_run_error(
     app, organization_pipeline, organization_pipeline_run
@@ -654,6 +1790,68 @@ def test_fetch_pipeline_run_notfound(
         )
 
 
+@responses.activate
+def test_pipeline_run_not_found(
+    app, query_counter, organization_pipeline, organization_pipeline_run
+):
+    other_pipeline = OrganizationPipeline(
+        organization_uuid=ORGANIZATION_UUID, pipeline_uuid=PIPELINE_UUID
+    )
+    db.session.add(other_pipeline)
+    deleted_run = OrganizationPipelineRun(
+        organization_pipeline_id=organization_pipeline.id,
+        pipeline_run_uuid=uuid.uuid4().hex,
+        status_update_token=uuid.uuid4().hex,
+        status_update_token_expires_at=datetime.now() + timedelta(days=7),
+        share_token=uuid.uuid4().hex,
+        is_deleted=True,
+    )
+    db.session.add(deleted_run)
+    db.session.commit()
+
+    # No workflow service responses are registered: a missing run is reported
+    # after one lookup, without calling the workflow service.
+    for service in (
+        fetch_pipeline_run,
+        fetch_pipeline_run_console,
+        delete_pipeline_run,
+    ):
+        for (org_uuid, pipeline_uuid, run_uuid) in (
+            (ORGANIZATION_UUID, organization_pipeline.uuid, uuid.uuid4().hex),
+            (ORGANIZATION_UUID, organization_pipeline.uuid, deleted_run.uuid),
+            (ORGANIZATION_UUID, other_pipeline.uuid, organization_pipeline_run.uuid),
+            (
+                uuid.uuid4().hex,
+                organization_pipeline.uuid,
+                organization_pipeline_run.uuid,
+            ),
+        ):
+            query_counter.clear()
+            with pytest.raises(ValueError) as value_error:
+                service(org_uuid, pipeline_uuid, run_uuid)
+
+            assert value_error.value.args[0] == {
+                "message": "organization_pipeline_run_uuid not found"
+            }
+            assert len(query_counter) == 1
+
+
+@responses.activate
+def test_delete_pipeline_run(app, organization_pipeline, organization_pipeline_run):
+    responses.add(
+        responses.DELETE,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+    )
+
+    delete_pipeline_run(
+        organization_pipeline.organization_uuid,
+        organization_pipeline.uuid,
+        organization_pipeline_run.uuid,
+    )
+
+    assert organization_pipeline_run.is_deleted
+
+
 @responses.activate
 def test_create_artifact_chart_no_pipeline_run_found(
     app, organization_pipeline, organization_pipeline_run
@@ -809,6 +2007,43 @@ def test_fetch_artifact_charts(app, organization_pipeline, organization_pipeline
     ]
 
 
+@responses.activate
+def test_fetch_artifact_charts_fetches_pipeline_run_once(
+    app, organization_pipeline, organization_pipeline_run
+):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{organization_pipeline.pipeline_uuid}/runs/{organization_pipeline_run.pipeline_run_uuid}",
+        json=FINISHED_PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    for index in range(20):
+        organization_pipeline_run.artifact_charts.append(
+            ArtifactChart(
+                name=f"chart {index}",
+                artifact_uuid=FINISHED_PIPELINE_RUN_RESPONSE_JSON["artifacts"][0][
+                    "uuid"
+                ],
+                chart_type_code="ACODE",
+                chart_config="{}",
+            )
+        )
+    db.session.commit()
+
+    chart_json_result = fetch_artifact_charts(organization_pipeline_run)
+
+    assert len(chart_json_result) == 20
+    assert len(responses.calls) == 1
+
+    # the pipeline run is reused by the rest of the request.
+    update_artifact_chart(
+        organization_pipeline_run,
+        chart_json_result[0]["uuid"],
+        {"name": "renamed"},
+    )
+    assert len(responses.calls) == 1
+
+
 @responses.activate
 def test_update_artifact_chart(app, organization_pipeline, organization_pipeline_run):
     pipeline_uuid = organization_pipeline.pipeline_uuid
@@ -0,0 +1,179 @@
+import io
+import time
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from app.blobs import MIN_PART_SIZE, BlobClient, PresignedUrlCache
+from app.cache import TTLCache
+
+from .fake_s3 import FakeS3
+
+KEY = "pipeline/file-input.csv"
+PART_SIZE = MIN_PART_SIZE
+
+
+@pytest.fixture
+def blob_client():
+    return BlobClient(
+        "bucket",
+        60,
+        PART_SIZE,
+        aws_access_key_id="test-key-id",
+        aws_secret_access_key="test-secret",
+        endpoint_url="http://example.com",
+        region_name="us-east-1",
+    )
+
+
+def test_part_size_for(blob_client):
+    assert blob_client.part_size_for(1) == PART_SIZE
+    assert blob_client.part_size_for(PART_SIZE * 20000) == PART_SIZE * 2
+
+
+def test_create_upload(blob_client):
+    upload = blob_client.create_upload(KEY, PART_SIZE)
+
+    assert upload["method"] == "PUT"
+    url = urlparse(upload["url"])
+    assert url.path == f"/bucket/{KEY}"
+    assert "X-Amz-Signature" in parse_qs(url.query)
+
+
+def test_create_upload_multipart(blob_client):
+    with Stubber(blob_client.s3) as stubber:
+        stubber.add_response(
+            "create_multipart_upload",
+            {"UploadId": "upload-id"},
+            {"Bucket": "bucket", "Key": KEY},
+        )
+        upload = blob_client.create_upload(KEY, PART_SIZE * 2 + 1)
+
+    assert upload["upload_id"] == "upload-id"
+    assert upload["part_size"] == PART_SIZE
+    assert [part["part_number"] for part in upload["parts"]] == [1, 2, 3]
+    query = parse_qs(urlparse(upload["parts"][1]["url"]).query)
+    assert query["uploadId"] == ["upload-id"]
+    assert query["partNumber"] == ["2"]
+
+
+def test_complete_upload(blob_client):
+    with Stubber(blob_client.s3) as stubber:
+        stubber.add_response(
+            "complete_multipart_upload",
+            {},
+            {
+                "Bucket": "bucket",
+                "Key": KEY,
+                "UploadId": "upload-id",
+                "MultipartUpload": {
+                    "Parts": [
+                        {"PartNumber": 1, "ETag": "a"},
+                        {"PartNumber": 2, "ETag": "b"},
+                    ]
+                },
+            },
+        )
+        stubber.add_response(
+            "head_object",
+            {"ContentLength": 10, "ETag": '"abc-2"'},
+            {"Bucket": "bucket", "Key": KEY},
+        )
+
+        assert blob_client.complete_upload(KEY, "upload-id", [(2, "b"), (1, "a")]) == (
+            10,
+            "abc-2",
+        )
+
+
+def test_abort_upload(blob_client):
+    with Stubber(blob_client.s3) as stubber:
+        stubber.add_response(
+            "abort_multipart_upload",
+            {},
+            {"Bucket": "bucket", "Key": KEY, "UploadId": "upload-id"},
+        )
+        stubber.add_response("delete_object", {}, {"Bucket": "bucket", "Key": KEY})
+
+        blob_client.abort_upload(KEY, "upload-id")
+        stubber.assert_no_pending_responses()
+
+
+def test_abort_upload_already_gone(blob_client):
+    with Stubber(blob_client.s3) as stubber:
+        # the upload was already completed, or aborted.
+        stubber.add_client_error("abort_multipart_upload", "NoSuchUpload", 404)
+        stubber.add_response("delete_object", {})
+        blob_client.abort_upload(KEY, "upload-id")
+
+        stubber.add_client_error("abort_multipart_upload", "AccessDenied", 403)
+        with pytest.raises(ClientError):
+            blob_client.abort_upload(KEY, "upload-id")
+        stubber.assert_no_pending_responses()
+
+
+def test_upload_parts(blob_client):
+    blob_client.s3 = FakeS3(max_parts=1)
+    upload_id = blob_client.start_multipart_upload(KEY)
+
+    etags = [
+        blob_client.upload_part(KEY, upload_id, part_number, io.BytesIO(data), 2)
+        for (part_number, data) in ((2, b"cd"), (1, b"ab"))
+    ]
+
+    parts = blob_client.list_parts(KEY, upload_id)
+    assert parts == [(1, 2, etags[1]), (2, 2, etags[0])]
+    assert (
+        blob_client.complete_upload(
+            KEY, upload_id, [(n, etag) for (n, _, etag) in parts]
+        )[0]
+        == 4
+    )
+
+
+def test_presigned_url_cache():
+    urls = PresignedUrlCache(TTLCache(10, 100), 100, 0.5)
+    signed = []
+
+    def sign(key, filename):
+        signed.append(key)
+        return f"http://s3/{key}?signature={len(signed)}"
+
+    assert urls.url(KEY, "input.csv", sign) == f"http://s3/{KEY}?signature=1"
+    assert urls.url(KEY, "input.csv", sign) == f"http://s3/{KEY}?signature=1"
+    assert urls.url(KEY, "other.csv", sign) == f"http://s3/{KEY}?signature=2"
+
+    stats = urls.stats()
+    assert (stats["hits"], stats["misses"], stats["signed"]) == (1, 2, 2)
+    assert stats["hit_rate"] == 1 / 3
+    assert stats["signing_seconds"] >= 0
+
+    # URLs are signed again once half of their lifetime has passed.
+    with patch("app.blobs.time.time", return_value=time.time() + 51):
+        assert urls.url(KEY, "input.csv", sign) == f"http://s3/{KEY}?signature=3"
+
+
+def test_presigned_url_cache_disabled():
+    urls = PresignedUrlCache(TTLCache(10, 100), 100, 0)
+    sign = lambda key, filename: f"http://s3/{key}"
+
+    urls.url(KEY, "input.csv", sign)
+    urls.url(KEY, "input.csv", sign)
+
+    assert urls.stats()["signed"] == 2
+
+
+def test_presigned_url_cache_urls():
+    urls = PresignedUrlCache(TTLCache(10, 100), 100, 0.5)
+    sign = lambda key, filename: f"http://s3/{key}/{filename}"
+
+    urls.url("a", "a.csv", sign)
+
+    assert urls.urls([("a", "a.csv"), ("b", "b.csv")], sign) == [
+        "http://s3/a/a.csv",
+        "http://s3/b/b.csv",
+    ]
+    assert urls.stats()["signed"] == 2
@@ -0,0 +1,146 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from app.cache import MISSING, RedisCacheBackend, TTLCache
+
+
+def test_cache_get_set():
+    cache = TTLCache(10, 60)
+
+    assert cache.get("a") is None
+    cache.set("a", False)
+    assert cache.get("a") is False
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_expires():
+    cache = TTLCache(10, 60)
+
+    with patch("app.cache.time.monotonic") as monotonic_mock:
+        monotonic_mock.return_value = 100
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=5)
+
+        monotonic_mock.return_value = 106
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        monotonic_mock.return_value = 161
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+def test_cache_lru_eviction():
+    cache = TTLCache(2, 60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # touch 'a' so that 'b' is the least recently used entry.
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_delete():
+    cache = TTLCache(2, 60)
+
+    cache.set("a", 1)
+    cache.delete("a")
+    assert cache.get("a") is None
+
+
+class DictBackend:
+    """ A shared backend, with expiry measured by clock(). """
+
+    def __init__(self, clock=None):
+        self.values = {}
+        self.clock = clock
+
+    def _now(self):
+        return self.clock() if self.clock else time.monotonic()
+
+    def get(self, key):
+        if key not in self.values:
+            return MISSING
+        (value, expires_at) = self.values[key]
+        ttl = expires_at - self._now()
+        return MISSING if ttl <= 0 else (value, ttl)
+
+    def set(self, key, value, ttl):
+        self.values[key] = (value, self._now() + ttl)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+def test_cache_shared_backend():
+    backend = DictBackend()
+    cache = TTLCache(10, 60, backend)
+    other_cache = TTLCache(10, 60, backend)
+
+    cache.set("a", True)
+    assert other_cache.get("a") is True
+    assert other_cache.stats()["hits"] == 1
+
+    other_cache.delete("a")
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_cache_shared_backend_only():
+    backend = DictBackend()
+    cache = TTLCache(10, 60, backend, local=False)
+    other_cache = TTLCache(10, 60, backend, local=False)
+
+    cache.set("a", 1)
+    assert other_cache.get("a") == 1
+    assert len(other_cache) == 0
+
+    # a change is seen by the other cache at once.
+    cache.set("a", 2)
+    assert other_cache.get("a") == 2
+    cache.delete("a")
+    assert other_cache.get("a") is None
+
+    # without a backend, entries are kept locally.
+    assert TTLCache(10, 60, local=False).local
+
+
+def test_cache_shared_backend_ttl():
+    backend = DictBackend()
+    cache = TTLCache(10, 60, backend)
+    other_cache = TTLCache(10, 60, backend)
+
+    with patch("app.cache.time.monotonic") as monotonic_mock:
+        monotonic_mock.return_value = 100
+        cache.set("a", 1, ttl=10)
+
+        # other_cache keeps its copy only as long as the shared entry lives.
+        monotonic_mock.return_value = 105
+        assert other_cache.get("a") == 1
+        monotonic_mock.return_value = 111
+        assert other_cache.get("a") is None
+        assert len(other_cache) == 0
+
+
+def _redis_backend(value, pttl):
+    backend = RedisCacheBackend.__new__(RedisCacheBackend)
+    backend.prefix = "test"
+    backend.client = MagicMock()
+    backend.client.pipeline.return_value.execute.return_value = [value, pttl]
+    return backend
+
+
+def test_redis_backend_get():
+    backend = _redis_backend(b'{"a": 1}', 2500)
+    assert backend.get(("x", "y")) == ({"a": 1}, 2.5)
+    backend.client.pipeline.return_value.get.assert_called_once_with("test:x:y")
+    backend.client.pipeline.return_value.pttl.assert_called_once_with("test:x:y")
+
+    assert _redis_backend(b"true", -1).get("x") == (True, None)
+    assert _redis_backend(None, -2).get("x") is MISSING
@@ -1,3 +1,17 @@
+from application_roles.decorators import ROLES_KEY
+
+
 def test_healthcheck(client):
     response = client.get("/healthcheck")
     assert response.status_code == 200
+
+
+def test_metrics(client, client_application):
+    response = client.get("/metrics")
+    assert response.status_code == 401
+
+    response = client.get("/metrics", headers={ROLES_KEY: client_application.api_key})
+    assert response.status_code == 200
+    assert "membership_cache" in response.json
+    assert "workflow_graph_cache" in response.json
+    assert response.json["presigned_url_cache"]["signed"] == 0
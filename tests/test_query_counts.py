@@ -0,0 +1,182 @@
+import copy
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import responses
+from app.constants import WORKFLOW_HOSTNAME
+from app.pipelines.models import (
+    OrganizationPipelineInputFile,
+    OrganizationPipelineRun,
+    db,
+)
+from application_roles.decorators import ROLES_KEY
+
+from .conftest import (
+    JWT_TOKEN,
+    ORGANIZATION_UUID,
+    ORGANIZATION_WORKFLOW_RUN_UUID,
+    ORGANIZATION_WORKFLOW_UUID,
+    PIPELINE_RUN_UUID,
+    PIPELINE_UUID,
+    WORKFLOW_PIPELINE_UUID,
+    WORKFLOW_RUN_UUID,
+    WORKFLOW_UUID,
+)
+from .pipelines.test_services import (
+    PIPELINE_JSON,
+    PIPELINE_RUN_CONSOLE_RESPONSE_JSON,
+    PIPELINE_RUN_RESPONSE_JSON,
+)
+from .workflows.test_services import (
+    WORKFLOW_JSON,
+    WORKFLOW_PIPELINE_RESPONSE_JSON,
+    WORKFLOW_PIPELINE_RUN_RESPONSE_JSON,
+)
+
+ADDED_RUNS = 20
+
+PIPELINE_PATH = f"/v1/organizations/{ORGANIZATION_UUID}/pipelines/{{pipeline}}"
+RUN_PATH = f"{PIPELINE_PATH}/runs/{PIPELINE_RUN_UUID}"
+WORKFLOW_PATH = (
+    f"/v1/organizations/{ORGANIZATION_UUID}/workflows/{ORGANIZATION_WORKFLOW_UUID}"
+)
+
+ROUTES = {
+    "pipelines": f"/v1/organizations/{ORGANIZATION_UUID}/pipelines",
+    "pipelines summary": f"/v1/organizations/{ORGANIZATION_UUID}/pipelines?summary=1",
+    "pipeline": PIPELINE_PATH,
+    "pipeline runs": f"{PIPELINE_PATH}/runs",
+    "pipeline runs page": f"{PIPELINE_PATH}/runs?limit=5",
+    "pipeline runs summary": f"{PIPELINE_PATH}/runs?summary=true",
+    "pipeline run": RUN_PATH,
+    "pipeline run console": f"{RUN_PATH}/console",
+    "pipeline run console output": f"{RUN_PATH}/console/std_out?offset=1",
+    "pipeline run charts": f"{RUN_PATH}/charts",
+    "workflows": f"/v1/organizations/{ORGANIZATION_UUID}/workflows",
+    "workflow": WORKFLOW_PATH,
+    "workflow pipelines": f"{WORKFLOW_PATH}/pipelines",
+    "workflow graph": f"{WORKFLOW_PATH}/graph",
+    "workflow pipeline": f"{WORKFLOW_PATH}/pipelines/{{workflow_pipeline}}",
+    "workflow run": f"{WORKFLOW_PATH}/runs/{ORGANIZATION_WORKFLOW_RUN_UUID}",
+}
+
+
+def _add_workflow_responses(hostname):
+    """ Respond to every workflow service request the routes make. """
+    pipeline_runs = re.compile(f"{hostname}/v1/pipelines/{PIPELINE_UUID}/runs/\\w+$")
+    workflow_pipelines = f"{hostname}/v1/workflows/{WORKFLOW_UUID}/pipelines"
+
+    responses.add(
+        responses.POST,
+        f"{hostname}/v1/pipelines/search",
+        json=[dict(PIPELINE_JSON, uuid=PIPELINE_UUID)],
+    )
+    responses.add(
+        responses.GET, f"{hostname}/v1/pipelines/{PIPELINE_UUID}", json=PIPELINE_JSON
+    )
+    responses.add(
+        responses.GET,
+        f"{hostname}/v1/pipelines/{PIPELINE_UUID}/runs",
+        json=[dict(PIPELINE_RUN_RESPONSE_JSON)],
+    )
+    responses.add(
+        responses.GET,
+        f"{hostname}/v1/pipelines/{PIPELINE_UUID}/runs/{PIPELINE_RUN_UUID}/console",
+        json=PIPELINE_RUN_CONSOLE_RESPONSE_JSON,
+    )
+    responses.add(responses.GET, pipeline_runs, json=PIPELINE_RUN_RESPONSE_JSON)
+    responses.add(
+        responses.POST, f"{hostname}/v1/workflows/search", json=[WORKFLOW_JSON]
+    )
+    responses.add(
+        responses.GET, f"{hostname}/v1/workflows/{WORKFLOW_UUID}", json=WORKFLOW_JSON
+    )
+    responses.add(
+        responses.GET, workflow_pipelines, json=[WORKFLOW_PIPELINE_RESPONSE_JSON]
+    )
+    responses.add(
+        responses.GET,
+        f"{workflow_pipelines}/{WORKFLOW_PIPELINE_UUID}",
+        json=WORKFLOW_PIPELINE_RESPONSE_JSON,
+    )
+    responses.add(
+        responses.GET,
+        f"{hostname}/v1/workflows/{WORKFLOW_UUID}/runs/{WORKFLOW_RUN_UUID}",
+        json=copy.deepcopy(WORKFLOW_PIPELINE_RUN_RESPONSE_JSON),
+    )
+
+
+def _add_pipeline_runs(organization_pipeline, count):
+    """ Add count older runs, each with an input file, to a pipeline. """
+    created_at = datetime.now() - timedelta(days=1)
+    runs = [
+        OrganizationPipelineRun(
+            organization_pipeline_id=organization_pipeline.id,
+            pipeline_run_uuid=uuid.uuid4().hex,
+            status_update_token=uuid.uuid4().hex,
+            status_update_token_expires_at=created_at + timedelta(days=7),
+            share_token=uuid.uuid4().hex,
+            created_at=created_at - timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+    db.session.add_all(runs)
+    db.session.flush()
+    db.session.add_all(
+        [
+            OrganizationPipelineInputFile(
+                name="input.csv",
+                organization_pipeline_id=organization_pipeline.id,
+                organization_pipeline_run_id=run.id,
+            )
+            for run in runs
+        ]
+    )
+    db.session.commit()
+
+
+@pytest.mark.parametrize("route", list(ROUTES))
+@responses.activate
+def test_route_query_count(
+    route,
+    app,
+    client,
+    client_application,
+    query_counter,
+    organization_pipeline,
+    organization_pipeline_run,
+    organization_pipeline_input_file,
+    organization_workflow,
+    organization_workflow_pipeline,
+    organization_workflow_run,
+    organization_workflow_pipeline_run,
+):
+    """The number of queries a route makes must not grow with the number of
+    runs and input files a pipeline has."""
+    _add_workflow_responses(app.config[WORKFLOW_HOSTNAME])
+    path = ROUTES[route].format(
+        pipeline=organization_pipeline.uuid,
+        workflow_pipeline=organization_workflow_pipeline.uuid,
+    )
+
+    def count_queries():
+        db.session.expire_all()
+        query_counter.clear()
+        result = client.get(
+            path,
+            content_type="application/json",
+            headers={
+                "Authorization": f"Bearer {JWT_TOKEN}",
+                ROLES_KEY: client_application.api_key,
+            },
+        )
+        assert result.status_code == 200, result.json
+
+        return len(query_counter)
+
+    query_count = count_queries()
+    _add_pipeline_runs(organization_pipeline, ADDED_RUNS)
+
+    assert count_queries() <= query_count
@@ -0,0 +1,292 @@
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.pipelines import queries as pipeline_queries
+from app.pipelines.models import (
+    OrganizationPipeline,
+    OrganizationPipelineInputFile,
+    OrganizationPipelineRun,
+    db,
+)
+from app.workflows import queries as workflow_queries
+from app.workflows.models import (
+    OrganizationWorkflow,
+    OrganizationWorkflowPipeline,
+    OrganizationWorkflowPipelineRun,
+    OrganizationWorkflowRun,
+)
+
+ORGANIZATIONS = 10
+PIPELINES_PER_ORGANIZATION = 10
+RUNS_PER_PIPELINE = 20
+
+# A step of an sqlite query plan that scans a whole table (or index), rather
+# than searching it.
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def _uuid():
+    return uuid.uuid4().hex
+
+
+@pytest.fixture
+def data(app):
+    """ Populate every table with a realistic number of rows. """
+    now = datetime.now()
+    organizations = [_uuid() for _ in range(ORGANIZATIONS)]
+
+    db.session.bulk_insert_mappings(
+        OrganizationPipeline,
+        [
+            {"uuid": _uuid(), "organization_uuid": org, "pipeline_uuid": _uuid()}
+            for org in organizations
+            for _ in range(PIPELINES_PER_ORGANIZATION)
+        ],
+    )
+    pipelines = OrganizationPipeline.query.all()
+
+    db.session.bulk_insert_mappings(
+        OrganizationPipelineRun,
+        [
+            {
+                "uuid": _uuid(),
+                "organization_pipeline_id": pipeline.id,
+                "pipeline_run_uuid": _uuid(),
+                "status_update_token": _uuid(),
+                "status_update_token_expires_at": now + timedelta(days=7),
+                "share_token": _uuid(),
+                "created_at": now - timedelta(minutes=index),
+                "is_deleted": index % 10 == 0,
+            }
+            for pipeline in pipelines
+            for index in range(RUNS_PER_PIPELINE)
+        ],
+    )
+    runs = OrganizationPipelineRun.query.all()
+
+    db.session.bulk_insert_mappings(
+        OrganizationPipelineInputFile,
+        [
+            {
+                "uuid": _uuid(),
+                "name": "input.csv",
+                "organization_pipeline_id": run.organization_pipeline_id,
+                "organization_pipeline_run_id": run.id,
+            }
+            for run in runs
+        ],
+    )
+
+    db.session.bulk_insert_mappings(
+        OrganizationWorkflow,
+        [
+            {"uuid": _uuid(), "organization_uuid": org, "workflow_uuid": _uuid()}
+            for org in organizations
+            for _ in range(PIPELINES_PER_ORGANIZATION)
+        ],
+    )
+    workflows = OrganizationWorkflow.query.all()
+
+    db.session.bulk_insert_mappings(
+        OrganizationWorkflowPipeline,
+        [
+            {
+                "uuid": _uuid(),
+                "organization_workflow_uuid": workflow.uuid,
+                "organization_pipeline_id": pipeline.id,
+                "workflow_pipeline_uuid": _uuid(),
+            }
+            for workflow, pipeline in zip(workflows, pipelines)
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        OrganizationWorkflowRun,
+        [
+            {
+                "uuid": _uuid(),
+                "organization_workflow_uuid": workflow.uuid,
+                "workflow_run_uuid": _uuid(),
+            }
+            for workflow in workflows
+            for _ in range(RUNS_PER_PIPELINE)
+        ],
+    )
+    workflow_runs = OrganizationWorkflowRun.query.all()
+    workflows_by_uuid = {workflow.uuid: workflow for workflow in workflows}
+
+    db.session.bulk_insert_mappings(
+        OrganizationWorkflowPipelineRun,
+        [
+            {
+                "uuid": _uuid(),
+                "organization_workflow_id": workflows_by_uuid[
+                    workflow_run.organization_workflow_uuid
+                ].id,
+                "organization_pipeline_run_id": run.id,
+                "organization_workflow_run_id": workflow_run.id,
+                "workflow_run_uuid": _uuid(),
+            }
+            for workflow_run, run in zip(workflow_runs, runs)
+        ],
+    )
+    db.session.commit()
+
+    return {
+        "pipeline": pipelines[-1],
+        "run": runs[-1],
+        "workflow": workflows[-1],
+        "workflow_pipeline": OrganizationWorkflowPipeline.query.all()[-1],
+        "workflow_run": workflow_runs[-1],
+        "workflow_pipeline_run": OrganizationWorkflowPipelineRun.query.all()[-1],
+    }
+
+
+def _query_plans(query_function, *args):
+    """ Run query_function, and return the query plans of its statements. """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = query_function(*args)
+        if hasattr(result, "all"):
+            result.all()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    connection = db.session.connection().connection
+    return [
+        [row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {s}", p)]
+        for (s, p) in statements
+    ]
+
+
+def _assert_no_full_scans(query_function, *args):
+    for plan in _query_plans(query_function, *args):
+        full_scans = [
+            step
+            for step in plan
+            if FULL_SCAN.match(step) and FULL_SCAN.match(step)[1] in db.metadata.tables
+        ]
+        assert not full_scans, f"{query_function.__name__}: {plan}"
+
+
+def test_pipeline_query_plans(app, data):
+    pipeline = data["pipeline"]
+    run = data["run"]
+
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipelines, pipeline.organization_uuid
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline,
+        pipeline.organization_uuid,
+        pipeline.uuid,
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_by_id, pipeline.id
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_by_pipeline_run_uuid,
+        run.pipeline_run_uuid,
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipelines_and_runs_by_pipeline_run_uuids,
+        [run.pipeline_run_uuid],
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_input_files, pipeline.id
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_run_input_files, [run.id]
+    )
+    _assert_no_full_scans(
+        pipeline_queries.search_organization_pipeline_input_files,
+        pipeline.id,
+        [_uuid()],
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_input_file, pipeline.id, _uuid()
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_unreferenced_input_file_contents, datetime.now()
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_run, pipeline.id, run.uuid
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_and_run,
+        pipeline.organization_uuid,
+        pipeline.uuid,
+        run.uuid,
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_latest_organization_pipeline_run, pipeline.id
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_latest_organization_pipeline_runs, [pipeline.id]
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_organization_pipeline_runs_page,
+        pipeline.id,
+        10,
+        (run.created_at, run.id),
+    )
+    _assert_no_full_scans(
+        pipeline_queries.estimate_organization_pipeline_run_count, pipeline.id
+    )
+    _assert_no_full_scans(
+        pipeline_queries.find_unfinished_organization_pipeline_runs, 100, run.id
+    )
+    _assert_no_full_scans(
+        pipeline_queries.search_organization_pipeline_runs,
+        pipeline.id,
+        [run.uuid],
+    )
+
+
+def test_workflow_query_plans(app, data):
+    workflow = data["workflow"]
+    workflow_pipeline = data["workflow_pipeline"]
+    workflow_run = data["workflow_run"]
+
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflows, workflow.organization_uuid
+    )
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflow,
+        workflow.organization_uuid,
+        workflow.uuid,
+    )
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflow_pipeline,
+        workflow.uuid,
+        workflow_pipeline.uuid,
+    )
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflow_pipeline_by_workflow_pipeline_uuid,
+        workflow.uuid,
+        workflow_pipeline.workflow_pipeline_uuid,
+    )
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflow_pipeline_graph, workflow.uuid
+    )
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflow_run,
+        workflow.uuid,
+        workflow_run.uuid,
+    )
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflow_pipeline_run_by_workflow_run_uuid,
+        data["workflow_pipeline_run"].workflow_run_uuid,
+    )
+    _assert_no_full_scans(
+        workflow_queries.find_organization_workflow_pipeline_runs_by_workflow_run_uuids,
+        [data["workflow_pipeline_run"].workflow_run_uuid],
+    )
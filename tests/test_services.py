@@ -1,12 +1,14 @@
 from unittest.mock import MagicMock, patch
 
-from app.constants import AUTH_HOSTNAME
+import pytest
+from app.constants import AUTH_HOSTNAME, MEMBERSHIP_CACHE
+from requests import HTTPError
 from app.utils import fetch_is_user_in_org
 
 from .conftest import JWT_TOKEN, ORGANIZATION_UUID, USER_UUID
 
 
-@patch("app.pipelines.services.requests.get")
+@patch("app.services.requests.get")
 def test_fetch_is_user_in_org_false(get_mock, app):
     get_mock().json.return_value = [
         {
@@ -25,7 +27,7 @@ def test_fetch_is_user_in_org_false(get_mock, app):
     assert get_call[1]["headers"]["Authorization"] == f"Bearer {JWT_TOKEN}"
 
 
-@patch("app.pipelines.services.requests.get")
+@patch("app.services.requests.get")
 def test_fetch_is_user_in_org(get_mock, app):
     get_mock().json.return_value = [
         {
@@ -42,3 +44,38 @@ def test_fetch_is_user_in_org(get_mock, app):
     get_call = get_mock.call_args
     assert get_call[0][0].startswith(app.config[AUTH_HOSTNAME])
     assert get_call[1]["headers"]["Authorization"] == f"Bearer {JWT_TOKEN}"
+
+
+@patch("app.services.requests.get")
+def test_fetch_is_user_in_org_cached(get_mock, app):
+    get_mock().json.return_value = [{"uuid": ORGANIZATION_UUID}]
+    get_mock.reset_mock()
+
+    assert fetch_is_user_in_org(ORGANIZATION_UUID, JWT_TOKEN, USER_UUID)
+    assert fetch_is_user_in_org(ORGANIZATION_UUID, JWT_TOKEN, USER_UUID)
+    assert get_mock.call_count == 1
+
+    # negative results are cached too.
+    assert not fetch_is_user_in_org("otherorg", JWT_TOKEN, USER_UUID)
+    assert not fetch_is_user_in_org("otherorg", JWT_TOKEN, USER_UUID)
+    assert get_mock.call_count == 2
+
+    # a different token is looked up again.
+    assert fetch_is_user_in_org(ORGANIZATION_UUID, "anothertoken", USER_UUID)
+    assert get_mock.call_count == 3
+
+    stats = app.extensions[MEMBERSHIP_CACHE].stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+
+
+@patch("app.services.requests.get")
+def test_fetch_is_user_in_org_error_not_cached(get_mock, app):
+    get_mock().raise_for_status.side_effect = HTTPError()
+    get_mock.reset_mock()
+
+    with pytest.raises(HTTPError):
+        fetch_is_user_in_org(ORGANIZATION_UUID, JWT_TOKEN, USER_UUID)
+    with pytest.raises(HTTPError):
+        fetch_is_user_in_org(ORGANIZATION_UUID, JWT_TOKEN, USER_UUID)
+    assert get_mock.call_count == 2
@@ -0,0 +1,80 @@
+import base64
+
+import jwt
+import pytest
+import responses
+from jwt.exceptions import InvalidSignatureError
+
+from app.tokens import TokenVerifier
+
+JWKS_URL = "http://auth/.well-known/jwks.json"
+
+
+def make_jwk(kid, secret):
+    return {
+        "kty": "oct",
+        "kid": kid,
+        "alg": "HS256",
+        "k": base64.urlsafe_b64encode(secret).decode("utf-8").rstrip("="),
+    }
+
+
+def make_token(claims, kid, secret):
+    token = jwt.encode(claims, secret, algorithm="HS256", headers={"kid": kid})
+    return token.decode("utf-8")
+
+
+def test_verify_secret():
+    verifier = TokenVerifier(secret="secret")
+    token = jwt.encode({"uuid": "1"}, "secret", algorithm="HS256").decode("utf-8")
+
+    assert verifier.verify(token) == {"uuid": "1"}
+    with pytest.raises(InvalidSignatureError):
+        TokenVerifier(secret="other").verify(token)
+
+
+def test_organizations():
+    verifier = TokenVerifier(secret="secret")
+
+    assert verifier.organizations({"uuid": "1"}) is None
+    assert verifier.organizations({"organizations": ["a", {"uuid": "b"}]}) == [
+        "a",
+        "b",
+    ]
+
+
+@responses.activate
+def test_verify_jwks_rotation():
+    responses.add(
+        responses.GET, JWKS_URL, json={"keys": [make_jwk("key1", b"secret1")]}
+    )
+    verifier = TokenVerifier(jwks_url=JWKS_URL)
+    verifier.refresh_keys()
+
+    assert verifier.verify(make_token({"uuid": "1"}, "key1", b"secret1")) == {
+        "uuid": "1"
+    }
+    assert len(responses.calls) == 1
+
+    # an unknown key id triggers a reload of the key set.
+    responses.replace(
+        responses.GET, JWKS_URL, json={"keys": [make_jwk("key2", b"secret2")]}
+    )
+    verifier.last_refresh = None
+    assert verifier.verify(make_token({"uuid": "2"}, "key2", b"secret2")) == {
+        "uuid": "2"
+    }
+    assert len(responses.calls) == 2
+
+    # ...but not more than once a minute.
+    assert verifier.verify(make_token({"uuid": "3"}, "key3", b"secret3")) is None
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_refresh_keys_failure():
+    responses.add(responses.GET, JWKS_URL, status=500)
+    verifier = TokenVerifier(jwks_url=JWKS_URL)
+
+    assert not verifier.refresh_keys()
+    assert verifier.keys == {}
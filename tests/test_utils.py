@@ -1,8 +1,11 @@
 import flask
+import jwt
 import secrets
 from unittest.mock import patch
 from requests import HTTPError
 
+from app.constants import TOKEN_VERIFIER
+from app.tokens import TokenVerifier
 from app.utils import validate_organization, make_hash, verify_hash
 from .conftest import JWT_TOKEN, USER_UUID
 
@@ -91,3 +94,47 @@ def test_verify_hash():
     hash_p, hash_s = make_hash(pw)
 
     assert verify_hash(pw, hash_p, hash_s) is True
+
+
+@patch("app.utils.fetch_is_user_in_org")
+def test_validate_organization_verified_token(in_org_mock, app):
+    app.extensions[TOKEN_VERIFIER] = TokenVerifier(secret="a secret")
+
+    @validate_organization()
+    def a_view(organization_uuid):
+        return {}, 200
+
+    def make_headers(claims, secret="a secret"):
+        token = jwt.encode(claims, secret, algorithm="HS256").decode("utf-8")
+        return {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+
+    # Tokens with a bad signature are rejected.
+    headers = make_headers({"uuid": USER_UUID}, "not the secret")
+    with app.test_request_context("/a/view", headers=headers):
+        message, status = a_view(organization_uuid="org1")
+        assert status == 401
+
+    # Expired tokens are rejected.
+    headers = make_headers({"uuid": USER_UUID, "exp": 1603294736})
+    with app.test_request_context("/a/view", headers=headers):
+        message, status = a_view(organization_uuid="org1")
+        assert status == 401
+
+    # Membership is read from the signed claim.
+    headers = make_headers({"uuid": USER_UUID, "organizations": ["org1"]})
+    with app.test_request_context("/a/view", headers=headers):
+        message, status = a_view(organization_uuid="org1")
+        assert status == 200
+        assert flask.g.user_uuid == USER_UUID
+    with app.test_request_context("/a/view", headers=headers):
+        message, status = a_view(organization_uuid="org2")
+        assert status == 404
+    assert not in_org_mock.called
+
+    # Without the claim, the auth service is asked.
+    in_org_mock.return_value = True
+    headers = make_headers({"uuid": USER_UUID})
+    with app.test_request_context("/a/view", headers=headers):
+        message, status = a_view(organization_uuid="org1")
+        assert status == 200
+    assert in_org_mock.called
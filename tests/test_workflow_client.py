@@ -0,0 +1,121 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import responses
+from app.constants import WORKFLOW_API_TOKEN, WORKFLOW_CLIENT, WORKFLOW_HOSTNAME
+from app.workflow_client import workflow_client
+from application_roles.decorators import ROLES_KEY
+from flask import g
+from requests import ConnectionError, HTTPError
+
+from .conftest import PIPELINE_UUID
+
+
+def test_workflow_client(app):
+    assert workflow_client() is app.extensions[WORKFLOW_CLIENT]
+
+
+@responses.activate
+def test_workflow_client_request(app):
+    responses.add(
+        responses.POST,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/search",
+        json=[],
+    )
+
+    response = workflow_client().post("/v1/pipelines/search", json={"uuids": []})
+
+    assert response.json() == []
+    request = responses.calls[0].request
+    assert request.headers[ROLES_KEY] == app.config[WORKFLOW_API_TOKEN]
+    assert request.headers["Content-Type"] == "application/json"
+
+
+@responses.activate
+def test_workflow_client_stats(app):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{PIPELINE_UUID}",
+        json={},
+    )
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{PIPELINE_UUID}/runs",
+        status=503,
+    )
+
+    workflow_client().get(f"/v1/pipelines/{PIPELINE_UUID}")
+    workflow_client().get(f"/v1/pipelines/{PIPELINE_UUID}")
+    workflow_client().get(f"/v1/pipelines/{PIPELINE_UUID}/runs")
+    with pytest.raises(ConnectionError):
+        workflow_client().delete(f"/v1/pipelines/{PIPELINE_UUID}")
+
+    stats = workflow_client().stats()
+    assert stats["GET /v1/pipelines/<uuid>"]["count"] == 2
+    assert stats["GET /v1/pipelines/<uuid>"]["errors"] == 0
+    assert stats["GET /v1/pipelines/<uuid>/runs"]["errors"] == 1
+    assert stats["DELETE /v1/pipelines/<uuid>"]["errors"] == 1
+
+
+@responses.activate
+def test_workflow_client_get_many(app):
+    for index in range(5):
+        responses.add(
+            responses.GET,
+            f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{index}",
+            json={"index": index},
+        )
+
+    results = workflow_client().get_many([f"/v1/pipelines/{i}" for i in range(5)])
+
+    assert [response.json() for response in results] == [{"index": i} for i in range(5)]
+    assert workflow_client().get_many([]) == []
+
+
+@patch("app.workflow_client.WorkflowClient.request")
+def test_workflow_client_fan_out_concurrency(request_mock, app):
+    lock = threading.Lock()
+    in_flight = []
+    max_in_flight = []
+
+    def request(method, path, **kwargs):
+        with lock:
+            in_flight.append(path)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(path)
+        return path
+
+    request_mock.side_effect = request
+    calls = [("GET", f"/v1/pipelines/{i}", {}) for i in range(10)]
+
+    assert workflow_client().fan_out(calls, concurrency=3) == [
+        path for _, path, _ in calls
+    ]
+    assert max(max_in_flight) <= 3
+
+
+@patch("app.workflow_client.WorkflowClient.request")
+def test_workflow_client_fan_out_error(request_mock, app):
+    request_mock.side_effect = ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        workflow_client().get_many(["/v1/pipelines/1", "/v1/pipelines/2"])
+
+
+@patch("app.workflow_client.WorkflowClient.request")
+def test_workflow_client_deadline(request_mock, app):
+    g.workflow_deadline = time.monotonic() + 0.05
+    request_mock.side_effect = lambda method, path, **kwargs: time.sleep(1)
+
+    with pytest.raises(HTTPError):
+        workflow_client().get_many(["/v1/pipelines/1"])
+
+    # once the deadline has passed no more requests are made.
+    request_mock.reset_mock()
+    with pytest.raises(HTTPError):
+        workflow_client().get_many(["/v1/pipelines/1"])
+    assert not request_mock.called
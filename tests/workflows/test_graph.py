@@ -0,0 +1,130 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from app.workflows.graph import (
+    WorkflowGraph,
+    cache_workflow_graph,
+    cached_workflow_graph,
+)
+
+from ..conftest import ORGANIZATION_UUID, ORGANIZATION_WORKFLOW_UUID
+
+
+def _workflow_pipeline(uuid, sources=(), destinations=()):
+    return {
+        "uuid": uuid,
+        "source_workflow_pipelines": list(sources),
+        "destination_workflow_pipelines": list(destinations),
+    }
+
+
+def _diamond():
+    """ a -> b, a -> c, b -> d, c -> d; as the workflow service lists it. """
+    workflow_pipelines = [
+        _workflow_pipeline("wp-d", sources=["wp-b", "wp-c"]),
+        _workflow_pipeline("wp-b", sources=["wp-a"], destinations=["wp-d"]),
+        _workflow_pipeline("wp-c", sources=["wp-a"], destinations=["wp-d"]),
+        _workflow_pipeline("wp-a", destinations=["wp-b", "wp-c"]),
+        _workflow_pipeline("wp-deleted", destinations=["wp-a"]),
+    ]
+    wp_to_owp = {
+        f"wp-{name}": SimpleNamespace(uuid=name) for name in ("a", "b", "c", "d")
+    }
+
+    return WorkflowGraph.from_workflow_pipelines(workflow_pipelines, wp_to_owp)
+
+
+def test_from_workflow_pipelines():
+    graph = _diamond()
+
+    assert graph.uuids == ["d", "b", "c", "a"]
+    assert graph.workflow_pipeline_uuids == ["wp-d", "wp-b", "wp-c", "wp-a"]
+    assert graph.destinations == [[], [0], [0], [1, 2]]
+    assert graph.sources() == [[1, 2], [3], [3], []]
+    assert "a" in graph
+    assert "deleted" not in graph
+    assert graph.workflow_pipeline_uuid("c") == "wp-c"
+
+
+def test_to_json():
+    graph = _diamond()
+    value = json.loads(json.dumps(graph.to_json()))
+
+    assert WorkflowGraph.from_json(value).to_json() == graph.to_json()
+
+
+def test_topological_order():
+    graph = _diamond()
+    order = graph.topological_order()
+
+    assert not graph.has_cycle()
+    assert sorted(order) == ["a", "b", "c", "d"]
+    for (node, destinations) in enumerate(graph.destinations):
+        for destination in destinations:
+            assert order.index(graph.uuids[node]) < order.index(
+                graph.uuids[destination]
+            )
+
+
+def test_cycle():
+    graph = _diamond().with_pipeline("a", "wp-a", ["d"], ["b", "c"])
+
+    assert graph.has_cycle()
+    with pytest.raises(ValueError):
+        graph.topological_order()
+
+    assert WorkflowGraph(["a"], ["wp-a"], [[0]]).has_cycle()
+
+
+def test_upstream_downstream():
+    graph = _diamond()
+
+    assert graph.upstream("d") == ["b", "c", "a"]
+    assert graph.upstream("b") == ["a"]
+    assert graph.upstream("a") == []
+    assert graph.downstream("a") == ["d", "b", "c"]
+    assert graph.downstream("c") == ["d"]
+    assert graph.downstream("d") == []
+
+
+def test_with_pipeline():
+    graph = _diamond()
+
+    added = graph.with_pipeline("e", "wp-e", ["d"], [])
+    assert added.uuids == ["d", "b", "c", "a", "e"]
+    assert added.downstream("a") == ["d", "b", "c", "e"]
+    assert added.workflow_pipeline_uuid("e") == "wp-e"
+
+    # updating a pipeline replaces all of its edges.
+    updated = added.with_pipeline("d", "wp-d", ["b"], ["e"])
+    assert updated.upstream("d") == ["b", "a"]
+    assert updated.downstream("c") == []
+    assert updated.downstream("d") == ["e"]
+
+    # the original graph is not modified.
+    assert graph.to_json() == _diamond().to_json()
+
+    with pytest.raises(KeyError):
+        graph.with_pipeline("e", "wp-e", ["unknown"], [])
+
+
+def test_without_pipeline():
+    graph = _diamond().without_pipeline("b")
+
+    assert graph.uuids == ["d", "c", "a"]
+    assert graph.workflow_pipeline_uuids == ["wp-d", "wp-c", "wp-a"]
+    assert graph.upstream("d") == ["c", "a"]
+    assert graph.downstream("a") == ["d", "c"]
+
+
+def test_cache_workflow_graph(app):
+    assert cached_workflow_graph(ORGANIZATION_UUID, ORGANIZATION_WORKFLOW_UUID) is None
+
+    cache_workflow_graph(ORGANIZATION_UUID, ORGANIZATION_WORKFLOW_UUID, _diamond())
+    graph = cached_workflow_graph(ORGANIZATION_UUID, ORGANIZATION_WORKFLOW_UUID)
+    assert graph.to_json() == _diamond().to_json()
+    assert cached_workflow_graph("other", ORGANIZATION_WORKFLOW_UUID) is None
+
+    cache_workflow_graph(ORGANIZATION_UUID, ORGANIZATION_WORKFLOW_UUID, None)
+    assert cached_workflow_graph(ORGANIZATION_UUID, ORGANIZATION_WORKFLOW_UUID) is None
@@ -3,9 +3,9 @@ from app.workflows.queries import (
     find_organization_workflow,
     find_organization_workflows,
     find_organization_workflow_pipeline,
-    find_organization_workflow_pipelines,
     find_organization_workflow_run,
     find_organization_workflow_pipeline_run_by_workflow_run_uuid,
+    find_organization_workflow_pipeline_runs_by_workflow_run_uuids,
 )
 from app.workflows.models import db
 
@@ -42,21 +42,6 @@ def test_find_organization_workflow(app, organization_workflow):
     )
 
 
-def test_find_organization_workflow_pipelines(
-    app, organization_workflow, organization_pipeline, organization_workflow_pipeline
-):
-    from app.workflows.models import (
-        OrganizationWorkflow,
-        OrganizationWorkflowPipeline,
-    )
-
-    assert list(
-        find_organization_workflow_pipelines(
-            organization_workflow.uuid, organization_pipeline.id
-        )
-    ) == [organization_workflow_pipeline]
-
-
 def test_find_organization_workflow_pipeline(
     app, organization_workflow, organization_pipeline, organization_workflow_pipeline
 ):
@@ -88,3 +73,12 @@ def test_find_organization_workflow_pipeline_run_by_workflow_run_uuid(
         )
         == organization_workflow_pipeline_run
     )
+
+
+def test_find_organization_workflow_pipeline_runs_by_workflow_run_uuids(
+    app, organization_workflow_run, organization_workflow_pipeline_run
+):
+    assert find_organization_workflow_pipeline_runs_by_workflow_run_uuids(
+        [organization_workflow_run.workflow_run_uuid, WORKFLOW_UUID]
+    ) == [organization_workflow_pipeline_run]
+    assert find_organization_workflow_pipeline_runs_by_workflow_run_uuids([]) == []
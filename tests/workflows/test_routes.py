@@ -461,9 +461,7 @@ def test_workflow_pipeline_create(
             "source_workflow_pipelines": [
                 organization_workflow_pipeline.uuid,
             ],
-            "destination_workflow_pipelines": [
-                organization_workflow_pipeline.uuid,
-            ],
+            "destination_workflow_pipelines": [],
         },
         headers={
             "Authorization": f"Bearer {JWT_TOKEN}",
@@ -566,6 +564,67 @@ def test_workflow_pipelines(
     )
 
 
+@responses.activate
+def test_workflow_graph(
+    app,
+    client,
+    client_application,
+    organization_workflow,
+    organization_workflow_pipeline,
+):
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}/pipelines",
+        json=[
+            dict(
+                WORKFLOW_PIPELINE_RESPONSE_JSON,
+                source_workflow_pipelines=[],
+                destination_workflow_pipelines=[],
+            )
+        ],
+    )
+    path = f"/v1/organizations/{organization_workflow.organization_uuid}/workflows/{organization_workflow.uuid}/graph"
+    headers = {
+        "Authorization": f"Bearer {JWT_TOKEN}",
+        ROLES_KEY: client_application.api_key,
+    }
+
+    result = client.get(path, headers=headers)
+    assert result.status_code == 200
+    assert result.json == {
+        "has_cycle": False,
+        "order": [organization_workflow_pipeline.uuid],
+    }
+
+    result = client.get(
+        f"{path}?workflow_pipeline_uuid={organization_workflow_pipeline.uuid}",
+        headers=headers,
+    )
+    assert result.status_code == 200
+    assert result.json["upstream"] == []
+    assert result.json["downstream"] == []
+
+    result = client.get(f"{path}?workflow_pipeline_uuid=1234", headers=headers)
+    assert result.status_code == 400
+
+
+@patch("app.workflows.routes.fetch_workflow_graph")
+@responses.activate
+def test_workflow_graph_backend_500(
+    fetch_mock, app, client, client_application, organization_workflow
+):
+    fetch_mock.side_effect = HTTPError("error")
+
+    result = client.get(
+        f"/v1/organizations/{organization_workflow.organization_uuid}/workflows/{organization_workflow.uuid}/graph",
+        headers={
+            "Authorization": f"Bearer {JWT_TOKEN}",
+            ROLES_KEY: client_application.api_key,
+        },
+    )
+    assert result.status_code == 503
+
+
 @patch("app.workflows.routes.fetch_workflow_pipeline")
 @responses.activate
 def test_workflow_pipeline_backend_500(
@@ -769,26 +828,35 @@ def test_workflow_pipeline_update(
             ROLES_KEY: client_application.api_key,
         },
         json={
-            "source_workflow_pipelines": [
-                organization_workflow_pipeline.uuid,
-                organization_workflow_pipeline.uuid,
-            ],
+            "source_workflow_pipelines": [],
             "pipeline_uuid": organization_pipeline.uuid,
-            "destination_workflow_pipelines": [
-                organization_workflow_pipeline.uuid,
-                organization_workflow_pipeline.uuid,
-            ],
+            "destination_workflow_pipelines": [],
         },
     )
 
     ow_pipeline = update_result.json
 
+    assert update_result.status_code == 200
     assert ow_pipeline["pipeline_uuid"] == organization_pipeline.uuid
+    assert ow_pipeline["source_workflow_pipelines"] == []
+    assert ow_pipeline["destination_workflow_pipelines"] == []
 
-    for key in ["source_workflow_pipelines", "destination_workflow_pipelines"]:
-        assert all(
-            ow_p == organization_workflow_pipeline.uuid for ow_p in ow_pipeline[key]
-        )
+    # a pipeline can't run after itself.
+    update_result = client.put(
+        f"/v1/organizations/{org_uuid}/workflows/{ow_wf_uuid}/pipelines/{ow_wf_pipeline_uuid}",
+        content_type="application/json",
+        headers={
+            "Authorization": f"Bearer {JWT_TOKEN}",
+            ROLES_KEY: client_application.api_key,
+        },
+        json={
+            "source_workflow_pipelines": [ow_wf_pipeline_uuid],
+            "pipeline_uuid": organization_pipeline.uuid,
+            "destination_workflow_pipelines": [],
+        },
+    )
+    assert update_result.status_code == 400
+    assert update_result.json == "Workflow pipelines can't have a cycle."
 
 
 @patch("app.workflows.routes.delete_workflow_pipeline")
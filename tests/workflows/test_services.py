@@ -1,14 +1,24 @@
 import copy
+import json
+import re
+import uuid
+from datetime import datetime, timedelta
 
 from marshmallow.exceptions import ValidationError
 from unittest.mock import patch
 
 import pytest
 import responses
-from app.constants import WORKFLOW_API_TOKEN, WORKFLOW_HOSTNAME
+from sqlalchemy import event
+from app.cache import TTLCache
+from app.constants import WORKFLOW_GRAPH_CACHE, WORKFLOW_HOSTNAME
+from app.pipelines.models import OrganizationPipelineRun
 from app.workflows.models import (
     OrganizationWorkflow,
     OrganizationWorkflowPipeline,
+    OrganizationWorkflowPipelineRun,
+    OrganizationWorkflowRun,
+    db,
 )
 from app.workflows.services import (
     create_workflow,
@@ -23,8 +33,8 @@ from app.workflows.services import (
     delete_workflow_pipeline,
     create_workflow_run,
     fetch_workflow_run,
+    fetch_workflow_graph,
 )
-from application_roles.decorators import ROLES_KEY
 from requests import HTTPError
 
 from ..conftest import (
@@ -41,6 +51,7 @@ from ..conftest import (
     WORKFLOW_PIPELINE_RUN_UUID,
 )
 
+from ..test_cache import DictBackend
 from ..pipelines.test_services import (
     PIPELINE_RUN_RESPONSE_JSON,
     PIPELINE_RUN_INPUT_FILE_JSON,
@@ -101,13 +112,6 @@ ORGANIZATION_WORKFLOW_RUN_RESPONSE = {
             "uuid": "de24e7e32aed48719e313911509353a2",
             "pipeline_run": {
                 "created_at": "2020-10-28T22:01:48.950370",
-                "inputs": [
-                    {
-                        "name": "00000000000000000000000000000000organization_pipeline_input_file.csv",
-                        "url": "http://somefileurl.com",
-                        "uuid": "1a393d3d847d41b4bbf006738bb576c5",
-                    }
-                ],
                 "sequence": 1,
                 "states": [
                     {"created_at": "2020-10-28T22:01:48.951140", "state": "QUEUED"},
@@ -115,13 +119,6 @@ ORGANIZATION_WORKFLOW_RUN_RESPONSE = {
                         "created_at": "2020-10-28T22:01:48.955688",
                         "state": "NOT_STARTED",
                     },
-                    [{"created_at": "2020-10-28T22:02:48.955688", "state": "RUNNING"}],
-                    [
-                        {
-                            "created_at": "2020-10-28T22:03:48.955688",
-                            "state": "COMPLETED",
-                        }
-                    ],
                 ],
                 "uuid": "d6c42c749a1643aba0217c02e177625f",
             },
@@ -199,7 +196,7 @@ def test_fetch_workflows_not_found(app, organization_workflow):
         fetch_workflows(ORGANIZATION_UUID)
 
 
-@patch("app.workflows.services.requests.post")
+@patch("app.workflow_client.WorkflowClient.post")
 @responses.activate
 def test_fetch_workflows_no_workflows(post_mock, app, organization_workflow):
     workflow_list = [
@@ -215,8 +212,7 @@ def test_fetch_workflows_no_workflows(post_mock, app, organization_workflow):
     assert fetch_workflows(ORGANIZATION_UUID) == []
     post_mock.assert_called()
     get_call = post_mock.call_args
-    assert get_call[0][0].startswith(app.config[WORKFLOW_HOSTNAME])
-    assert get_call[1]["headers"][ROLES_KEY] == app.config[WORKFLOW_API_TOKEN]
+    assert get_call[0][0] == "/v1/workflows/search"
     assert get_call[1]["json"] == {"uuids": [organization_workflow.workflow_uuid]}
 
     post_mock().raise_for_status.assert_called()
@@ -444,9 +440,7 @@ def test_create_workflow(
             "source_workflow_pipelines": [
                 organization_workflow_pipeline.uuid,
             ],
-            "destination_workflow_pipelines": [
-                organization_workflow_pipeline.uuid,
-            ],
+            "destination_workflow_pipelines": [],
         },
     )
 
@@ -459,6 +453,40 @@ def test_create_workflow(
         created_org_workflow_pipeline.organization_pipeline_id
         == organization_pipeline.id
     )
+    assert organization_workflow.graph == {
+        "uuids": [
+            organization_workflow_pipeline.uuid,
+            created_org_workflow_pipeline.uuid,
+        ],
+        "workflow_pipeline_uuids": [
+            WORKFLOW_PIPELINE_UUID,
+            WORKFLOW_PIPELINE_RESPONSE_UUID,
+        ],
+        "destinations": [[1], []],
+    }
+
+
+@responses.activate
+def test_create_workflow_pipeline_cycle(
+    app,
+    organization_workflow,
+    organization_pipeline,
+    organization_workflow_pipeline,
+    downstream_organization_workflow_pipeline,
+):
+    with pytest.raises(ValueError):
+        create_workflow_pipeline(
+            organization_workflow.organization_uuid,
+            organization_workflow.uuid,
+            {
+                "pipeline_uuid": organization_pipeline.uuid,
+                "source_workflow_pipelines": [
+                    downstream_organization_workflow_pipeline.uuid
+                ],
+                "destination_workflow_pipelines": [organization_workflow_pipeline.uuid],
+            },
+        )
+    assert len(responses.calls) == 0
 
 
 def test_fetch_workflow_pipelines_invalid_org_workflow(
@@ -545,6 +573,60 @@ def test_fetch_workflow_pipelines(
     ]
 
 
+@responses.activate
+def test_fetch_workflow_pipelines_dense_graph(
+    app, query_counter, organization_workflow, organization_pipeline
+):
+    owps = [
+        OrganizationWorkflowPipeline(
+            organization_workflow_uuid=organization_workflow.uuid,
+            organization_pipeline_id=organization_pipeline.id,
+            workflow_pipeline_uuid=f"{index:032x}",
+        )
+        for index in range(30)
+    ]
+    db.session.add_all(owps)
+    db.session.commit()
+    owp_uuids = {owp.workflow_pipeline_uuid: owp.uuid for owp in owps}
+
+    # every workflow pipeline depends on every one before it.
+    wp_uuids = list(owp_uuids)
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}/pipelines",
+        json=[
+            dict(
+                WORKFLOW_PIPELINE_RESPONSE_JSON,
+                uuid=wp_uuid,
+                source_workflow_pipelines=wp_uuids[:index],
+                destination_workflow_pipelines=wp_uuids[index + 1 :],
+            )
+            for index, wp_uuid in enumerate(wp_uuids)
+        ],
+    )
+
+    organization_uuid = organization_workflow.organization_uuid
+    organization_workflow_uuid = organization_workflow.uuid
+    pipeline_uuid = organization_pipeline.uuid
+
+    db.session.expire_all()
+    query_counter.clear()
+    org_workflow_pipelines = fetch_workflow_pipelines(
+        organization_uuid, organization_workflow_uuid
+    )
+
+    assert len(query_counter) == 2
+    for index, org_workflow_pipeline in enumerate(org_workflow_pipelines):
+        assert org_workflow_pipeline["uuid"] == owp_uuids[wp_uuids[index]]
+        assert org_workflow_pipeline["pipeline_uuid"] == pipeline_uuid
+        assert org_workflow_pipeline["source_workflow_pipelines"] == [
+            owp_uuids[wp_uuid] for wp_uuid in wp_uuids[:index]
+        ]
+        assert org_workflow_pipeline["destination_workflow_pipelines"] == [
+            owp_uuids[wp_uuid] for wp_uuid in wp_uuids[index + 1 :]
+        ]
+
+
 def test_fetch_workflow_pipeline_invalid_org_workflow(
     app, organization_workflow, organization_pipeline, organization_workflow_pipeline
 ):
@@ -706,13 +788,9 @@ def test_update_workflow_pipeline_bad_json(
             organization_workflow.uuid,
             organization_workflow_pipeline.uuid,
             {
-                "source_workflow_pipelines": [
-                    organization_workflow_pipeline.uuid,
-                ],
+                "source_workflow_pipelines": [],
                 "pipeline_uuid": organization_pipeline.uuid,
-                "destination_workflow_pipelines": [
-                    organization_workflow_pipeline.uuid,
-                ],
+                "destination_workflow_pipelines": [],
             },
         )
 
@@ -737,31 +815,29 @@ def test_update_workflow_pipeline_not_found(
             organization_workflow.uuid,
             organization_workflow_pipeline.uuid,
             {
-                "source_workflow_pipelines": [
-                    organization_workflow_pipeline.uuid,
-                ],
+                "source_workflow_pipelines": [],
                 "pipeline_uuid": organization_pipeline.uuid,
-                "destination_workflow_pipelines": [
-                    organization_workflow_pipeline.uuid,
-                ],
+                "destination_workflow_pipelines": [],
             },
         )
 
 
 @responses.activate
 def test_update_workflow_pipeline(
-    app, organization_workflow, organization_pipeline, organization_workflow_pipeline
+    app,
+    organization_workflow,
+    organization_pipeline,
+    organization_workflow_pipeline,
+    downstream_organization_workflow_pipeline,
 ):
     wf_uuid = organization_workflow.workflow_uuid
     wf_pipeline_uuid = organization_workflow_pipeline.workflow_pipeline_uuid
+    owp_uuid = organization_workflow_pipeline.uuid
+    downstream_uuid = downstream_organization_workflow_pipeline.uuid
 
     mock_response = copy.deepcopy(WORKFLOW_PIPELINE_RESPONSE_JSON)
-    mock_response["source_workflow_pipelines"].append(
-        organization_workflow_pipeline.uuid
-    )
-    mock_response["destination_workflow_pipelines"].append(
-        organization_workflow_pipeline.uuid
-    )
+    mock_response["source_workflow_pipelines"] = [WORKFLOW_PIPELINE_RESPONSE_UUID]
+    mock_response["destination_workflow_pipelines"] = []
 
     responses.add(
         responses.PUT,
@@ -769,31 +845,69 @@ def test_update_workflow_pipeline(
         json=mock_response,
     )
 
+    # reverse the edge between the two pipelines.
     update_wf_pipeline = update_workflow_pipeline(
         organization_workflow.organization_uuid,
         organization_workflow.uuid,
-        organization_workflow_pipeline.uuid,
+        owp_uuid,
         {
-            "source_workflow_pipelines": [
-                organization_workflow_pipeline.uuid,
-                organization_workflow_pipeline.uuid,
-            ],
+            "source_workflow_pipelines": [downstream_uuid, downstream_uuid],
             "pipeline_uuid": organization_pipeline.uuid,
-            "destination_workflow_pipelines": [
-                organization_workflow_pipeline.uuid,
-                organization_workflow_pipeline.uuid,
-            ],
+            "destination_workflow_pipelines": [],
         },
     )
 
-    assert update_wf_pipeline.get("uuid") == organization_workflow_pipeline.uuid
+    assert update_wf_pipeline.get("uuid") == owp_uuid
     assert update_wf_pipeline.get("pipeline_uuid") == organization_pipeline.uuid
+    assert update_wf_pipeline["source_workflow_pipelines"] == [
+        downstream_uuid,
+        downstream_uuid,
+    ]
+    assert update_wf_pipeline["destination_workflow_pipelines"] == []
+    assert json.loads(responses.calls[0].request.body) == {
+        "pipeline_uuid": organization_pipeline.pipeline_uuid,
+        "source_workflow_pipelines": [
+            WORKFLOW_PIPELINE_RESPONSE_UUID,
+            WORKFLOW_PIPELINE_RESPONSE_UUID,
+        ],
+        "destination_workflow_pipelines": [],
+    }
+
+    # the stored graph is updated with the edit.
+    assert fetch_workflow_graph(
+        organization_workflow.organization_uuid, organization_workflow.uuid
+    ) == {"has_cycle": False, "order": [downstream_uuid, owp_uuid]}
+
+
+@responses.activate
+def test_update_workflow_pipeline_cycle(
+    app,
+    organization_workflow,
+    organization_pipeline,
+    organization_workflow_pipeline,
+    downstream_organization_workflow_pipeline,
+):
+    def update(sources, destinations):
+        update_workflow_pipeline(
+            organization_workflow.organization_uuid,
+            organization_workflow.uuid,
+            organization_workflow_pipeline.uuid,
+            {
+                "source_workflow_pipelines": sources,
+                "pipeline_uuid": organization_pipeline.uuid,
+                "destination_workflow_pipelines": destinations,
+            },
+        )
 
-    for key in ["source_workflow_pipelines", "destination_workflow_pipelines"]:
-        assert all(
-            ow_p == organization_workflow_pipeline.uuid
-            for ow_p in update_wf_pipeline[key]
+    with pytest.raises(ValueError):
+        update([organization_workflow_pipeline.uuid], [])
+    with pytest.raises(ValueError):
+        update(
+            [downstream_organization_workflow_pipeline.uuid],
+            [downstream_organization_workflow_pipeline.uuid],
         )
+    assert len(responses.calls) == 0
+    assert organization_workflow.graph["destinations"] == [[1], []]
 
 
 def test_delete_workflow_pipeline_invalid_org_workflow(
@@ -886,6 +1000,125 @@ def test_delete_workflow_pipeline(
     assert ow_pipeline.is_deleted is True
 
 
+def test_fetch_workflow_graph_invalid_org_workflow(app, organization_workflow):
+    with pytest.raises(ValueError):
+        fetch_workflow_graph(organization_workflow.organization_uuid, "1234")
+
+
+@responses.activate
+def test_fetch_workflow_graph(
+    app, query_counter, organization_workflow, organization_workflow_pipeline
+):
+    # a workflow from before graphs were stored.
+    organization_workflow.graph = None
+    db.session.commit()
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}/pipelines",
+        json=[WORKFLOW_PIPELINE_RESPONSE_JSON],
+    )
+    args = (organization_workflow.organization_uuid, organization_workflow.uuid)
+    owp_uuid = organization_workflow_pipeline.uuid
+
+    # the workflow pipeline is its own source and destination.
+    assert fetch_workflow_graph(*args) == {"has_cycle": True, "order": None}
+    assert organization_workflow.graph == {
+        "uuids": [owp_uuid],
+        "workflow_pipeline_uuids": [WORKFLOW_PIPELINE_UUID],
+        "destinations": [[0]],
+    }
+
+    # later fetches need neither queries nor the workflow service.
+    query_counter.clear()
+    assert fetch_workflow_graph(*args, owp_uuid) == {
+        "has_cycle": True,
+        "order": None,
+        "upstream": [],
+        "downstream": [],
+    }
+    assert len(query_counter) == 0
+    assert len(responses.calls) == 1
+
+    # nor once the graph is stored.
+    app.extensions[WORKFLOW_GRAPH_CACHE].clear()
+    assert fetch_workflow_graph(*args)["has_cycle"]
+    assert len(responses.calls) == 1
+
+    with pytest.raises(ValueError):
+        fetch_workflow_graph(*args, "1234")
+
+
+@responses.activate
+def test_workflow_graph_edits(
+    app,
+    query_counter,
+    organization_workflow,
+    organization_pipeline,
+    organization_workflow_pipeline,
+):
+    wf_uuid = organization_workflow.workflow_uuid
+    workflow_pipelines = (
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{wf_uuid}/pipelines"
+    )
+    args = (organization_workflow.organization_uuid, organization_workflow.uuid)
+    owp_uuid = organization_workflow_pipeline.uuid
+    pipeline_uuid = organization_pipeline.uuid
+    responses.add(
+        responses.POST,
+        workflow_pipelines,
+        json=ORGANIZATION_WORKFLOW_PIPELINE_RESPONSE_JSON,
+    )
+    responses.add(
+        responses.DELETE,
+        f"{workflow_pipelines}/{WORKFLOW_PIPELINE_RESPONSE_UUID}",
+        status=204,
+    )
+
+    # two workers, whose caches share a backend.
+    backend = DictBackend()
+    worker_cache = TTLCache(10, 300, backend, local=False)
+    other_worker_cache = TTLCache(10, 300, backend, local=False)
+
+    app.extensions[WORKFLOW_GRAPH_CACHE] = other_worker_cache
+    assert fetch_workflow_graph(*args) == {"has_cycle": False, "order": [owp_uuid]}
+
+    # edits are validated against the stored graph, without another query of
+    # the workflow pipelines...
+    app.extensions[WORKFLOW_GRAPH_CACHE] = worker_cache
+    query_counter.clear()
+    created_uuid = create_workflow_pipeline(
+        *args,
+        {
+            "pipeline_uuid": pipeline_uuid,
+            "source_workflow_pipelines": [owp_uuid],
+            "destination_workflow_pipelines": [],
+        },
+    )["uuid"]
+    assert not any(
+        "FROM organization_workflow_pipeline" in statement
+        for statement in query_counter
+    )
+
+    # ...and update it, for every worker at once.
+    app.extensions[WORKFLOW_GRAPH_CACHE] = other_worker_cache
+    query_counter.clear()
+    assert fetch_workflow_graph(*args, owp_uuid) == {
+        "has_cycle": False,
+        "order": [owp_uuid, created_uuid],
+        "upstream": [],
+        "downstream": [created_uuid],
+    }
+    assert len(query_counter) == 0
+
+    app.extensions[WORKFLOW_GRAPH_CACHE] = worker_cache
+    delete_workflow_pipeline(*args, created_uuid)
+    app.extensions[WORKFLOW_GRAPH_CACHE] = other_worker_cache
+    assert fetch_workflow_graph(*args)["order"] == [owp_uuid]
+
+    # the workflow service is never asked for the graph.
+    assert [call.request.method for call in responses.calls] == ["POST", "DELETE"]
+
+
 def test_create_workflow_run_invalid_org_workflow(app, organization_workflow):
     with pytest.raises(ValueError):
         create_workflow_run(
@@ -953,7 +1186,7 @@ def test_create_workflow_run_not_found(
 
 
 @patch("app.workflows.services.create_url")
-@patch("app.workflows.services.fetch_pipeline_run")
+@patch("app.workflows.services.fetch_pipeline_run_summaries")
 @responses.activate
 def test_create_workflow_run(
     mock_fetch_pipeline_run,
@@ -967,7 +1200,14 @@ def test_create_workflow_run(
     organization_workflow_run,
     organization_workflow_pipeline_run,
 ):
-    mock_fetch_pipeline_run.return_value = dict(PIPELINE_RUN_RESPONSE_JSON)
+    mock_fetch_pipeline_run.side_effect = lambda org_pipeline_runs: [
+        {
+            k: v
+            for (k, v) in PIPELINE_RUN_RESPONSE_JSON.items()
+            if k not in ("artifacts", "inputs")
+        }
+        for _ in org_pipeline_runs
+    ]
     mock_url.return_value = "http://somefileurl.com"
 
     wf_uuid = organization_workflow.workflow_uuid
@@ -999,6 +1239,99 @@ def test_create_workflow_run(
     assert new_org_workflow_run == ORGANIZATION_WORKFLOW_RUN_RESPONSE
 
 
+def _add_pipeline_runs(organization_pipeline, count):
+    """ Add count runs to a pipeline. """
+    org_pipeline_runs = [
+        OrganizationPipelineRun(
+            organization_pipeline_id=organization_pipeline.id,
+            pipeline_run_uuid=uuid.uuid4().hex,
+            status_update_token=uuid.uuid4().hex,
+            status_update_token_expires_at=datetime.now() + timedelta(days=7),
+            share_token=uuid.uuid4().hex,
+        )
+        for _ in range(count)
+    ]
+    db.session.add_all(org_pipeline_runs)
+    db.session.flush()
+
+    return org_pipeline_runs
+
+
+@responses.activate
+def test_create_workflow_run_many_steps(
+    app,
+    query_counter,
+    organization_workflow,
+    organization_pipeline,
+    organization_workflow_pipeline,
+):
+    org_pipeline_runs = _add_pipeline_runs(organization_pipeline, 50)
+    db.session.commit()
+    pipeline_run_uuids = [opr.pipeline_run_uuid for opr in org_pipeline_runs]
+    args = (organization_workflow.organization_uuid, organization_workflow.uuid, {})
+
+    events = []
+
+    def fetch_pipeline_run(request):
+        events.append("fetch")
+        return (200, {}, json.dumps(PIPELINE_RUN_RESPONSE_JSON))
+
+    responses.add(
+        responses.POST,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{organization_workflow.workflow_uuid}/runs",
+        json=dict(
+            WORKFLOW_PIPELINE_RUN_RESPONSE_JSON,
+            workflow_pipeline_runs=[
+                {"uuid": uuid.uuid4().hex, "pipeline_run": {"uuid": pr_uuid}}
+                for pr_uuid in pipeline_run_uuids
+            ],
+        ),
+    )
+    responses.add_callback(
+        responses.GET,
+        re.compile(
+            f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{PIPELINE_UUID}/runs/\\w+$"
+        ),
+        callback=fetch_pipeline_run,
+    )
+
+    def on_commit(session):
+        events.append("commit")
+
+    session = db.session()
+    event.listen(session, "after_commit", on_commit)
+    db.session.expire_all()
+    query_counter.clear()
+    try:
+        workflow_run = create_workflow_run(*args)
+    finally:
+        event.remove(session, "after_commit", on_commit)
+
+    # the steps are inserted together, and committed before they are fetched.
+    inserts = [
+        statement
+        for statement in query_counter
+        if statement.startswith("INSERT INTO organization_workflow_pipeline_run")
+    ]
+    assert len(inserts) == 1
+    assert events.index("commit") < events.index("fetch")
+    assert len(query_counter) <= 9
+
+    org_wf_pipeline_runs = OrganizationWorkflowPipelineRun.query.filter(
+        OrganizationWorkflowPipelineRun.organization_workflow_run_id
+        == OrganizationWorkflowRun.query.filter_by(uuid=workflow_run["uuid"]).one().id
+    ).all()
+    assert sorted(
+        (owpr.uuid, owpr.organization_pipeline_run_id) for owpr in org_wf_pipeline_runs
+    ) == sorted(
+        (wpr["uuid"], opr.id)
+        for (wpr, opr) in zip(workflow_run["workflow_pipeline_runs"], org_pipeline_runs)
+    )
+    assert [
+        wpr["pipeline_run"]["uuid"] for wpr in workflow_run["workflow_pipeline_runs"]
+    ] == [opr.uuid for opr in org_pipeline_runs]
+
+
 def test_workflow_run_invalid_org_workflow(
     app, organization_workflow, organization_workflow_run
 ):
@@ -1058,8 +1391,100 @@ def test_workflow_run_not_found(
         )
 
 
+@responses.activate
+def test_fetch_workflow_run_pipeline_run_not_found(
+    app,
+    organization_workflow,
+    organization_workflow_pipeline,
+    organization_workflow_run,
+    organization_workflow_pipeline_run,
+):
+    wf_uuid = organization_workflow.workflow_uuid
+    wfr_uuid = organization_workflow_run.workflow_run_uuid
+    workflow_run = copy.deepcopy(WORKFLOW_PIPELINE_RUN_RESPONSE_JSON)
+    workflow_run["workflow_pipeline_runs"][0]["pipeline_run"]["uuid"] = "0" * 32
+
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{wf_uuid}/runs/{wfr_uuid}",
+        json=workflow_run,
+    )
+
+    # a 400, rather than an error of the workflow service.
+    with pytest.raises(ValueError) as value_error:
+        fetch_workflow_run(
+            organization_workflow.organization_uuid,
+            organization_workflow.uuid,
+            organization_workflow_run.uuid,
+        )
+    assert value_error.value.args[0] == {
+        "message": "organization_pipeline_uuid not found"
+    }
+
+    # and of another organization.
+    with pytest.raises(ValueError) as value_error:
+        fetch_workflow_run(
+            "0" * 32, organization_workflow.uuid, organization_workflow_run.uuid
+        )
+    assert value_error.value.args[0] == {
+        "message": "organization_workflow_uuid not found"
+    }
+
+
+@responses.activate
+def test_fetch_workflow_run_workflow_pipeline_run_not_found(
+    app,
+    organization_workflow,
+    organization_workflow_pipeline,
+    organization_pipeline_run,
+    organization_workflow_run,
+):
+    wf_uuid = organization_workflow.workflow_uuid
+    wfr_uuid = organization_workflow_run.workflow_run_uuid
+
+    # no OrganizationWorkflowPipelineRun has the workflow pipeline run's uuid.
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{wf_uuid}/runs/{wfr_uuid}",
+        json=WORKFLOW_PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    with pytest.raises(ValueError) as value_error:
+        fetch_workflow_run(
+            organization_workflow.organization_uuid,
+            organization_workflow.uuid,
+            organization_workflow_run.uuid,
+        )
+    assert value_error.value.args[0] == {
+        "message": "organization_workflow_pipeline_run not found"
+    }
+
+
+@responses.activate
+def test_create_workflow_run_pipeline_run_not_found(
+    app, organization_workflow, organization_workflow_pipeline
+):
+    wf_uuid = organization_workflow.workflow_uuid
+    responses.add(
+        responses.POST,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{wf_uuid}/runs",
+        json=WORKFLOW_PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    with pytest.raises(ValueError) as value_error:
+        create_workflow_run(
+            organization_workflow.organization_uuid,
+            organization_workflow.uuid,
+            PIPELINE_RUN_INPUT_FILE_JSON,
+        )
+    assert value_error.value.args[0] == {
+        "message": "organization_pipeline_uuid not found"
+    }
+    assert OrganizationWorkflowRun.query.count() == 0
+
+
 @patch("app.workflows.services.create_url")
-@patch("app.workflows.services.fetch_pipeline_run")
+@patch("app.workflows.services.fetch_pipeline_run_summaries")
 @responses.activate
 def test_fetch_workflow_run(
     mock_fetch_pipeline_run,
@@ -1073,7 +1498,14 @@ def test_fetch_workflow_run(
     organization_workflow_run,
     organization_workflow_pipeline_run,
 ):
-    mock_fetch_pipeline_run.return_value = dict(PIPELINE_RUN_RESPONSE_JSON)
+    mock_fetch_pipeline_run.side_effect = lambda org_pipeline_runs: [
+        {
+            k: v
+            for (k, v) in PIPELINE_RUN_RESPONSE_JSON.items()
+            if k not in ("artifacts", "inputs")
+        }
+        for _ in org_pipeline_runs
+    ]
     mock_url.return_value = "http://somefileurl.com"
 
     wf_uuid = organization_workflow.workflow_uuid
@@ -1099,3 +1531,75 @@ def test_fetch_workflow_run(
     ] = organization_workflow_run.uuid
 
     assert org_workflow_run == ORGANIZATION_WORKFLOW_RUN_RESPONSE
+
+
+@responses.activate
+def test_fetch_workflow_run_many_steps(
+    app,
+    query_counter,
+    organization_workflow,
+    organization_pipeline,
+    organization_workflow_run,
+):
+    org_pipeline_runs = _add_pipeline_runs(organization_pipeline, 50)
+    org_wf_pipeline_runs = [
+        OrganizationWorkflowPipelineRun(
+            organization_workflow_id=organization_workflow.id,
+            organization_pipeline_run_id=opr.id,
+            organization_workflow_run_id=organization_workflow_run.id,
+            workflow_run_uuid=uuid.uuid4().hex,
+        )
+        for opr in org_pipeline_runs
+    ]
+    db.session.add_all(org_wf_pipeline_runs)
+    db.session.commit()
+
+    wf_uuid = organization_workflow.workflow_uuid
+    wfr_uuid = organization_workflow_run.workflow_run_uuid
+    responses.add(
+        responses.GET,
+        f"{app.config[WORKFLOW_HOSTNAME]}/v1/workflows/{wf_uuid}/runs/{wfr_uuid}",
+        json=dict(
+            WORKFLOW_PIPELINE_RUN_RESPONSE_JSON,
+            workflow_pipeline_runs=[
+                {
+                    "uuid": owpr.workflow_run_uuid,
+                    "pipeline_run": {"uuid": opr.pipeline_run_uuid},
+                }
+                for (owpr, opr) in zip(org_wf_pipeline_runs, org_pipeline_runs)
+            ],
+        ),
+    )
+    responses.add(
+        responses.GET,
+        re.compile(
+            f"{app.config[WORKFLOW_HOSTNAME]}/v1/pipelines/{PIPELINE_UUID}/runs/\\w+$"
+        ),
+        json=PIPELINE_RUN_RESPONSE_JSON,
+    )
+
+    args = (
+        organization_workflow.organization_uuid,
+        organization_workflow.uuid,
+        organization_workflow_run.uuid,
+    )
+    expected_uuids = [
+        (owpr.uuid, opr.uuid)
+        for (owpr, opr) in zip(org_wf_pipeline_runs, org_pipeline_runs)
+    ]
+    db.session.expire_all()
+    query_counter.clear()
+
+    workflow_run = fetch_workflow_run(*args)
+
+    # the workflow run, workflow, workflow pipeline runs, pipeline runs and
+    # input files, and an update of the new run statuses.
+    assert len(query_counter) <= 6
+    assert [
+        (wpr["uuid"], wpr["pipeline_run"]["uuid"])
+        for wpr in workflow_run["workflow_pipeline_runs"]
+    ] == expected_uuids
+    assert all(
+        "artifacts" not in wpr["pipeline_run"]
+        for wpr in workflow_run["workflow_pipeline_runs"]
+    )